@@ -0,0 +1,146 @@
+"""Compare the block tokenizer chunker with the former line-scan chunker on large inputs.
+
+Usage: python benchmarks/bench_chunking.py [size_mb ...]
+"""
+
+import os
+import sys
+import time
+from typing import List
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from translate_md.blocks import iter_blocks  # noqa: E402
+from translate_md.cli import split_markdown_into_chunks  # noqa: E402
+
+# The character limit of the former chunker. The tokenizer is compared at the same limit
+# (measuring blocks with len) so both produce chunks of the same size.
+LEGACY_MAX_CHARS = 8000
+
+
+def legacy_split_markdown_into_chunks(md_text: str, max_chars: int = LEGACY_MAX_CHARS) -> List[str]:
+    # The fence-only line scan that split_markdown_into_chunks used before translate_md.blocks.
+    lines = md_text.splitlines(keepends=True)
+    chunks: List[str] = []
+    current: List[str] = []
+    current_len = 0
+    in_fenced_code = False
+    fence_marker = None
+
+    for line in lines:
+        stripped = line.lstrip()
+        if stripped.startswith("```") or stripped.startswith("~~~"):
+            marker = "```" if stripped.startswith("```") else "~~~"
+            if not in_fenced_code:
+                in_fenced_code = True
+                fence_marker = marker
+            elif fence_marker == marker:
+                in_fenced_code = False
+                fence_marker = None
+
+        line_len = len(line)
+        if not in_fenced_code and current_len + line_len > max_chars:
+            chunks.append("".join(current))
+            current = []
+            current_len = 0
+
+        current.append(line)
+        current_len += line_len
+
+    if current:
+        chunks.append("".join(current))
+    return chunks if chunks else [md_text]
+
+
+SECTION = """## Section {n}
+
+Some introductory prose for section {n}. It has a [link](https://example.com/{n}) and `inline code`.
+It continues on a second line to make the paragraph a little longer than a single line.
+
+- first item
+- second item with **bold** text
+  continued on an indented line
+
+1. ordered
+2. list
+
+| Name | Value |
+|------|-------|
+| a    | {n}   |
+| b    | {n}   |
+
+```python
+def f_{n}(x):
+
+    return x * {n}
+```
+
+> A quote that spans
+> two lines.
+
+<div class="note">
+HTML block
+</div>
+
+"""
+
+
+def build_document(size_bytes: int) -> str:
+    parts = ["---\ntitle: Benchmark\n---\n\n# Benchmark\n\n"]
+    total = len(parts[0])
+    n = 0
+    while total < size_bytes:
+        section = SECTION.format(n=n)
+        parts.append(section)
+        total += len(section)
+        n += 1
+    return "".join(parts)
+
+
+def split_by_chars(md_text: str) -> List[str]:
+    return split_markdown_into_chunks(md_text, LEGACY_MAX_CHARS, len)
+
+
+def best_of(func, md_text: str, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func(md_text)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def count_cut_structures(md_text: str, chunks: List[str]) -> int:
+    # Number of chunk boundaries that fall inside a block of the tokenizer.
+    boundaries = set()
+    offset = 0
+    for chunk in chunks[:-1]:
+        offset += len(chunk)
+        boundaries.add(offset)
+    inside = 0
+    for block in iter_blocks(md_text):
+        inside += sum(1 for cut in boundaries if block.start < cut < block.end)
+    return inside
+
+
+def main() -> None:
+    sizes = [float(arg) for arg in sys.argv[1:]] or [1.0, 10.0]
+    print(
+        f"{'size':>8} {'legacy s':>10} {'blocks s':>10} {'tokens s':>10} "
+        f"{'legacy chunks':>14} {'blocks chunks':>14} {'token chunks':>13} {'legacy cuts':>12}"
+    )
+    for size_mb in sizes:
+        md_text = build_document(int(size_mb * 1024 * 1024))
+        legacy = legacy_split_markdown_into_chunks(md_text)
+        current = split_by_chars(md_text)
+        by_tokens = split_markdown_into_chunks(md_text)
+        assert "".join(current) == md_text == "".join(by_tokens)
+        print(
+            f"{size_mb:>6.1f}MB {best_of(legacy_split_markdown_into_chunks, md_text):>10.3f} "
+            f"{best_of(split_by_chars, md_text):>10.3f} {best_of(split_markdown_into_chunks, md_text):>10.3f} "
+            f"{len(legacy):>14} {len(current):>14} {len(by_tokens):>13} {count_cut_structures(md_text, legacy):>12}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,219 @@
+import re
+from typing import Callable, Iterable, Iterator, List, NamedTuple, Optional
+
+
+FRONT_MATTER = "front_matter"
+HEADING = "heading"
+PARAGRAPH = "paragraph"
+LIST = "list"
+TABLE = "table"
+CODE = "code"
+HTML = "html"
+BLOCKQUOTE = "blockquote"
+THEMATIC_BREAK = "thematic_break"
+BLANK = "blank"
+
+_ATX_HEADING = re.compile(r" {0,3}#{1,6}(?:[ \t]|$)")
+_FENCE = re.compile(r"[ \t]*(`{3,}|~{3,})")
+_LIST_ITEM = re.compile(r" {0,3}(?:[-*+]|\d{1,9}[.)])(?:[ \t]|$)")
+_PARAGRAPH_LIST_ITEM = re.compile(r" {0,3}(?:[-*+]|1[.)])[ \t]+\S")
+_THEMATIC_BREAK = re.compile(r" {0,3}(?:(?:\*[ \t]*){3,}|(?:-[ \t]*){3,}|(?:_[ \t]*){3,})$")
+_SETEXT_UNDERLINE = re.compile(r" {0,3}(?:=+|-+)[ \t]*$")
+_TABLE_DELIMITER = re.compile(r"[ \t]*\|?[ \t]*:?-+:?[ \t]*(?:\|[ \t]*:?-+:?[ \t]*)*\|?[ \t]*$")
+_HTML_START = re.compile(r" {0,3}<(?:!--|[A-Za-z/!?])")
+_BLOCKQUOTE = re.compile(r" {0,3}>")
+_INDENTED_CODE = re.compile(r"(?: {4}|\t)")
+# Front matter lines: "key: value" (YAML) or "key = value" / "[table]" (TOML), plus
+# continuation lines (indented, "- item", comments) after the first key.
+_FRONT_MATTER_KEY = {
+    "---": re.compile(r"[\w\"'][^:]*:(?:[ \t]|$)"),
+    "+++": re.compile(r"(?:[\w\"'][^=]*=|\[)"),
+}
+_FRONT_MATTER_CONTINUATION = re.compile(r"[ \t]|-(?:[ \t]|$)|#")
+# Any line that starts a new block while a paragraph is open, as one alternation.
+_PARAGRAPH_INTERRUPT = re.compile(
+    "|".join(
+        pattern.pattern
+        for pattern in (_FENCE, _ATX_HEADING, _BLOCKQUOTE, _HTML_START, _THEMATIC_BREAK, _PARAGRAPH_LIST_ITEM)
+    )
+)
+
+
+class Block(NamedTuple):
+    """A top-level Markdown block as a ``[start, end)`` slice of the source text.
+
+    Blank lines after a block belong to it, so consecutive blocks tile the text exactly.
+    """
+
+    kind: str
+    start: int
+    end: int
+
+
+def iter_blocks(md_text: str) -> Iterator[Block]:
+    """Tokenize Markdown into typed top-level blocks in a single forward pass.
+
+    This is a pragmatic subset of CommonMark/GFM block structure: good enough to know
+    where a chunk may be cut without breaking a fence, table, list, HTML block or front
+    matter. Every line is classified once; look-ahead only ever moves the cursor forward.
+    """
+    lines = md_text.splitlines(keepends=True)
+    count = len(lines)
+    offsets = [0] * (count + 1)
+    for index, line in enumerate(lines):
+        offsets[index + 1] = offsets[index] + len(line)
+    content = [line.rstrip("\r\n") for line in lines]
+    blank = [not text.strip() for text in content]
+
+    def skip_blank(index: int) -> int:
+        while index < count and blank[index]:
+            index += 1
+        return index
+
+    def fence_end(index: int) -> int:
+        opening = _FENCE.match(content[index]).group(1)
+        index += 1
+        while index < count:
+            stripped = content[index].strip()
+            index += 1
+            if stripped.startswith(opening) and not stripped.strip(opening[0]):
+                break
+        return index
+
+    def list_end(index: int) -> int:
+        index += 1
+        while index < count:
+            if blank[index]:
+                # A blank line only continues a (loose) list if an item or indented content follows.
+                after = skip_blank(index)
+                if after < count and (_LIST_ITEM.match(content[after]) or content[after][:1] in (" ", "\t")):
+                    index = after
+                    continue
+                break
+            line = content[index]
+            if _FENCE.match(line):
+                index = fence_end(index)
+                continue
+            if line[:1] not in (" ", "\t") and (_ATX_HEADING.match(line) or _THEMATIC_BREAK.match(line)):
+                break
+            index += 1
+        return index
+
+    def front_matter_end() -> Optional[int]:
+        # Only a closed run of key lines right after the opener counts; a "---" line later in
+        # the document is more likely a thematic break or a setext underline.
+        opener = content[0].rstrip()
+        closers = ("---", "...") if opener == "---" else ("+++",)
+        key = _FRONT_MATTER_KEY[opener]
+        for end in range(1, count):
+            line = content[end]
+            if line.rstrip() in closers:
+                return end + 1
+            if blank[end] or not (key.match(line) or (end > 1 and _FRONT_MATTER_CONTINUATION.match(line))):
+                return None
+        return None
+
+    index = 0
+    if count and content[0].rstrip() in ("---", "+++"):
+        end = front_matter_end()
+        if end is not None:
+            index = skip_blank(end)
+            yield Block(FRONT_MATTER, 0, offsets[index])
+
+    if index < count and blank[index]:
+        end = skip_blank(index)
+        yield Block(BLANK, offsets[index], offsets[end])
+        index = end
+
+    while index < count:
+        line = content[index]
+        start = index
+
+        if _FENCE.match(line):
+            kind, index = CODE, fence_end(index)
+        elif _ATX_HEADING.match(line):
+            kind, index = HEADING, index + 1
+        elif _THEMATIC_BREAK.match(line):
+            kind, index = THEMATIC_BREAK, index + 1
+        elif "|" in line and index + 1 < count and "-" in content[index + 1] and _TABLE_DELIMITER.match(content[index + 1]):
+            kind, index = TABLE, index + 2
+            while index < count and not blank[index] and "|" in content[index]:
+                index += 1
+        elif _HTML_START.match(line):
+            kind = HTML
+            if line.lstrip().startswith("<!--"):
+                # A comment block ends with the line that closes the comment.
+                while index < count and "-->" not in content[index]:
+                    index += 1
+                index = min(index + 1, count)
+            else:
+                while index < count and not blank[index]:
+                    index += 1
+        elif _BLOCKQUOTE.match(line):
+            kind = BLOCKQUOTE
+            while index < count and not blank[index]:
+                index += 1
+        elif _LIST_ITEM.match(line):
+            kind, index = LIST, list_end(index)
+        elif _INDENTED_CODE.match(line):
+            kind = CODE
+            while index < count and (blank[index] or _INDENTED_CODE.match(content[index])):
+                index += 1
+        else:
+            kind, index = PARAGRAPH, index + 1
+            while index < count and not blank[index]:
+                if _SETEXT_UNDERLINE.match(content[index]):
+                    kind, index = HEADING, index + 1
+                    break
+                if _PARAGRAPH_INTERRUPT.match(content[index]):
+                    break
+                index += 1
+
+        index = skip_blank(index)
+        yield Block(kind, offsets[start], offsets[index])
+
+
+def pack_blocks(
+    md_text: str,
+    blocks: Iterable[Block],
+    max_size: int,
+    measure: Optional[Callable[[str], int]] = None,
+) -> List[str]:
+    """Greedily pack consecutive blocks into chunks of at most ``max_size``.
+
+    Sizes come from ``measure`` applied to each block (e.g. a token counter); without it
+    they are character counts. Chunks are cut only between blocks; a single block larger
+    than the limit becomes a chunk of its own. A heading is never left dangling at the end
+    of a chunk. Every chunk is one slice of ``md_text``, so no text is copied line by line.
+    """
+    chunks: List[str] = []
+    chunk_start = None
+    chunk_end = 0
+    chunk_size = 0
+    last_heading = None
+    last_heading_size = 0
+
+    for block in blocks:
+        size = measure(md_text[block.start:block.end]) if measure else block.end - block.start
+        # A chunk holding nothing but headings takes the next block along even if it overflows
+        if chunk_start is not None and chunk_size + size > max_size and last_heading != chunk_start:
+            cut, carried = chunk_end, 0
+            if last_heading is not None and last_heading > chunk_start:
+                cut, carried = last_heading, last_heading_size
+            chunks.append(md_text[chunk_start:cut])
+            chunk_start, chunk_size = cut, carried
+        if chunk_start is None:
+            chunk_start = block.start
+        chunk_end = block.end
+        chunk_size += size
+        # Track the run of headings the chunk currently ends with, so all of them move along
+        if block.kind != HEADING:
+            last_heading = None
+        elif last_heading is None:
+            last_heading, last_heading_size = block.start, size
+        else:
+            last_heading_size += size
+
+    if chunk_start is not None:
+        chunks.append(md_text[chunk_start:chunk_end])
+    return chunks
@@ -0,0 +1,84 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from typing import Optional
+
+
+# Upper bound for the summed size of all cached translations before LRU eviction kicks in.
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+def default_cache_dir() -> str:
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "translate-md")
+
+
+def cache_key(chunk: str, target_lang: str, model: str, system_prompt: str) -> str:
+    # Length-prefix every part so that different splits of the same bytes never collide.
+    digest = hashlib.sha256()
+    for part in (system_prompt, model, target_lang, chunk):
+        data = part.encode("utf-8")
+        digest.update(len(data).to_bytes(8, "big"))
+        digest.update(data)
+    return digest.hexdigest()
+
+
+class TranslationCache:
+    """Content-addressed store for translated chunks, backed by a single SQLite file.
+
+    Entries are evicted least-recently-used first once the total stored size exceeds
+    ``max_bytes``. The connection is shared between worker threads behind a lock.
+    """
+
+    def __init__(self, directory: str, max_bytes: int = DEFAULT_MAX_BYTES):
+        os.makedirs(directory, exist_ok=True)
+        self.path = os.path.join(directory, "translations.sqlite3")
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS translations ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, size INTEGER NOT NULL, last_used REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS translations_last_used ON translations (last_used)")
+        self._total_bytes = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM translations").fetchone()[0]
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM translations WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            self._conn.execute("UPDATE translations SET last_used = ? WHERE key = ?", (time.time(), key))
+            return row[0]
+
+    def put(self, key: str, value: str) -> None:
+        size = len(value.encode("utf-8"))
+        with self._lock:
+            row = self._conn.execute("SELECT size FROM translations WHERE key = ?", (key,)).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO translations (key, value, size, last_used) VALUES (?, ?, ?, ?)",
+                (key, value, size, time.time()),
+            )
+            self._total_bytes += size - (row[0] if row else 0)
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+
+    def _evict(self) -> None:
+        # Free a little more than strictly needed so that eviction does not run on every put.
+        target = int(self.max_bytes * 0.9)
+        victims = []
+        freed = 0
+        for key, size in self._conn.execute("SELECT key, size FROM translations ORDER BY last_used"):
+            if self._total_bytes - freed <= target:
+                break
+            victims.append((key,))
+            freed += size
+        self._conn.executemany("DELETE FROM translations WHERE key = ?", victims)
+        self._total_bytes -= freed
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -1,11 +1,24 @@
 import argparse
+import fnmatch
 import os
+import re
 import sys
+import threading
 import time
-from typing import List
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
 
 from openai import OpenAI
 
+from translate_md.blocks import iter_blocks, pack_blocks
+from translate_md.cache import DEFAULT_MAX_BYTES, TranslationCache, cache_key, default_cache_dir
+from translate_md.masking import PLACEHOLDER_OPEN, MaskedChunk, mask_markdown, masking_savings
+from translate_md.manifest import block_hash, load_previous_blocks, write_manifest
+from translate_md.progress import Progress
+from translate_md.ratelimit import RateLimiter, is_retryable, retry_delay, status_of
+from translate_md.writer import CHECKPOINT_SUFFIX, ChunkWriter, chunks_fingerprint
+from translate_md.tokens import MAX_CHUNK_TOKENS, TokenCounter, chunk_token_budget, estimate_tokens, token_counter_for_model
+
 
 SYSTEM_PROMPT = (
     "Du bist ein Übersetzer für Markdown. Bewahre die Markdown-Struktur exakt, "
@@ -13,9 +26,35 @@ SYSTEM_PROMPT = (
     "Gib ausschließlich den übersetzten Markdown-Text zurück, ohne Kommentare oder Erklärungen."
 )
 
-# Fallback-safe chunk size in characters to avoid token limits, while keeping performance reasonable.
-# We avoid splitting inside fenced code blocks.
-MAX_CHARS_PER_CHUNK = 8000
+# Chunk sizes are token budgets per model (see translate_md.tokens). Chunks are only cut between
+# Markdown blocks (see translate_md.blocks), never inside code, tables, lists, HTML blocks or
+# front matter.
+
+# Separates blocks inside one request in incremental mode, so the answer can be split per block.
+BLOCK_MARKER = "<!-- translate-md:block -->"
+BLOCK_MARKER_SPLIT = re.compile(r"\s*" + re.escape(BLOCK_MARKER) + r"\s*")
+
+# Attempts per chunk before a transient error is treated as fatal.
+MAX_ATTEMPTS = 5
+
+# Placeholder for the language code in -o/--output-dir when translating into several languages.
+LANG_PLACEHOLDER = "{lang}"
+
+# Tokens of the system and user prompt around each chunk, for the tokens-per-minute budget.
+PROMPT_OVERHEAD_TOKENS = 150
+
+# Directories never searched in directory mode: version control, dependencies, virtualenvs.
+SKIPPED_DIR_NAMES = frozenset({".git", ".hg", ".svn", "node_modules", ".venv", "venv", ".tox", "__pycache__"})
+
+
+def positive_int(value: str) -> int:
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid positive integer: {value!r}")
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1: {value!r}")
+    return number
 
 
 def parse_args() -> argparse.Namespace:
@@ -23,10 +62,108 @@ def parse_args() -> argparse.Namespace:
         prog="translate-md",
         description="Translate a Markdown file to a target language using OpenAI, preserving formatting.",
     )
-    parser.add_argument("-i", "--input", required=True, help="Path to input .md file")
-    parser.add_argument("-o", "--output", required=True, help="Path to output .md file")
-    parser.add_argument("-l", "--target-lang", required=True, help="Target language code (e.g., de, en, es)")
-    return parser.parse_args()
+    parser.add_argument("-i", "--input", help="Path to input .md file")
+    parser.add_argument("-o", "--output", help="Path to output .md file")
+    parser.add_argument("--input-dir", help="Translate all matching files below this directory")
+    parser.add_argument("--output-dir", help="Directory receiving the translated tree (mirrors --input-dir)")
+    parser.add_argument(
+        "--include",
+        action="append",
+        help="Glob of files to translate in directory mode, repeatable (default: *.md)",
+    )
+    parser.add_argument(
+        "--exclude",
+        action="append",
+        default=[],
+        help="Glob of files to skip in directory mode, repeatable",
+    )
+    parser.add_argument(
+        "-l",
+        "--target-lang",
+        required=True,
+        help="Target language code, or several separated by commas (e.g., de or de,fr,es)",
+    )
+    parser.add_argument(
+        "-w",
+        "--workers",
+        type=positive_int,
+        default=1,
+        help="Number of chunks translated in parallel (default: 1)",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        default=default_cache_dir(),
+        help="Directory of the translation cache (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--cache-max-mb",
+        type=positive_int,
+        default=DEFAULT_MAX_BYTES // (1024 * 1024),
+        help="Size limit of the translation cache in MB before old entries are evicted (default: %(default)s)",
+    )
+    parser.add_argument("--no-cache", action="store_true", help="Do not read or write the translation cache")
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Reuse the existing output and its .manifest.json sidecar; only changed blocks are translated",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Continue an interrupted run from its .checkpoint.json instead of starting from zero",
+    )
+    parser.add_argument(
+        "--stats",
+        action="store_true",
+        help="Print per-file token savings from masking code, URLs and comments to stderr",
+    )
+    parser.add_argument(
+        "--progress",
+        action="store_true",
+        help="Report translated chunks per target language on stderr",
+    )
+    parser.add_argument(
+        "--rpm",
+        type=positive_int,
+        default=None,
+        help="Requests per minute shared by all workers (default: learned from rate-limit headers)",
+    )
+    parser.add_argument(
+        "--tpm",
+        type=positive_int,
+        default=None,
+        help="Tokens per minute shared by all workers (default: learned from rate-limit headers)",
+    )
+    parser.add_argument(
+        "--max-chunk-tokens",
+        type=positive_int,
+        default=None,
+        help="Token budget per request (default: derived from the model's output limit)",
+    )
+    args = parser.parse_args()
+
+    file_mode = args.input is not None or args.output is not None
+    dir_mode = args.input_dir is not None or args.output_dir is not None
+    if file_mode == dir_mode:
+        parser.error("use either -i/--input with -o/--output or --input-dir with --output-dir")
+    if file_mode and (args.input is None or args.output is None):
+        parser.error("-i/--input and -o/--output must be given together")
+    if dir_mode and (args.input_dir is None or args.output_dir is None):
+        parser.error("--input-dir and --output-dir must be given together")
+    if args.resume and args.incremental:
+        parser.error("--resume cannot be combined with --incremental")
+    args.target_langs = []
+    for lang in args.target_lang.split(","):
+        lang = lang.strip()
+        if lang and lang not in args.target_langs:
+            args.target_langs.append(lang)
+    if not args.target_langs:
+        parser.error("-l/--target-lang needs at least one language code")
+    if len(args.target_langs) > 1 and any("/" in lang or "\\" in lang for lang in args.target_langs):
+        parser.error("language codes must not contain path separators")
+    if args.include is None:
+        args.include = ["*.md"]
+    return args
 
 
 def load_markdown(path: str) -> str:
@@ -34,63 +171,88 @@ def load_markdown(path: str) -> str:
         return f.read()
 
 
-def split_markdown_into_chunks(md_text: str, max_chars: int = MAX_CHARS_PER_CHUNK) -> List[str]:
-    lines = md_text.splitlines(keepends=True)
-    chunks: List[str] = []
-    current: List[str] = []
-    current_len = 0
-    in_fenced_code = False
-    fence_marker = None  # "```" or "~~~"
-
-    def flush_current():
-        nonlocal current, current_len
-        if current:
-            chunks.append("".join(current))
-            current = []
-            current_len = 0
-
-    for line in lines:
-        stripped = line.lstrip()
-        # Detect start/end of fenced code blocks. Support ``` and ~~~ fences, with optional language tag
-        if stripped.startswith("```") or stripped.startswith("~~~"):
-            marker = "```" if stripped.startswith("```") else "~~~"
-            if not in_fenced_code:
-                in_fenced_code = True
-                fence_marker = marker
-            elif fence_marker == marker:
-                in_fenced_code = False
-                fence_marker = None
-
-        # If adding this line would exceed the max size and we're not inside a code block, flush
-        line_len = len(line)
-        if not in_fenced_code and current_len + line_len > max_chars:
-            flush_current()
-
-        current.append(line)
-        current_len += line_len
-
-    flush_current()
+def matches_any(rel_path: str, patterns: List[str]) -> bool:
+    # Patterns match either the path relative to the input directory or the bare file name.
+    name = rel_path.rsplit("/", 1)[-1]
+    return any(fnmatch.fnmatchcase(rel_path, p) or fnmatch.fnmatchcase(name, p) for p in patterns)
+
+
+def collect_markdown_files(
+    input_dir: str,
+    include: List[str],
+    exclude: List[str],
+    skip_dirs: Iterable[str] = (),
+) -> List[str]:
+    skip = {os.path.abspath(path) for path in skip_dirs}
+    found: List[str] = []
+    for root, dirs, files in os.walk(input_dir):
+        # Never descend into the output tree(s) when they live inside the input tree.
+        dirs[:] = sorted(
+            d for d in dirs
+            if d not in SKIPPED_DIR_NAMES and os.path.abspath(os.path.join(root, d)) not in skip
+        )
+        for name in sorted(files):
+            rel_path = os.path.relpath(os.path.join(root, name), input_dir).replace(os.sep, "/")
+            if matches_any(rel_path, include) and not matches_any(rel_path, exclude):
+                found.append(rel_path)
+    return found
+
+
+def output_path_for_lang(path: str, lang: str, target_langs: List[str], is_dir: bool = False) -> str:
+    # "{lang}" in an output path is replaced by the language code. Without it, a run with
+    # several languages writes README.de.md-style file names, or one subdirectory per language.
+    if LANG_PLACEHOLDER in path:
+        return path.replace(LANG_PLACEHOLDER, lang)
+    if len(target_langs) == 1:
+        return path
+    if is_dir:
+        return os.path.join(path, lang)
+    root, ext = os.path.splitext(path)
+    return f"{root}.{lang}{ext}"
+
+
+def split_markdown_into_chunks(
+    md_text: str,
+    max_tokens: int = MAX_CHUNK_TOKENS,
+    count_tokens: TokenCounter = estimate_tokens,
+) -> List[str]:
+    chunks = pack_blocks(md_text, iter_blocks(md_text), max_tokens, count_tokens)
     return chunks if chunks else [md_text]
 
 
+def split_markdown_into_blocks(md_text: str) -> List[str]:
+    # Blank lines stay attached to the preceding block, so "".join(blocks) == md_text.
+    return [md_text[block.start:block.end] for block in iter_blocks(md_text)]
+
+
 def openai_client_from_env() -> OpenAI:
     api_key = os.environ.get("OPENAI_API_KEY")
     if not api_key:
         print("ERROR: Environment variable OPENAI_API_KEY is not set.", file=sys.stderr)
         sys.exit(1)
-    return OpenAI(api_key=api_key)
-
-
-def translate_chunk(client: OpenAI, chunk: str, target_lang: str, model: str) -> str:
+    # Retries are handled by translate_chunk_with_retry, which shares its view of the rate limits
+    # across workers; retries inside the SDK would bypass that.
+    return OpenAI(api_key=api_key, max_retries=0)
+
+
+def translate_chunk(
+    client: OpenAI,
+    chunk: str,
+    target_lang: str,
+    model: str,
+    limiter: Optional[RateLimiter] = None,
+) -> str:
     user_prompt = (
         "Übersetze den folgenden Markdown-Text in die Zielsprache. Erhalte die Markdown-Struktur exakt. "
         "Verändere keine Codeblöcke oder Inline-Code. Gib nur den übersetzten Markdown-Text zurück, "
         "ohne Kommentare oder Erklärungen.\n\n"
         f"Zielsprache: {target_lang}\n\n"
-        "<markdown>\n" + chunk + "\n</markdown>"
     )
+    if PLACEHOLDER_OPEN in chunk:
+        user_prompt += "Übernimm Platzhalter der Form ⟦0⟧ unverändert an derselben Stelle.\n\n"
+    user_prompt += "<markdown>\n" + chunk + "\n</markdown>"
 
-    response = client.chat.completions.create(
+    raw_response = client.chat.completions.with_raw_response.create(
         model=model,
         messages=[
             {"role": "system", "content": SYSTEM_PROMPT},
@@ -98,32 +260,400 @@ def translate_chunk(client: OpenAI, chunk: str, target_lang: str, model: str) ->
         ],
         temperature=0,
     )
+    if limiter is not None:
+        limiter.update_from_headers(raw_response.headers)
+    response = raw_response.parse()
 
     content = response.choices[0].message.content or ""
     return content
 
 
-def translate_markdown(md_text: str, target_lang: str, model: str) -> str:
-    client = openai_client_from_env()
-    chunks = split_markdown_into_chunks(md_text)
-    outputs: List[str] = []
+def translate_chunk_with_retry(
+    client: OpenAI,
+    chunk: str,
+    target_lang: str,
+    model: str,
+    stop_event: Optional[threading.Event] = None,
+    check: Optional[Callable[[str], str]] = None,
+    limiter: Optional[RateLimiter] = None,
+    tokens: int = 0,
+) -> str:
+    # Retries wait for the server's Retry-After hint when there is one, otherwise for a jittered
+    # exponential backoff; errors a retry cannot fix (400, 401, ...) fail at once. A 429 pauses
+    # the shared limiter, so every worker backs off, not just this one. Waits are interruptible
+    # so a fatal error in another worker does not leave this one sleeping. ``check`` may reject
+    # an answer (e.g. lost placeholders), which is retried like any other error.
+    attempt = 0
+    while True:
+        if limiter is not None and not limiter.acquire(tokens, stop_event):
+            raise RuntimeError("Translation aborted")
+        try:
+            translated = translate_chunk(client, chunk, target_lang, model, limiter)
+            result = check(translated) if check is not None else translated
+        except Exception as exc:  # noqa: BLE001 - broad to keep CLI minimal
+            attempt += 1
+            delay = retry_delay(exc, attempt)
+            if delay is None or attempt >= MAX_ATTEMPTS:
+                raise
+            if limiter is not None and status_of(exc) == 429:
+                limiter.on_rate_limited(delay)
+                continue
+            if stop_event is None:
+                time.sleep(delay)
+            elif stop_event.wait(delay):
+                raise
+            continue
+        if limiter is not None:
+            limiter.on_success()
+        return result
+
+
+def translate_chunks_multi(
+    client: OpenAI,
+    chunks: List[str],
+    target_langs: List[str],
+    model: str,
+    workers: int = 1,
+    cache: Optional[TranslationCache] = None,
+    on_result: Optional[Callable[[int, int, str], None]] = None,
+    limiter: Optional[RateLimiter] = None,
+    progress: Optional[Progress] = None,
+    wanted: Optional[List[List[int]]] = None,
+) -> List[List[str]]:
+    # Fans (language, chunk) work items out over one pool. ``wanted`` lists the chunk indices
+    # needed per language (default: all). Every chunk is masked once and shared by all languages;
+    # cache keys use the masked text and the language, so edits inside code or URLs keep their
+    # entries. Results are stored by language and chunk index, so completion order does not
+    # matter. With ``on_result`` every translation is handed over as (language index, chunk
+    # index, text) as soon as it is known (possibly from a worker thread) and is not kept in the
+    # returned lists.
+    if wanted is None:
+        wanted = [list(range(len(chunks)))] * len(target_langs)
+    masked: Dict[int, MaskedChunk] = {}
+    outputs: List[List[str]] = [[""] * len(chunks) for _ in target_langs]
+    keys: Dict[Tuple[int, int], str] = {}
+    pending: List[Tuple[int, int]] = []
+
+    def finish(lang: int, index: int, text: str, cached: bool = False) -> None:
+        if on_result is None:
+            outputs[lang][index] = text
+        else:
+            on_result(lang, index, text)
+        if progress is not None:
+            progress.advance(lang, cached)
+
+    for lang, indices in enumerate(wanted):
+        if progress is not None:
+            progress.add_total(lang, len(indices))
+        for index in indices:
+            item = masked.get(index)
+            if item is None:
+                item = masked[index] = mask_markdown(chunks[index])
+            if not item.translatable:
+                finish(lang, index, item.source)
+                continue
+            if cache is not None:
+                keys[lang, index] = cache_key(item.text, target_langs[lang], model, SYSTEM_PROMPT)
+                cached = cache.get(keys[lang, index])
+                if cached is not None:
+                    finish(lang, index, item.restore(cached), cached=True)
+                    continue
+            pending.append((index, lang))
+    # Chunk-major order keeps all languages of a document moving forward together.
+    pending.sort()
+
+    stop_event = threading.Event()
+
+    def run(job: Tuple[int, int]) -> None:
+        if stop_event.is_set():
+            raise RuntimeError("Translation aborted")
+        index, lang = job
+        item = masked[index]
+        # Rough request cost for the token budget: the prompt plus an answer of similar length.
+        tokens = 2 * estimate_tokens(item.text) + PROMPT_OVERHEAD_TOKENS
+        result = translate_chunk_with_retry(
+            client, item.text, target_langs[lang], model, stop_event, item.check, limiter, tokens
+        )
+        if cache is not None:
+            cache.put(keys[lang, index], result)
+        finish(lang, index, item.restore(result))
+
+    if workers <= 1 or len(pending) <= 1:
+        for job in pending:
+            run(job)
+        return outputs
+
+    with ThreadPoolExecutor(max_workers=min(workers, len(pending))) as pool:
+        futures = [pool.submit(run, job) for job in pending]
+        try:
+            for future in as_completed(futures):
+                future.result()
+        except BaseException:
+            # Stop on the first fatal error: drop queued chunks and wake up workers in backoff.
+            stop_event.set()
+            for future in futures:
+                future.cancel()
+            raise
+
+    return outputs
+
+
+def translate_chunks(
+    client: OpenAI,
+    chunks: List[str],
+    target_lang: str,
+    model: str,
+    workers: int = 1,
+    cache: Optional[TranslationCache] = None,
+    on_result: Optional[Callable[[int, str], None]] = None,
+    limiter: Optional[RateLimiter] = None,
+) -> List[str]:
+    deliver = None
+    if on_result is not None:
+        def deliver(lang: int, index: int, text: str) -> None:
+            on_result(index, text)
+    return translate_chunks_multi(client, chunks, [target_lang], model, workers, cache, deliver, limiter)[0]
+
+
+def plan_chunks(
+    documents: List[str],
+    model: str,
+    max_chunk_tokens: Optional[int] = None,
+    stats: Optional[List[Tuple[int, int, int]]] = None,
+) -> Tuple[List[str], List[Tuple[int, int]]]:
+    budget = chunk_token_budget(model, max_chunk_tokens)
+    count_tokens = token_counter_for_model(model)
+
+    # Chunks of all documents go through one pool, so small files do not leave workers idle.
+    chunks: List[str] = []
+    bounds: List[Tuple[int, int]] = []
+    for md_text in documents:
+        doc_chunks = split_markdown_into_chunks(md_text, budget, count_tokens)
+        bounds.append((len(chunks), len(chunks) + len(doc_chunks)))
+        chunks.extend(doc_chunks)
+        if stats is not None:
+            stats.append(masking_savings(doc_chunks, count_tokens))
+    return chunks, bounds
+
+
+def translate_documents(
+    client: OpenAI,
+    documents: List[str],
+    target_lang: str,
+    model: str,
+    workers: int = 1,
+    cache: Optional[TranslationCache] = None,
+    max_chunk_tokens: Optional[int] = None,
+    stats: Optional[List[Tuple[int, int, int]]] = None,
+    limiter: Optional[RateLimiter] = None,
+) -> List[str]:
+    chunks, bounds = plan_chunks(documents, model, max_chunk_tokens, stats)
+    outputs = translate_chunks(client, chunks, target_lang, model, workers, cache, limiter=limiter)
+    return ["".join(outputs[start:end]) for start, end in bounds]
+
+
+def translate_documents_to_files(
+    client: OpenAI,
+    documents: List[str],
+    output_paths: List[List[str]],
+    target_langs: List[str],
+    model: str,
+    workers: int = 1,
+    cache: Optional[TranslationCache] = None,
+    max_chunk_tokens: Optional[int] = None,
+    stats: Optional[List[Tuple[int, int, int]]] = None,
+    resume: bool = False,
+    limiter: Optional[RateLimiter] = None,
+    progress: Optional[Progress] = None,
+) -> None:
+    # Like translate_documents, but for every target language (``output_paths`` holds one path per
+    # language and document) and every document is streamed to disk chunk by chunk through a
+    # ChunkWriter, so an interrupted run keeps what it has already paid for. Each document is
+    # committed as soon as its last chunk is written. The documents are chunked once for all
+    # languages.
+    chunks, bounds = plan_chunks(documents, model, max_chunk_tokens, stats)
+    # Per language: the chunks still to translate, and their writer and index within the document.
+    wanted: List[List[int]] = []
+    owners: List[Dict[int, Tuple[ChunkWriter, int]]] = []
+    for target_lang, lang_paths in zip(target_langs, output_paths):
+        todo: List[int] = []
+        owner: Dict[int, Tuple[ChunkWriter, int]] = {}
+        for output_path, (start, end) in zip(lang_paths, bounds):
+            fingerprint = chunks_fingerprint(chunks[start:end], target_lang, model, SYSTEM_PROMPT)
+            writer = ChunkWriter(output_path, fingerprint, end - start, resume)
+            if writer.done:
+                writer.commit()
+                continue
+            for index in range(start + writer.completed, end):
+                todo.append(index)
+                owner[index] = (writer, index - start)
+        wanted.append(todo)
+        owners.append(owner)
+
+    def deliver(lang: int, index: int, text: str) -> None:
+        writer, local = owners[lang][index]
+        writer.add(local, text)
+
+    translate_chunks_multi(
+        client, chunks, target_langs, model, workers, cache, deliver, limiter, progress, wanted
+    )
 
-    # Simple retry policy for transient errors
-    for chunk in chunks:
-        attempt = 0
-        backoff = 1.0
-        while True:
-            try:
-                outputs.append(translate_chunk(client, chunk, target_lang, model))
-                break
-            except Exception as exc:  # noqa: BLE001 - broad to keep CLI minimal
-                attempt += 1
-                if attempt >= 5:
-                    raise
-                time.sleep(backoff)
-                backoff = min(backoff * 2, 10.0)
 
-    return "".join(outputs)
+def translate_markdown(
+    md_text: str,
+    target_lang: str,
+    model: str,
+    workers: int = 1,
+    cache: Optional[TranslationCache] = None,
+    client: Optional[OpenAI] = None,
+    max_chunk_tokens: Optional[int] = None,
+) -> str:
+    if client is None:
+        client = openai_client_from_env()
+    return translate_documents(client, [md_text], target_lang, model, workers, cache, max_chunk_tokens)[0]
+
+
+def fit_block(source: str, translated: str) -> str:
+    # Keep the surrounding whitespace of the source block; the model tends to trim it.
+    lead = source[:len(source) - len(source.lstrip())]
+    trail = source[len(source.rstrip()):]
+    return lead + translated.strip() + trail
+
+
+def group_changed_blocks(
+    doc_blocks: List[List[str]],
+    results: List[List[Optional[str]]],
+    budget: int,
+    block_tokens: Callable[[int, int], int],
+) -> List[Tuple[int, List[int]]]:
+    # Runs of consecutive untranslated blocks, packed up to the token budget, as (document, block indices).
+    groups: List[Tuple[int, List[int]]] = []
+    for doc_index, blocks in enumerate(doc_blocks):
+        current: List[int] = []
+        current_tokens = 0
+        for block_index in range(len(blocks)):
+            if results[doc_index][block_index] is not None:
+                if current:
+                    groups.append((doc_index, current))
+                current, current_tokens = [], 0
+                continue
+            tokens = block_tokens(doc_index, block_index)
+            if current and current_tokens + tokens > budget:
+                groups.append((doc_index, current))
+                current, current_tokens = [], 0
+            current.append(block_index)
+            current_tokens += tokens
+        if current:
+            groups.append((doc_index, current))
+    return groups
+
+
+def translate_documents_incremental(
+    client: OpenAI,
+    documents: List[str],
+    previous: List[List[Dict[str, str]]],
+    target_langs: List[str],
+    model: str,
+    workers: int = 1,
+    cache: Optional[TranslationCache] = None,
+    max_chunk_tokens: Optional[int] = None,
+    stats: Optional[List[List[Tuple[int, int, int]]]] = None,
+    limiter: Optional[RateLimiter] = None,
+    progress: Optional[Progress] = None,
+) -> List[List[List[Tuple[str, str]]]]:
+    """Translate only the blocks whose hash is not in ``previous``.
+
+    ``previous`` holds the known translations per language and document. Returns
+    ``(source hash, translated block)`` pairs per language and document. Runs of changed
+    blocks are packed into one request, separated by ``BLOCK_MARKER``; if the answer does
+    not split back into the same number of blocks, those blocks are retried one by one.
+    A run that changed for several languages is masked once and sent once per language.
+    """
+    doc_blocks = [split_markdown_into_blocks(md_text) for md_text in documents]
+    doc_hashes = [[block_hash(block) for block in blocks] for blocks in doc_blocks]
+    # Whitespace-only blocks (e.g. leading blank lines) never need a request.
+    results: List[List[List[Optional[str]]]] = [
+        [
+            [block if not block.strip() else known.get(digest) for block, digest in zip(blocks, hashes)]
+            for blocks, known, hashes in zip(doc_blocks, lang_previous, doc_hashes)
+        ]
+        for lang_previous in previous
+    ]
+
+    budget = chunk_token_budget(model, max_chunk_tokens)
+    count_tokens = token_counter_for_model(model)
+    token_counts: Dict[Tuple[int, int], int] = {}
+
+    def block_tokens(doc_index: int, block_index: int) -> int:
+        key = (doc_index, block_index)
+        if key not in token_counts:
+            token_counts[key] = count_tokens(doc_blocks[doc_index][block_index])
+        return token_counts[key]
+
+    # Identical request texts of different languages share one chunk (and one masking pass).
+    chunks: List[str] = []
+    chunk_indices: Dict[str, int] = {}
+
+    def chunk_index(text: str) -> int:
+        if text not in chunk_indices:
+            chunk_indices[text] = len(chunks)
+            chunks.append(text)
+        return chunk_indices[text]
+
+    groups: List[List[Tuple[int, List[int]]]] = []
+    wanted: List[List[int]] = []
+    for lang_results in results:
+        lang_groups = group_changed_blocks(doc_blocks, lang_results, budget, block_tokens)
+        lang_chunks = [
+            ("\n" + BLOCK_MARKER + "\n\n").join(doc_blocks[doc_index][i] for i in indices)
+            for doc_index, indices in lang_groups
+        ]
+        groups.append(lang_groups)
+        wanted.append([chunk_index(chunk) for chunk in lang_chunks])
+        if stats is not None:
+            stats.append([
+                masking_savings(
+                    [chunk for chunk, (owner, _) in zip(lang_chunks, lang_groups) if owner == doc_index],
+                    count_tokens,
+                )
+                for doc_index in range(len(documents))
+            ])
+    outputs = translate_chunks_multi(
+        client, chunks, target_langs, model, workers, cache, None, limiter, progress, wanted
+    )
+
+    retry: List[List[Tuple[int, int]]] = []
+    for lang, lang_results in enumerate(results):
+        lang_retry: List[Tuple[int, int]] = []
+        for (doc_index, indices), index in zip(groups[lang], wanted[lang]):
+            output = outputs[lang][index]
+            pieces = BLOCK_MARKER_SPLIT.split(output) if len(indices) > 1 else [output]
+            if len(pieces) != len(indices):
+                lang_retry.extend((doc_index, i) for i in indices)
+                continue
+            for block_index, piece in zip(indices, pieces):
+                lang_results[doc_index][block_index] = fit_block(doc_blocks[doc_index][block_index], piece)
+        retry.append(lang_retry)
+
+    if any(retry):
+        chunks, chunk_indices = [], {}
+        wanted = [[chunk_index(doc_blocks[d][i]) for d, i in lang_retry] for lang_retry in retry]
+        single = translate_chunks_multi(
+            client, chunks, target_langs, model, workers, cache, None, limiter, progress, wanted
+        )
+        for lang, lang_retry in enumerate(retry):
+            for (doc_index, block_index), index in zip(lang_retry, wanted[lang]):
+                results[lang][doc_index][block_index] = fit_block(
+                    doc_blocks[doc_index][block_index], single[lang][index]
+                )
+
+    return [
+        [
+            [(digest, translated or "") for digest, translated in zip(hashes, translated_blocks)]
+            for hashes, translated_blocks in zip(doc_hashes, lang_results)
+        ]
+        for lang_results in results
+    ]
 
 
 def write_output(path: str, content: str) -> None:
@@ -131,12 +661,90 @@ def write_output(path: str, content: str) -> None:
         f.write(content)
 
 
-def main() -> None:
-    args = parse_args()
-
+def translate_and_write(
+    client: OpenAI,
+    documents: List[str],
+    output_paths: List[List[str]],
+    args: argparse.Namespace,
+    model: str,
+    cache: Optional[TranslationCache],
+) -> None:
+    # ``output_paths`` holds one list of paths per target language, parallel to ``documents``.
+    target_langs = args.target_langs
+    stats: Optional[List[List[Tuple[int, int, int]]]] = [] if args.stats else None
+    limiter = RateLimiter(args.rpm, args.tpm)
+    progress = Progress(target_langs) if args.progress else None
+    if not args.incremental:
+        doc_stats: Optional[List[Tuple[int, int, int]]] = [] if args.stats else None
+        try:
+            translate_documents_to_files(
+                client, documents, output_paths, target_langs, model, args.workers, cache,
+                args.max_chunk_tokens, doc_stats, args.resume, limiter, progress,
+            )
+        except OSError as exc:
+            print(f"ERROR: Failed to write output file: {exc}", file=sys.stderr)
+            sys.exit(1)
+        except Exception as exc:  # noqa: BLE001
+            message = f"ERROR: Translation failed: {exc}"
+            # --resume only helps if some chunks reached a checkpoint and a retry can succeed
+            # (not for a wrong API key or model name).
+            checkpointed = any(
+                os.path.exists(path + CHECKPOINT_SUFFIX) for lang_paths in output_paths for path in lang_paths
+            )
+            if checkpointed and is_retryable(exc):
+                message += " (completed chunks are kept; re-run with --resume)"
+            print(message, file=sys.stderr)
+            sys.exit(1)
+        finally:
+            if progress is not None:
+                progress.finish()
+        if stats is not None:
+            # Every language sends the same chunks.
+            stats.extend(doc_stats for _ in target_langs)
+    else:
+        try:
+            previous = [
+                [load_previous_blocks(path, target_lang, model, SYSTEM_PROMPT) for path in lang_paths]
+                for target_lang, lang_paths in zip(target_langs, output_paths)
+            ]
+            translated = translate_documents_incremental(
+                client, documents, previous, target_langs, model, args.workers, cache,
+                args.max_chunk_tokens, stats, limiter, progress,
+            )
+        except Exception as exc:  # noqa: BLE001
+            print(f"ERROR: Translation failed: {exc}", file=sys.stderr)
+            sys.exit(1)
+        finally:
+            if progress is not None:
+                progress.finish()
+
+        for target_lang, lang_paths, lang_blocks in zip(target_langs, output_paths, translated):
+            for output_path, blocks in zip(lang_paths, lang_blocks):
+                try:
+                    output_dir = os.path.dirname(output_path)
+                    if output_dir:
+                        os.makedirs(output_dir, exist_ok=True)
+                    write_output(output_path, "".join(text for _, text in blocks))
+                    entries = [(digest, len(text)) for digest, text in blocks]
+                    write_manifest(output_path, target_lang, model, SYSTEM_PROMPT, entries)
+                except Exception as exc:  # noqa: BLE001
+                    print(f"ERROR: Failed to write output file {output_path}: {exc}", file=sys.stderr)
+                    sys.exit(1)
+
+    if stats is not None:
+        for lang_paths, lang_stats in zip(output_paths, stats):
+            for output_path, (total, sent, skipped) in zip(lang_paths, lang_stats):
+                saved = total - sent
+                share = 100.0 * saved / total if total else 0.0
+                print(
+                    f"{output_path}: ~{saved} of ~{total} input tokens not sent ({share:.0f}%), "
+                    f"{skipped} chunk(s) skipped",
+                    file=sys.stderr,
+                )
+
+
+def run_file(args: argparse.Namespace, model: str, cache: Optional[TranslationCache]) -> None:
     input_path = args.input
-    output_path = args.output
-    target_lang = args.target_lang
 
     if not os.path.isfile(input_path):
         print(f"ERROR: Input file not found: {input_path}", file=sys.stderr)
@@ -148,26 +756,64 @@ def main() -> None:
         print(f"ERROR: Failed to read input file: {exc}", file=sys.stderr)
         sys.exit(1)
 
+    output_paths = [[output_path_for_lang(args.output, lang, args.target_langs)] for lang in args.target_langs]
+    translate_and_write(openai_client_from_env(), [md_text], output_paths, args, model, cache)
+
+
+def run_directory(args: argparse.Namespace, model: str, cache: Optional[TranslationCache]) -> None:
+    input_dir = args.input_dir
+    output_dir = args.output_dir
+
+    if not os.path.isdir(input_dir):
+        print(f"ERROR: Input directory not found: {input_dir}", file=sys.stderr)
+        sys.exit(1)
+
+    lang_dirs = [output_path_for_lang(output_dir, lang, args.target_langs, is_dir=True) for lang in args.target_langs]
+    rel_paths = collect_markdown_files(input_dir, args.include, args.exclude, skip_dirs=[output_dir, *lang_dirs])
+    if not rel_paths:
+        print(f"ERROR: No matching files in input directory: {input_dir}", file=sys.stderr)
+        sys.exit(1)
+
+    documents: List[str] = []
+    for rel_path in rel_paths:
+        try:
+            documents.append(load_markdown(os.path.join(input_dir, rel_path)))
+        except Exception as exc:  # noqa: BLE001
+            print(f"ERROR: Failed to read input file {rel_path}: {exc}", file=sys.stderr)
+            sys.exit(1)
+
+    # One client means one HTTP connection pool shared by every file and worker.
+    output_paths = [
+        [os.path.join(lang_dir, *rel_path.split("/")) for rel_path in rel_paths] for lang_dir in lang_dirs
+    ]
+    translate_and_write(openai_client_from_env(), documents, output_paths, args, model, cache)
+
+
+def main() -> None:
+    args = parse_args()
+
     # Choose a sensible default current ChatCompletion model; user can edit here if needed.
     # Using a lightweight model name for speed/cost by default.
     default_model = os.environ.get("OPENAI_MODEL", "gpt-4o-mini")
 
-    try:
-        translated = translate_markdown(md_text, target_lang, default_model)
-    except Exception as exc:  # noqa: BLE001
-        print(f"ERROR: Translation failed: {exc}", file=sys.stderr)
-        sys.exit(1)
+    cache = None
+    if not args.no_cache:
+        try:
+            cache = TranslationCache(args.cache_dir, max_bytes=args.cache_max_mb * 1024 * 1024)
+        except Exception as exc:  # noqa: BLE001
+            print(f"WARNING: Translation cache disabled: {exc}", file=sys.stderr)
 
     try:
-        write_output(output_path, translated)
-    except Exception as exc:  # noqa: BLE001
-        print(f"ERROR: Failed to write output file: {exc}", file=sys.stderr)
-        sys.exit(1)
+        if args.input_dir is not None:
+            run_directory(args, default_model, cache)
+        else:
+            run_file(args, default_model, cache)
+    finally:
+        if cache is not None:
+            cache.close()
 
     # Minimal CLI: no extra output on success
 
 
 if __name__ == "__main__":
     main()
-
-
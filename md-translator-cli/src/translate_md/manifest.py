@@ -0,0 +1,76 @@
+import hashlib
+import json
+import os
+from typing import Dict, List, Tuple
+
+
+MANIFEST_VERSION = 1
+MANIFEST_SUFFIX = ".manifest.json"
+
+
+def manifest_path(output_path: str) -> str:
+    return output_path + MANIFEST_SUFFIX
+
+
+def block_hash(block: str) -> str:
+    return hashlib.sha256(block.encode("utf-8")).hexdigest()
+
+
+def prompt_hash(system_prompt: str) -> str:
+    return hashlib.sha256(system_prompt.encode("utf-8")).hexdigest()[:16]
+
+
+def load_previous_blocks(output_path: str, target_lang: str, model: str, system_prompt: str) -> Dict[str, str]:
+    """Map source block hashes to their translations from an earlier run.
+
+    The manifest only stores ``[hash, length]`` pairs; the translated text itself is
+    sliced out of the existing output file. Anything that does not line up exactly
+    (missing files, other language/model/prompt, a hand-edited output) yields an empty
+    mapping, which simply means every block is translated again.
+    """
+    try:
+        with open(manifest_path(output_path), "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        with open(output_path, "r", encoding="utf-8", newline="") as f:
+            translated = f.read()
+    except (OSError, ValueError):
+        return {}
+
+    if (
+        manifest.get("version") != MANIFEST_VERSION
+        or manifest.get("target_lang") != target_lang
+        or manifest.get("model") != model
+        or manifest.get("prompt") != prompt_hash(system_prompt)
+    ):
+        return {}
+
+    entries = manifest.get("blocks", [])
+    if sum(length for _, length in entries) != len(translated):
+        return {}
+
+    blocks: Dict[str, str] = {}
+    offset = 0
+    for digest, length in entries:
+        blocks[digest] = translated[offset:offset + length]
+        offset += length
+    return blocks
+
+
+def write_manifest(
+    output_path: str,
+    target_lang: str,
+    model: str,
+    system_prompt: str,
+    entries: List[Tuple[str, int]],
+) -> None:
+    manifest = {
+        "version": MANIFEST_VERSION,
+        "target_lang": target_lang,
+        "model": model,
+        "prompt": prompt_hash(system_prompt),
+        "blocks": [[digest, length] for digest, length in entries],
+    }
+    tmp_path = manifest_path(output_path) + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, separators=(",", ":"))
+    os.replace(tmp_path, manifest_path(output_path))
@@ -0,0 +1,95 @@
+import re
+from typing import List, Tuple
+
+from translate_md.blocks import CODE, FRONT_MATTER, iter_blocks
+from translate_md.tokens import TokenCounter
+
+
+PLACEHOLDER_OPEN = "⟦"
+PLACEHOLDER_CLOSE = "⟧"
+
+_PLACEHOLDER = re.compile(PLACEHOLDER_OPEN + r"(\d+)" + PLACEHOLDER_CLOSE)
+
+# Inline spans the model must not touch: code spans, HTML comments, link destinations and URLs.
+_INLINE_SPANS = re.compile(
+    r"(?P<ticks>`+).+?(?<!`)(?P=ticks)(?!`)"
+    r"|<!--.*?-->"
+    r"|(?<=\]\()[^)\s]+"
+    r"|(?:https?|ftp)://[^\s<>\"'`)\]]*[^\s<>\"'`)\].,;:!?]"
+    r"|mailto:[^\s<>\"'`)\]]+",
+    re.DOTALL,
+)
+
+
+class PlaceholderError(ValueError):
+    """The model dropped, duplicated or invented a placeholder."""
+
+
+class MaskedChunk:
+    """A chunk with untranslatable spans replaced by numbered placeholders like ``⟦0⟧``."""
+
+    __slots__ = ("source", "text", "spans")
+
+    def __init__(self, source: str, text: str, spans: List[str]):
+        self.source = source
+        self.text = text
+        self.spans = spans
+
+    @property
+    def translatable(self) -> bool:
+        # Nothing but placeholders, whitespace, digits and punctuation left: no request needed.
+        return any(ch.isalpha() for ch in _PLACEHOLDER.sub("", self.text))
+
+    def check(self, translated: str) -> str:
+        found = sorted(int(index) for index in _PLACEHOLDER.findall(translated))
+        if found != list(range(len(self.spans))):
+            raise PlaceholderError(
+                f"Translation returned placeholders {found}, expected 0..{len(self.spans) - 1}"
+            )
+        return translated
+
+    def restore(self, translated: str) -> str:
+        if not self.spans:
+            return translated
+        self.check(translated)
+        return _PLACEHOLDER.sub(lambda match: self.spans[int(match.group(1))], translated)
+
+
+def mask_markdown(chunk: str) -> MaskedChunk:
+    # Text that already contains the placeholder brackets cannot be restored unambiguously.
+    if PLACEHOLDER_OPEN in chunk or PLACEHOLDER_CLOSE in chunk:
+        return MaskedChunk(chunk, chunk, [])
+
+    spans: List[str] = []
+    parts: List[str] = []
+
+    def placeholder(span: str) -> str:
+        spans.append(span)
+        return f"{PLACEHOLDER_OPEN}{len(spans) - 1}{PLACEHOLDER_CLOSE}"
+
+    for block in iter_blocks(chunk):
+        text = chunk[block.start:block.end]
+        if block.kind in (CODE, FRONT_MATTER):
+            # Keep the trailing blank lines outside the placeholder so the layout survives.
+            body = text.rstrip()
+            parts.append(placeholder(body))
+            parts.append(text[len(body):])
+        else:
+            parts.append(_INLINE_SPANS.sub(lambda match: placeholder(match.group(0)), text))
+
+    return MaskedChunk(chunk, "".join(parts), spans)
+
+
+def masking_savings(chunks: List[str], count_tokens: TokenCounter) -> Tuple[int, int, int]:
+    """Return ``(tokens before masking, tokens sent, chunks skipped)`` for a document."""
+    total = 0
+    sent = 0
+    skipped = 0
+    for chunk in chunks:
+        masked = mask_markdown(chunk)
+        total += count_tokens(chunk)
+        if masked.translatable:
+            sent += count_tokens(masked.text)
+        else:
+            skipped += 1
+    return total, sent, skipped
@@ -0,0 +1,60 @@
+import sys
+import threading
+import time
+from typing import List, Optional, TextIO
+
+
+# Minimum seconds between two redraws of the status line on a terminal.
+REDRAW_INTERVAL = 0.1
+
+
+class Progress:
+    """Thread-safe per-language chunk counters, reported on stderr.
+
+    On a terminal a single status line such as ``de 12/40 (3 cached) | fr 9/40`` is redrawn
+    in place. Otherwise one line is printed whenever a language is complete, so logs stay short.
+    """
+
+    def __init__(self, languages: List[str], stream: Optional[TextIO] = None):
+        self.languages = languages
+        self.stream = stream if stream is not None else sys.stderr
+        self.totals = [0] * len(languages)
+        self.done = [0] * len(languages)
+        self.cached = [0] * len(languages)
+        self._interactive = self.stream.isatty()
+        self._lock = threading.Lock()
+        self._drawn = 0.0
+
+    def add_total(self, lang: int, count: int) -> None:
+        with self._lock:
+            self.totals[lang] += count
+
+    def advance(self, lang: int, cached: bool = False) -> None:
+        with self._lock:
+            self.done[lang] += 1
+            if cached:
+                self.cached[lang] += 1
+            if self._interactive:
+                now = time.monotonic()
+                if now - self._drawn >= REDRAW_INTERVAL or self.done[lang] == self.totals[lang]:
+                    self._drawn = now
+                    self.stream.write("\r" + self._status())
+                    self.stream.flush()
+            elif self.done[lang] == self.totals[lang]:
+                self.stream.write(self._describe(lang) + "\n")
+                self.stream.flush()
+
+    def finish(self) -> None:
+        with self._lock:
+            if self._interactive and any(self.totals):
+                self.stream.write("\r" + self._status() + "\n")
+                self.stream.flush()
+
+    def _describe(self, lang: int) -> str:
+        text = f"{self.languages[lang]} {self.done[lang]}/{self.totals[lang]}"
+        if self.cached[lang]:
+            text += f" ({self.cached[lang]} cached)"
+        return text
+
+    def _status(self) -> str:
+        return " | ".join(self._describe(lang) for lang in range(len(self.languages)))
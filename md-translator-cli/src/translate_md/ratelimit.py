@@ -0,0 +1,181 @@
+import email.utils
+import random
+import re
+import threading
+import time
+from typing import Mapping, Optional
+
+
+# Status codes worth another attempt; other 4xx answers (bad request, auth, ...) are final.
+RETRYABLE_STATUS = {408, 409, 429}
+
+# Backoff for errors without a server hint: full jitter over an exponentially growing window.
+BACKOFF_BASE = 1.0
+BACKOFF_CAP = 30.0
+
+# Server hints beyond this are clamped; a wait this long usually means a quota problem.
+MAX_RETRY_AFTER = 120.0
+
+# Buckets hold this many seconds worth of budget, which bounds the burst after an idle phase.
+BURST_SECONDS = 10.0
+
+# AIMD: every 429 halves the effective rate, every success wins back a little of it.
+MIN_SCALE = 0.1
+SCALE_DECREASE = 0.5
+SCALE_INCREASE = 0.02
+
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+_DURATION_UNITS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+
+
+def parse_duration(value: str) -> Optional[float]:
+    # Reset headers look like "1s", "6m0s", "20ms" or plain seconds.
+    value = value.strip()
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    parts = _DURATION_PART.findall(value)
+    if not parts or "".join(number + unit for number, unit in parts) != value:
+        return None
+    return sum(float(number) * _DURATION_UNITS[unit] for number, unit in parts)
+
+
+def retry_after_seconds(headers: Mapping[str, str]) -> Optional[float]:
+    value = headers.get("retry-after-ms")
+    if value is not None:
+        try:
+            return max(float(value) / 1000.0, 0.0)
+        except ValueError:
+            pass
+    value = headers.get("retry-after")
+    if value is None:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        retry_at = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(retry_at.timestamp() - time.time(), 0.0)
+
+
+def status_of(exc: BaseException) -> Optional[int]:
+    return getattr(exc, "status_code", None)
+
+
+def is_retryable(exc: BaseException) -> bool:
+    """Whether another attempt may succeed: network errors, 5xx and RETRYABLE_STATUS."""
+    status = status_of(exc)
+    return status is None or status >= 500 or status in RETRYABLE_STATUS
+
+
+def retry_delay(exc: BaseException, attempt: int) -> Optional[float]:
+    """Seconds to wait before retrying after ``exc``, or ``None`` if retrying cannot help."""
+    if not is_retryable(exc):
+        return None
+    response = getattr(exc, "response", None)
+    headers = getattr(response, "headers", None)
+    if headers is not None:
+        hinted = retry_after_seconds(headers)
+        if hinted is not None:
+            return min(hinted, MAX_RETRY_AFTER)
+    return random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * 2 ** attempt))
+
+
+class RateLimiter:
+    """Token-bucket limiter for requests and tokens per minute, shared by all workers.
+
+    Budgets given as ``rpm``/``tpm`` are fixed; otherwise they are learned from the
+    ``x-ratelimit-*`` response headers. A 429 pauses every caller until the server's
+    retry hint has passed and halves the effective rate, which then recovers slowly
+    with each successful request.
+    """
+
+    def __init__(self, rpm: Optional[float] = None, tpm: Optional[float] = None):
+        self._cond = threading.Condition()
+        self._fixed = rpm is not None or tpm is not None
+        self._rpm = rpm
+        self._tpm = tpm
+        self.scale = 1.0
+        self._requests = self._capacity(rpm)
+        self._tokens = self._capacity(tpm)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+
+    def _capacity(self, per_minute: Optional[float]) -> float:
+        if not per_minute:
+            return 0.0
+        return max(per_minute * self.scale * BURST_SECONDS / 60.0, 1.0)
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._updated
+        self._updated = now
+        if self._rpm:
+            self._requests = min(self._capacity(self._rpm), self._requests + elapsed * self._rpm * self.scale / 60.0)
+        if self._tpm:
+            self._tokens = min(self._capacity(self._tpm), self._tokens + elapsed * self._tpm * self.scale / 60.0)
+
+    def acquire(self, tokens: int = 0, stop_event: Optional[threading.Event] = None) -> bool:
+        """Block until one request of about ``tokens`` tokens may be sent.
+
+        Returns ``False`` if ``stop_event`` was set while waiting.
+        """
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                self._refill(now)
+                wait = self._paused_until - now
+                if wait <= 0:
+                    # A request larger than the whole bucket only waits for a full bucket.
+                    need_requests = 1.0 - self._requests if self._rpm else 0.0
+                    need_tokens = min(tokens, self._capacity(self._tpm)) - self._tokens if self._tpm else 0.0
+                    if need_requests <= 0 and need_tokens <= 0:
+                        if self._rpm:
+                            self._requests -= 1.0
+                        if self._tpm:
+                            self._tokens -= tokens
+                        return True
+                    wait = max(
+                        need_requests * 60.0 / (self._rpm * self.scale) if need_requests > 0 else 0.0,
+                        need_tokens * 60.0 / (self._tpm * self.scale) if need_tokens > 0 else 0.0,
+                    )
+                if stop_event is not None and stop_event.is_set():
+                    return False
+                # Wake up regularly so a stop request is noticed quickly.
+                self._cond.wait(min(wait, 0.5))
+
+    def on_success(self) -> None:
+        with self._cond:
+            self.scale = min(1.0, self.scale + SCALE_INCREASE)
+
+    def on_rate_limited(self, delay: float) -> None:
+        with self._cond:
+            self._paused_until = max(self._paused_until, time.monotonic() + delay)
+            self.scale = max(MIN_SCALE, self.scale * SCALE_DECREASE)
+            self._cond.notify_all()
+
+    def update_from_headers(self, headers: Mapping[str, str]) -> None:
+        with self._cond:
+            now = time.monotonic()
+            for kind in ("requests", "tokens"):
+                limit = headers.get(f"x-ratelimit-limit-{kind}")
+                if limit is not None and not self._fixed:
+                    try:
+                        learned = float(limit)
+                    except ValueError:
+                        learned = 0.0
+                    if learned > 0 and kind == "requests" and self._rpm is None:
+                        self._rpm, self._requests = learned, self._capacity(learned)
+                    elif learned > 0 and kind == "tokens" and self._tpm is None:
+                        self._tpm, self._tokens = learned, self._capacity(learned)
+                # The server says the window is used up: hold everyone back until it resets.
+                remaining = headers.get(f"x-ratelimit-remaining-{kind}")
+                reset = headers.get(f"x-ratelimit-reset-{kind}")
+                if remaining is not None and reset is not None and remaining.strip() == "0":
+                    seconds = parse_duration(reset)
+                    if seconds is not None:
+                        self._paused_until = max(self._paused_until, now + min(seconds, MAX_RETRY_AFTER))
+            self._cond.notify_all()
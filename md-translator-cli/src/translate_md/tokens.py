@@ -0,0 +1,86 @@
+import math
+import re
+from typing import Callable, Optional
+
+try:
+    import tiktoken
+    TIKTOKEN_AVAILABLE = True
+except ImportError:
+    TIKTOKEN_AVAILABLE = False
+
+
+TokenCounter = Callable[[str], int]
+
+# Maximum completion tokens per request. A translation is roughly as long as its source,
+# so the output limit (not the much larger context window) bounds the chunk size.
+# Keys are matched as prefixes of the model name that end at a "-" (e.g. a date suffix);
+# the longest match wins.
+MODEL_OUTPUT_TOKENS = {
+    "gpt-3.5-turbo": 4096,
+    "gpt-4": 8192,
+    "gpt-4-turbo": 4096,
+    "gpt-4o": 16384,
+    "gpt-4o-mini": 16384,
+    "gpt-4.1": 32768,
+    "gpt-4.1-mini": 32768,
+    "gpt-4.1-nano": 32768,
+    "gpt-5": 128000,
+    "o3": 100000,
+    "o4-mini": 100000,
+}
+DEFAULT_OUTPUT_TOKENS = 4096
+
+# Share of the output limit one chunk may fill. Leaves head-room for target languages that
+# need more tokens than the source, and keeps chunks small enough to parallelise.
+CHUNK_OUTPUT_SHARE = 0.5
+
+# Chunks are never packed larger than this, even for models with huge output limits,
+# because very long completions get slow and the model starts to drift.
+MAX_CHUNK_TOKENS = 8000
+
+_CJK = re.compile(r"[\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af\uf900-\ufaff\uff00-\uffef]")
+_ASCII_PUNCT = re.compile(r"[!-/:-@\[-`{-~]")
+
+
+def output_token_limit(model: str) -> int:
+    best = ""
+    for prefix in MODEL_OUTPUT_TOKENS:
+        # "gpt-4" covers "gpt-4-0613" but not "gpt-4.5-preview"
+        boundary = model[len(prefix):len(prefix) + 1] in ("", "-")
+        if model.startswith(prefix) and boundary and len(prefix) > len(best):
+            best = prefix
+    return MODEL_OUTPUT_TOKENS[best] if best else DEFAULT_OUTPUT_TOKENS
+
+
+def chunk_token_budget(model: str, override: Optional[int] = None) -> int:
+    if override is not None:
+        return override
+    return min(int(output_token_limit(model) * CHUNK_OUTPUT_SHARE), MAX_CHUNK_TOKENS)
+
+
+def estimate_tokens(text: str) -> int:
+    # Fast heuristic for BPE tokenizers when tiktoken is not installed. Errs on the high side:
+    # ~4 chars per token for ASCII prose, punctuation (code, tables) nearly one token each,
+    # about one token per CJK character and two chars per token for other scripts.
+    ascii_count = len(text.encode("ascii", "ignore"))
+    punct = len(_ASCII_PUNCT.findall(text))
+    cjk = len(_CJK.findall(text))
+    other = len(text) - ascii_count - cjk
+    return math.ceil((ascii_count - punct) / 4 + punct / 1.5 + cjk + other / 2)
+
+
+def token_counter_for_model(model: str) -> TokenCounter:
+    if not TIKTOKEN_AVAILABLE:
+        return estimate_tokens
+    try:
+        try:
+            encoding = tiktoken.encoding_for_model(model)
+        except KeyError:
+            encoding = tiktoken.get_encoding("o200k_base")
+    except Exception:  # noqa: BLE001 - encodings are downloaded on first use and may be unavailable offline
+        return estimate_tokens
+
+    def count(text: str) -> int:
+        return len(encoding.encode(text, disallowed_special=()))
+
+    return count
@@ -0,0 +1,135 @@
+import hashlib
+import json
+import os
+import threading
+from typing import Dict, List
+
+
+CHECKPOINT_VERSION = 1
+PART_SUFFIX = ".part"
+CHECKPOINT_SUFFIX = ".checkpoint.json"
+
+
+def chunks_fingerprint(chunks: List[str], target_lang: str, model: str, system_prompt: str) -> str:
+    # Identifies one exact plan: a resumed run must produce the same chunks with the same settings.
+    digest = hashlib.sha256()
+    for part in [system_prompt, model, target_lang, *chunks]:
+        data = part.encode("utf-8")
+        digest.update(len(data).to_bytes(8, "big"))
+        digest.update(data)
+    return digest.hexdigest()
+
+
+class ChunkWriter:
+    """Streams translated chunks of one document to disk in their original order.
+
+    Chunks may arrive in any order from the worker pool; they are buffered until every
+    earlier chunk has been written. Output goes to ``<output>.part``, and after each write
+    ``<output>.checkpoint.json`` records how many chunks (and bytes) are safely on disk.
+    The part file is only open while a write is in progress, so a run over many documents
+    and languages does not hold a file descriptor per document. Once all ``total`` chunks
+    are written, the part file is renamed over the output atomically and the checkpoint is
+    dropped (``commit``). With ``resume=True`` a matching checkpoint lets the run continue
+    after the last completed chunk instead of starting from zero.
+    """
+
+    def __init__(self, output_path: str, fingerprint: str, total: int, resume: bool = False):
+        self.output_path = output_path
+        self.part_path = output_path + PART_SUFFIX
+        self.checkpoint_path = output_path + CHECKPOINT_SUFFIX
+        self.fingerprint = fingerprint
+        self.total = total
+        self.completed = 0
+        self.committed = False
+        self._bytes = 0
+        self._pending: Dict[int, str] = {}
+        self._lock = threading.Lock()
+
+        output_dir = os.path.dirname(output_path)
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+
+        if resume:
+            self._load_checkpoint()
+        if not self.completed:
+            self._bytes = 0
+            for path in (self.part_path, self.checkpoint_path):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+    @property
+    def done(self) -> bool:
+        return self.completed >= self.total
+
+    def _load_checkpoint(self) -> None:
+        try:
+            with open(self.checkpoint_path, "r", encoding="utf-8") as f:
+                checkpoint = json.load(f)
+            part_size = os.path.getsize(self.part_path)
+        except (OSError, ValueError):
+            return
+        if (
+            checkpoint.get("version") == CHECKPOINT_VERSION
+            and checkpoint.get("fingerprint") == self.fingerprint
+            and 0 <= checkpoint.get("bytes", -1) <= part_size
+        ):
+            self.completed = checkpoint.get("chunks", 0)
+            self._bytes = checkpoint["bytes"]
+
+    def _save_checkpoint(self) -> None:
+        checkpoint = {
+            "version": CHECKPOINT_VERSION,
+            "fingerprint": self.fingerprint,
+            "chunks": self.completed,
+            "bytes": self._bytes,
+        }
+        tmp_path = self.checkpoint_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(checkpoint, f)
+        os.replace(tmp_path, self.checkpoint_path)
+
+    def _write(self, data: bytes) -> None:
+        # Anything past the checkpoint is left over from an interrupted write and is overwritten.
+        mode = "r+b" if os.path.exists(self.part_path) else "wb"
+        with open(self.part_path, mode) as f:
+            f.seek(self._bytes)
+            f.truncate()
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+
+    def add(self, index: int, text: str) -> None:
+        with self._lock:
+            self._pending[index] = text
+            if self.completed not in self._pending:
+                return
+            ready: List[bytes] = []
+            while self.completed + len(ready) in self._pending:
+                ready.append(self._pending.pop(self.completed + len(ready)).encode("utf-8"))
+            data = b"".join(ready)
+            self._write(data)
+            self._bytes += len(data)
+            self.completed += len(ready)
+            if self.done:
+                self._commit()
+            else:
+                self._save_checkpoint()
+
+    def commit(self) -> None:
+        # Also called for documents with nothing left to translate; the part file may not exist yet.
+        with self._lock:
+            self._commit()
+
+    def _commit(self) -> None:
+        if self.committed:
+            return
+        if not os.path.exists(self.part_path):
+            open(self.part_path, "wb").close()
+        os.replace(self.part_path, self.output_path)
+        try:
+            os.remove(self.checkpoint_path)
+        except OSError:
+            pass
+        self.committed = True
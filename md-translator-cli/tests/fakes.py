@@ -0,0 +1,57 @@
+"""Fake chat client for tests that translate without a server."""
+
+import random
+import re
+import threading
+import time
+from types import SimpleNamespace
+
+from translate_md.cli import BLOCK_MARKER
+
+
+def shout(chunk, target_lang):
+    """Default "translation": upper-case the text, keeping block markers intact."""
+    return BLOCK_MARKER.join(piece.upper() for piece in chunk.split(BLOCK_MARKER))
+
+
+class StatusError(Exception):
+    """Error shaped like the openai SDK's status errors."""
+
+    def __init__(self, status_code):
+        super().__init__(f"status {status_code}")
+        self.status_code = status_code
+        self.response = SimpleNamespace(headers={})
+
+
+class FakeClient:
+    """Stands in for ``OpenAI``; answers ``chat.completions.with_raw_response.create``.
+
+    ``translate(chunk, target_lang)`` produces the answer and may raise. Every request is
+    recorded as ``(target_lang, chunk)``; ``max_delay`` adds a random delay per request.
+    """
+
+    def __init__(self, translate=shout, max_delay=0.0, seed=0):
+        self.translate = translate
+        self.max_delay = max_delay
+        self.requests = []
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        completions = SimpleNamespace(with_raw_response=SimpleNamespace(create=self._create))
+        self.chat = SimpleNamespace(completions=completions)
+
+    def chunks(self, target_lang=None):
+        """Chunks sent so far, optionally only those for one language."""
+        return [chunk for lang, chunk in self.requests if target_lang in (None, lang)]
+
+    def _create(self, model, messages, temperature):
+        prompt = messages[-1]["content"]
+        target_lang = re.search(r"Zielsprache: (.*)\n", prompt).group(1)
+        chunk = prompt.split("<markdown>\n", 1)[1].rsplit("\n</markdown>", 1)[0]
+        with self._lock:
+            self.requests.append((target_lang, chunk))
+            delay = self._random.uniform(0, self.max_delay)
+        if delay:
+            time.sleep(delay)
+        content = self.translate(chunk, target_lang)
+        response = SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+        return SimpleNamespace(headers={}, parse=lambda: response)
@@ -0,0 +1,159 @@
+"""Unit tests for the Markdown block tokenizer and chunk packing."""
+
+import random
+import unittest
+
+from translate_md.blocks import (
+    BLANK,
+    BLOCKQUOTE,
+    CODE,
+    FRONT_MATTER,
+    HEADING,
+    HTML,
+    LIST,
+    PARAGRAPH,
+    TABLE,
+    THEMATIC_BREAK,
+    iter_blocks,
+    pack_blocks,
+)
+
+
+def blocks_of(text):
+    return [(block.kind, text[block.start:block.end]) for block in iter_blocks(text)]
+
+
+class TestIterBlocks(unittest.TestCase):
+    """Test cases for iter_blocks."""
+
+    def test_fences(self):
+        """Test that longer, nested, tilde and unclosed fences stay one block."""
+        self.assertEqual(blocks_of("````md\n```python\nx = 1\n```\n````\nAfter\n"), [
+            (CODE, "````md\n```python\nx = 1\n```\n````\n"),
+            (PARAGRAPH, "After\n"),
+        ])
+        self.assertEqual(blocks_of("~~~\n```\n# not a heading\n~~~\nText\n"), [
+            (CODE, "~~~\n```\n# not a heading\n~~~\n"),
+            (PARAGRAPH, "Text\n"),
+        ])
+        self.assertEqual(blocks_of("```\ncode\n\nmore\n"), [(CODE, "```\ncode\n\nmore\n")])
+
+    def test_table(self):
+        """Test that a table ends at the first row without a pipe."""
+        self.assertEqual(blocks_of("| a | b |\n|---|:-:|\n| 1 | 2 |\nNext\n"), [
+            (TABLE, "| a | b |\n|---|:-:|\n| 1 | 2 |\n"),
+            (PARAGRAPH, "Next\n"),
+        ])
+
+    def test_lists(self):
+        """Test loose lists, lazy continuation lines and fences inside items."""
+        self.assertEqual(blocks_of("- one\n\n- two\n\n  continued\n\nPara\n"), [
+            (LIST, "- one\n\n- two\n\n  continued\n\n"),
+            (PARAGRAPH, "Para\n"),
+        ])
+        self.assertEqual(blocks_of("- item one\nlazy continuation\n- item two\n\n# H\n"), [
+            (LIST, "- item one\nlazy continuation\n- item two\n\n"),
+            (HEADING, "# H\n"),
+        ])
+        text = "1. step\n\n   ```\n   # not a heading\n   ```\n2. next\n"
+        self.assertEqual(blocks_of(text), [(LIST, text)])
+
+    def test_headings(self):
+        """Test ATX and setext headings."""
+        self.assertEqual(blocks_of("# Title\nText\n\nSub\n===\n\nOther\n---\nmore\n"), [
+            (HEADING, "# Title\n"),
+            (PARAGRAPH, "Text\n\n"),
+            (HEADING, "Sub\n===\n\n"),
+            (HEADING, "Other\n---\n"),
+            (PARAGRAPH, "more\n"),
+        ])
+
+    def test_html_blockquote_and_breaks(self):
+        """Test HTML blocks, comments, blockquotes and thematic breaks."""
+        self.assertEqual(blocks_of("<div>\n<p>hi</p>\n</div>\n\nText\n"), [
+            (HTML, "<div>\n<p>hi</p>\n</div>\n\n"),
+            (PARAGRAPH, "Text\n"),
+        ])
+        self.assertEqual(blocks_of("<!-- a\n\nb -->\nText\n"), [
+            (HTML, "<!-- a\n\nb -->\n"),
+            (PARAGRAPH, "Text\n"),
+        ])
+        self.assertEqual(blocks_of("> a\n> b\n\n***\n"), [
+            (BLOCKQUOTE, "> a\n> b\n\n"),
+            (THEMATIC_BREAK, "***\n"),
+        ])
+
+    def test_front_matter(self):
+        """Test YAML and TOML front matter and leading blank lines."""
+        self.assertEqual(blocks_of("---\ntitle: X\ntags:\n  - a\n---\n\nBody\n"), [
+            (FRONT_MATTER, "---\ntitle: X\ntags:\n  - a\n---\n\n"),
+            (PARAGRAPH, "Body\n"),
+        ])
+        self.assertEqual(blocks_of('+++\ntitle = "x"\n[params]\n+++\nBody\n'), [
+            (FRONT_MATTER, '+++\ntitle = "x"\n[params]\n+++\n'),
+            (PARAGRAPH, "Body\n"),
+        ])
+        self.assertEqual(blocks_of("\n\nText\n"), [(BLANK, "\n\n"), (PARAGRAPH, "Text\n")])
+
+    def test_thematic_breaks_are_not_front_matter(self):
+        """Test that prose between two "---" lines is not taken for front matter."""
+        self.assertEqual(blocks_of("---\n\nJust a break\n\n---\n\nEnd\n"), [
+            (THEMATIC_BREAK, "---\n\n"),
+            (PARAGRAPH, "Just a break\n\n"),
+            (THEMATIC_BREAK, "---\n\n"),
+            (PARAGRAPH, "End\n"),
+        ])
+        self.assertEqual(blocks_of("---\nTitle\n---\n"), [
+            (THEMATIC_BREAK, "---\n"),
+            (HEADING, "Title\n---\n"),
+        ])
+
+    def test_blocks_tile_the_text(self):
+        """Test that the blocks are contiguous and cover every character."""
+        pieces = [
+            "# H\n", "Para line\nsecond line\n", "\n", "- a\n- b\n", "```\nx\n```\n", "| a |\n|---|\n",
+            "> q\n", "<div>\n</div>\n", "***\n", "Setext\n---\n", "    code\n", "\r\n", "no newline",
+        ]
+        rng = random.Random(7)
+        for _ in range(200):
+            text = "".join(rng.choice(pieces) for _ in range(rng.randint(0, 12)))
+            with self.subTest(text=text):
+                blocks = list(iter_blocks(text))
+                self.assertEqual("".join(text[block.start:block.end] for block in blocks), text)
+                self.assertTrue(all(a.end == b.start for a, b in zip(blocks, blocks[1:])))
+
+
+class TestPackBlocks(unittest.TestCase):
+    """Test cases for pack_blocks."""
+
+    def test_chunks_respect_budget_and_keep_headings_with_their_text(self):
+        """Test the size limit, oversized blocks and headings at chunk ends."""
+        rng = random.Random(11)
+        pieces = ["# Heading\n\n", "Short paragraph.\n\n", "A " * 40 + "\n\n", "- item\n- item\n\n"]
+        for max_size in (30, 60, 120):
+            for _ in range(50):
+                text = "".join(rng.choice(pieces) for _ in range(rng.randint(1, 20)))
+                blocks = list(iter_blocks(text))
+                chunks = pack_blocks(text, blocks, max_size)
+                with self.subTest(max_size=max_size, text=text):
+                    self.assertEqual("".join(chunks), text)
+                    for chunk in chunks[:-1]:
+                        last = list(iter_blocks(chunk))[-1]
+                        self.assertNotEqual(last.kind, HEADING)
+                    for chunk in chunks:
+                        if len(chunk) > max_size:
+                            # Only a single block (with the headings carried along) may exceed the budget
+                            inner = [block for block in iter_blocks(chunk) if block.kind != HEADING]
+                            self.assertLessEqual(len(inner), 1)
+
+    def test_measure(self):
+        """Test that sizes come from the measure function."""
+        text = "one\n\ntwo\n\nthree\n"
+        blocks = list(iter_blocks(text))
+        self.assertEqual(pack_blocks(text, blocks, 2, measure=lambda block: 1), ["one\n\ntwo\n\n", "three\n"])
+        self.assertEqual(pack_blocks(text, blocks, 100), [text])
+        self.assertEqual(pack_blocks("", [], 10), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+"""Unit tests for the SQLite translation cache."""
+
+import itertools
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from translate_md.cache import TranslationCache, cache_key
+
+
+class TestCacheKey(unittest.TestCase):
+    """Test cases for cache_key."""
+
+    def test_every_part_is_in_the_key(self):
+        """Test that chunk, language, model and prompt all change the key."""
+        base = cache_key("Hello", "de", "gpt-4o-mini", "Prompt")
+        self.assertEqual(base, cache_key("Hello", "de", "gpt-4o-mini", "Prompt"))
+        for key in (
+            cache_key("Hello!", "de", "gpt-4o-mini", "Prompt"),
+            cache_key("Hello", "fr", "gpt-4o-mini", "Prompt"),
+            cache_key("Hello", "de", "gpt-4o", "Prompt"),
+            cache_key("Hello", "de", "gpt-4o-mini", "Other prompt"),
+        ):
+            self.assertNotEqual(key, base)
+
+    def test_parts_do_not_run_together(self):
+        """Test that moving text from one part to the next changes the key."""
+        self.assertNotEqual(cache_key("x", "de", "gpt-4o", "p"), cache_key("x", "ode", "gpt-4", "p"))
+        self.assertNotEqual(cache_key("ax", "de", "m", "p"), cache_key("x", "dea", "m", "p"))
+
+
+class TestTranslationCache(unittest.TestCase):
+    """Test cases for TranslationCache."""
+
+    def setUp(self):
+        """Open a cache in a temporary directory with a stepping clock."""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.directory = os.path.join(self.tmp.name, "cache")
+        # last_used must differ between calls for the eviction order to be defined
+        clock = patch("translate_md.cache.time.time", side_effect=itertools.count(1000))
+        clock.start()
+        self.addCleanup(clock.stop)
+        self.cache = TranslationCache(self.directory, max_bytes=100)
+
+    def tearDown(self):
+        """Close the cache and remove the directory."""
+        self.cache.close()
+        self.tmp.cleanup()
+
+    def reopen(self, max_bytes=100):
+        self.cache.close()
+        self.cache = TranslationCache(self.directory, max_bytes=max_bytes)
+
+    def test_hit_and_miss(self):
+        """Test get before and after put, and replacing an entry."""
+        self.assertIsNone(self.cache.get("key"))
+        self.cache.put("key", "Hallo")
+        self.assertEqual(self.cache.get("key"), "Hallo")
+        self.cache.put("key", "Servus")
+        self.assertEqual(self.cache.get("key"), "Servus")
+        self.assertIsNone(self.cache.get("other"))
+
+    def test_least_recently_used_entries_are_evicted_first(self):
+        """Test that reading an entry protects it from eviction."""
+        for key in "abc":
+            self.cache.put(key, key * 30)
+        self.cache.get("a")
+        self.cache.put("d", "d" * 30)
+
+        # 120 bytes is over the limit; the oldest entries go until 90% of it is left
+        self.assertIsNone(self.cache.get("b"))
+        for key in "acd":
+            self.assertEqual(self.cache.get(key), key * 30)
+
+    def test_replacing_an_entry_does_not_count_twice(self):
+        """Test that the size of a replaced entry is not added again."""
+        for _ in range(5):
+            self.cache.put("a", "a" * 40)
+        self.cache.put("b", "b" * 40)
+        self.assertEqual(self.cache.get("a"), "a" * 40)
+        self.assertEqual(self.cache.get("b"), "b" * 40)
+
+    def test_entries_and_size_survive_reopening(self):
+        """Test that a reopened cache keeps its entries and their total size."""
+        self.cache.put("a", "a" * 30)
+        self.cache.put("b", "b" * 30)
+        self.reopen()
+        self.assertEqual(self.cache.get("a"), "a" * 30)
+
+        # Over the limit only because the reopened cache knows about a and b
+        self.cache.put("c", "c" * 50)
+        self.assertIsNone(self.cache.get("b"))
+        self.assertEqual(self.cache.get("a"), "a" * 30)
+        self.assertEqual(self.cache.get("c"), "c" * 50)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+"""Unit tests for finding the files of a directory run."""
+
+import os
+import tempfile
+import unittest
+
+from translate_md.cli import collect_markdown_files
+
+
+class TestCollectMarkdownFiles(unittest.TestCase):
+    """Test cases for collect_markdown_files."""
+
+    def setUp(self):
+        """Create a small docs tree."""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = self.tmp.name
+        for rel_path in (
+            "README.md",
+            "guide/intro.md",
+            "guide/setup.txt",
+            "guide/deep/faq.md",
+            "drafts/idea.md",
+            ".git/description.md",
+            "node_modules/pkg/README.md",
+            ".venv/lib/notes.md",
+            "out/README.md",
+        ):
+            path = os.path.join(self.root, *rel_path.split("/"))
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "w", encoding="utf-8") as f:
+                f.write("# Doc\n")
+
+    def tearDown(self):
+        """Remove the docs tree."""
+        self.tmp.cleanup()
+
+    def test_default_include(self):
+        """Test that *.md matches at any depth, in walk order, with "/" separators."""
+        self.assertEqual(
+            collect_markdown_files(self.root, ["*.md"], []),
+            ["README.md", "drafts/idea.md", "guide/intro.md", "guide/deep/faq.md", "out/README.md"],
+        )
+
+    def test_include_and_exclude(self):
+        """Test that globs match the relative path or the bare file name."""
+        self.assertEqual(
+            collect_markdown_files(self.root, ["*.md", "guide/*.txt"], ["drafts/*", "faq.md"]),
+            ["README.md", "guide/intro.md", "guide/setup.txt", "out/README.md"],
+        )
+        self.assertEqual(collect_markdown_files(self.root, ["intro.md"], []), ["guide/intro.md"])
+
+    def test_skipped_directories(self):
+        """Test that tool directories and the output tree are never searched."""
+        found = collect_markdown_files(self.root, ["*"], [], skip_dirs=[os.path.join(self.root, "out")])
+        self.assertFalse([path for path in found if path.startswith((".git/", "node_modules/", ".venv/", "out/"))])
+        self.assertIn("guide/deep/faq.md", found)
+
+    def test_mirrored_output_paths(self):
+        """Test that relative paths rebuild the same layout below another directory."""
+        output_dir = os.path.join(self.root, "out")
+        rel_paths = collect_markdown_files(self.root, ["*.md"], ["drafts/*"], skip_dirs=[output_dir])
+        outputs = [os.path.join(output_dir, *rel_path.split("/")) for rel_path in rel_paths]
+        self.assertEqual(
+            [os.path.relpath(path, output_dir) for path in outputs],
+            ["README.md", os.path.join("guide", "intro.md"), os.path.join("guide", "deep", "faq.md")],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
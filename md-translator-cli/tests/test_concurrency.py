@@ -0,0 +1,59 @@
+"""Unit tests for translating chunks with several workers."""
+
+import unittest
+
+from tests.fakes import FakeClient, StatusError, shout
+from translate_md.cli import translate_chunks, translate_documents
+
+
+MODEL = "gpt-4o-mini"
+
+
+class TestConcurrentTranslation(unittest.TestCase):
+    """Test cases for translate_chunks and translate_documents with a worker pool."""
+
+    def test_results_keep_input_order(self):
+        """Test that answers arriving in random order end up in input order."""
+        chunks = [f"Chunk number {index}." for index in range(40)]
+        client = FakeClient(max_delay=0.02, seed=3)
+
+        outputs = translate_chunks(client, chunks, "de", MODEL, workers=8)
+
+        self.assertEqual(outputs, [chunk.upper() for chunk in chunks])
+        self.assertEqual(sorted(client.chunks()), sorted(chunks))
+
+    def test_documents_are_reassembled_in_order(self):
+        """Test that chunks of several documents are put back into the right document."""
+        documents = [
+            "".join(f"Paragraph {doc} {index} with a few words.\n\n" for index in range(12))
+            for doc in range(3)
+        ]
+        client = FakeClient(max_delay=0.01, seed=5)
+
+        outputs = translate_documents(client, documents, "de", MODEL, workers=6, max_chunk_tokens=20)
+
+        self.assertGreater(len(client.requests), len(documents))
+        self.assertEqual(outputs, [document.upper() for document in documents])
+
+    def test_first_fatal_error_stops_queued_work(self):
+        """Test that a fatal error is re-raised and chunks still queued are never sent."""
+        chunks = [f"Chunk number {index}." for index in range(60)]
+
+        def translate(chunk, target_lang):
+            if chunk == "Chunk number 4.":
+                raise StatusError(401)
+            return shout(chunk, target_lang)
+
+        client = FakeClient(translate, max_delay=0.02, seed=7)
+
+        with self.assertRaises(StatusError) as context:
+            translate_chunks(client, chunks, "de", MODEL, workers=3)
+
+        self.assertEqual(context.exception.status_code, 401)
+        # Not retried, and the queue was dropped instead of drained
+        self.assertEqual(client.chunks().count("Chunk number 4."), 1)
+        self.assertLess(len(client.requests), 20)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,180 @@
+"""Unit tests for incremental translation and its manifest."""
+
+import argparse
+import json
+import os
+import tempfile
+import unittest
+
+from tests.fakes import FakeClient, shout
+from translate_md.cli import (
+    BLOCK_MARKER,
+    SYSTEM_PROMPT,
+    translate_and_write,
+    translate_documents_incremental,
+)
+from translate_md.manifest import block_hash, load_previous_blocks, manifest_path, write_manifest
+
+
+DOCUMENT = "# Title\n\nFirst paragraph.\n\nSecond paragraph.\n\nThird paragraph.\n"
+MODEL = "gpt-4o-mini"
+
+
+def incremental_args(**overrides):
+    values = dict(
+        target_langs=["de"], incremental=True, resume=False, stats=False, progress=False,
+        workers=1, rpm=None, tpm=None, max_chunk_tokens=None,
+    )
+    values.update(overrides)
+    return argparse.Namespace(**values)
+
+
+class TestIncrementalRuns(unittest.TestCase):
+    """Test cases for translate_and_write with --incremental."""
+
+    def setUp(self):
+        """Create a temporary output directory."""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.output_path = os.path.join(self.tmp.name, "out.md")
+
+    def tearDown(self):
+        """Remove the temporary output directory."""
+        self.tmp.cleanup()
+
+    def run_incremental(self, document, translate=shout, model=MODEL):
+        client = FakeClient(translate)
+        translate_and_write(client, [document], [[self.output_path]], incremental_args(), model, None)
+        with open(self.output_path, "r", encoding="utf-8", newline="") as f:
+            return client, f.read()
+
+    def test_rerun_sends_only_changed_blocks(self):
+        """Test that a re-run translates the edited block and reuses the others byte for byte."""
+        client, first = self.run_incremental(DOCUMENT)
+        self.assertEqual(first, DOCUMENT.upper())
+        self.assertEqual(len(client.requests), 1)
+
+        edited = DOCUMENT.replace("Second paragraph.", "Second paragraph, edited.")
+        client, second = self.run_incremental(edited, translate=lambda chunk, lang: "<" + chunk.strip() + ">")
+
+        self.assertEqual(client.chunks(), ["Second paragraph, edited.\n\n"])
+        self.assertEqual(
+            second,
+            "# TITLE\n\nFIRST PARAGRAPH.\n\n<Second paragraph, edited.>\n\nTHIRD PARAGRAPH.\n",
+        )
+
+    def test_unchanged_document_sends_nothing(self):
+        """Test that a re-run of the same document makes no request."""
+        self.run_incremental(DOCUMENT)
+        client, output = self.run_incremental(DOCUMENT)
+        self.assertEqual(client.requests, [])
+        self.assertEqual(output, DOCUMENT.upper())
+
+    def test_corrupt_manifest_forces_full_translation(self):
+        """Test that an unreadable manifest means every block is translated again."""
+        self.run_incremental(DOCUMENT)
+        with open(manifest_path(self.output_path), "w", encoding="utf-8") as f:
+            f.write("{not json")
+
+        client, output = self.run_incremental(DOCUMENT)
+
+        self.assertEqual(len(client.requests), 1)
+        for block in ("# Title", "First paragraph.", "Second paragraph.", "Third paragraph."):
+            self.assertIn(block, client.chunks()[0])
+        self.assertEqual(output, DOCUMENT.upper())
+
+    def test_other_model_forces_full_translation(self):
+        """Test that translations made with another model are not reused."""
+        self.run_incremental(DOCUMENT)
+        client, _ = self.run_incremental(DOCUMENT, model="gpt-4o")
+        self.assertIn("Third paragraph.", client.chunks()[0])
+
+
+class TestLoadPreviousBlocks(unittest.TestCase):
+    """Test cases for the manifest sidecar."""
+
+    def setUp(self):
+        """Write an output file and its manifest."""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.output_path = os.path.join(self.tmp.name, "out.md")
+        self.blocks = [("# Titel\n\n", "# Title\n\n"), ("Text.\n", "Text.\n")]
+        with open(self.output_path, "w", encoding="utf-8", newline="") as f:
+            f.write("".join(translated for translated, _ in self.blocks))
+        entries = [(block_hash(source), len(translated)) for translated, source in self.blocks]
+        write_manifest(self.output_path, "de", MODEL, SYSTEM_PROMPT, entries)
+
+    def tearDown(self):
+        """Remove the temporary directory."""
+        self.tmp.cleanup()
+
+    def test_round_trip(self):
+        """Test that translations are sliced back out of the output file."""
+        self.assertEqual(
+            load_previous_blocks(self.output_path, "de", MODEL, SYSTEM_PROMPT),
+            {block_hash(source): translated for translated, source in self.blocks},
+        )
+
+    def test_mismatches_yield_nothing(self):
+        """Test language, model, prompt and version mismatches."""
+        self.assertEqual(load_previous_blocks(self.output_path, "fr", MODEL, SYSTEM_PROMPT), {})
+        self.assertEqual(load_previous_blocks(self.output_path, "de", "gpt-4o", SYSTEM_PROMPT), {})
+        self.assertEqual(load_previous_blocks(self.output_path, "de", MODEL, "Other prompt"), {})
+        with open(manifest_path(self.output_path), "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        manifest["version"] += 1
+        with open(manifest_path(self.output_path), "w", encoding="utf-8") as f:
+            json.dump(manifest, f)
+        self.assertEqual(load_previous_blocks(self.output_path, "de", MODEL, SYSTEM_PROMPT), {})
+
+    def test_edited_output_yields_nothing(self):
+        """Test that a hand-edited output no longer lines up with the manifest."""
+        with open(self.output_path, "a", encoding="utf-8") as f:
+            f.write("Added by hand.\n")
+        self.assertEqual(load_previous_blocks(self.output_path, "de", MODEL, SYSTEM_PROMPT), {})
+
+    def test_missing_files_yield_nothing(self):
+        """Test that a missing output or manifest yields nothing."""
+        os.remove(manifest_path(self.output_path))
+        self.assertEqual(load_previous_blocks(self.output_path, "de", MODEL, SYSTEM_PROMPT), {})
+        self.assertEqual(load_previous_blocks(self.output_path + ".gone", "de", MODEL, SYSTEM_PROMPT), {})
+
+
+class TestBlockMarkerFallback(unittest.TestCase):
+    """Test cases for answers that do not split back into their blocks.
+
+    Markers are normally masked like any HTML comment; a text that already contains
+    placeholder brackets is sent unmasked, so the model sees the markers themselves.
+    """
+
+    document = "# Title\n\nKeep ⟦this⟧.\n\nLast paragraph.\n"
+
+    def translate_with(self, mangle):
+        def translate(chunk, target_lang):
+            answer = shout(chunk, target_lang)
+            return mangle(answer) if BLOCK_MARKER in chunk else answer
+
+        client = FakeClient(translate)
+        results = translate_documents_incremental(client, [self.document], [[{}]], ["de"], MODEL)
+        return client, "".join(text for _, text in results[0][0])
+
+    def test_markers_split_the_answer(self):
+        """Test that an intact answer is split per block from a single request."""
+        client, output = self.translate_with(lambda answer: answer)
+        self.assertEqual(output, self.document.upper())
+        self.assertEqual(len(client.requests), 1)
+        self.assertEqual(client.chunks()[0].count(BLOCK_MARKER), 2)
+
+    def test_dropped_marker_retries_block_by_block(self):
+        """Test that a lost marker makes every block of the run be retried alone."""
+        client, output = self.translate_with(lambda answer: answer.replace(BLOCK_MARKER, "", 1))
+        self.assertEqual(output, self.document.upper())
+        self.assertEqual(client.chunks()[1:], ["# Title\n\n", "Keep ⟦this⟧.\n\n", "Last paragraph.\n"])
+
+    def test_duplicated_marker_retries_block_by_block(self):
+        """Test that an extra marker makes every block of the run be retried alone."""
+        client, output = self.translate_with(lambda answer: answer + "\n" + BLOCK_MARKER + "\n\nEXTRA")
+        self.assertEqual(output, self.document.upper())
+        self.assertEqual(len(client.requests), 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
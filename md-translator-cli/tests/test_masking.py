@@ -0,0 +1,62 @@
+"""Unit tests for masking untranslatable spans."""
+
+import unittest
+
+from translate_md.masking import PlaceholderError, mask_markdown
+
+
+class TestMaskMarkdown(unittest.TestCase):
+    """Test cases for mask_markdown and MaskedChunk."""
+
+    def test_round_trip_restores_every_span(self):
+        """Test that code, URLs, link targets and comments come back unchanged."""
+        chunk = (
+            "Run `pip install x` and see [the docs](docs/setup.md).\n"
+            "<!-- keep me -->\n"
+            "Visit https://example.com/a?b=1.\n"
+            "\n"
+            "```python\n"
+            "print('hi')\n"
+            "```\n"
+            "\n"
+            "Done.\n"
+        )
+        masked = mask_markdown(chunk)
+
+        self.assertEqual(len(masked.spans), 5)
+        for span in ("`pip install x`", "docs/setup.md", "<!-- keep me -->", "https://example.com/a?b=1"):
+            with self.subTest(span=span):
+                self.assertIn(span, masked.spans)
+                self.assertNotIn(span, masked.text)
+        self.assertNotIn("print('hi')", masked.text)
+        self.assertTrue(masked.text.endswith("\n\nDone.\n"))
+        # An answer that keeps every placeholder restores the original
+        self.assertEqual(masked.restore(masked.text), chunk)
+
+    def test_missing_duplicated_or_invented_placeholders_are_rejected(self):
+        """Test that answers with wrong placeholders fail the check."""
+        masked = mask_markdown("Use `a` and `b`.")
+        self.assertEqual(masked.text, "Use ⟦0⟧ and ⟦1⟧.")
+
+        self.assertEqual(masked.check("Nutze ⟦1⟧ und ⟦0⟧."), "Nutze ⟦1⟧ und ⟦0⟧.")
+        for answer in ("Nutze ⟦0⟧.", "Nutze ⟦0⟧, ⟦0⟧ und ⟦1⟧.", "Nutze ⟦0⟧, ⟦1⟧ und ⟦2⟧."):
+            with self.subTest(answer=answer):
+                with self.assertRaises(PlaceholderError):
+                    masked.restore(answer)
+
+    def test_text_with_placeholder_brackets_is_not_masked(self):
+        """Test that chunks already containing the brackets are sent as they are."""
+        chunk = "Literal ⟦0⟧ and `code`."
+        masked = mask_markdown(chunk)
+        self.assertEqual((masked.text, masked.spans), (chunk, []))
+        self.assertEqual(masked.restore("Wörtlich ⟦0⟧"), "Wörtlich ⟦0⟧")
+
+    def test_chunks_without_prose_are_not_translatable(self):
+        """Test that code-only chunks need no request."""
+        self.assertFalse(mask_markdown("```\ncode\n```\n").translatable)
+        self.assertFalse(mask_markdown("`x` - https://example.com\n").translatable)
+        self.assertTrue(mask_markdown("Some `x` text\n").translatable)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,139 @@
+"""Unit tests for translating into several target languages in one run."""
+
+import argparse
+import io
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from tests.fakes import FakeClient
+from translate_md.cache import TranslationCache
+from translate_md.cli import output_path_for_lang, parse_args, run_directory, run_file
+
+
+MODEL = "gpt-4o-mini"
+DOCUMENT = "# Guide\n\nFirst step.\n\n```sh\nmake\n```\n\nSecond step.\n"
+
+
+def tag_language(chunk, target_lang):
+    """Fake translation that marks every line with its language."""
+    return "\n".join(f"[{target_lang}] {line}" if line.strip() else line for line in chunk.split("\n"))
+
+
+def run_args(**overrides):
+    values = dict(
+        target_langs=["de", "fr"], incremental=False, resume=False, stats=False, progress=False,
+        workers=2, rpm=None, tpm=None, max_chunk_tokens=5, include=["*.md"], exclude=[],
+    )
+    values.update(overrides)
+    return argparse.Namespace(**values)
+
+
+class TestOutputPaths(unittest.TestCase):
+    """Test cases for output_path_for_lang and the language list."""
+
+    def test_lang_placeholder(self):
+        """Test that {lang} is replaced in file and directory paths."""
+        self.assertEqual(output_path_for_lang("docs/{lang}/guide.md", "fr", ["de", "fr"]), "docs/fr/guide.md")
+        self.assertEqual(output_path_for_lang("out-{lang}", "de", ["de", "fr"], is_dir=True), "out-de")
+        self.assertEqual(output_path_for_lang("guide.{lang}.md", "de", ["de"]), "guide.de.md")
+
+    def test_paths_without_placeholder(self):
+        """Test that several languages without {lang} still get one output each."""
+        self.assertEqual(output_path_for_lang("README.md", "de", ["de"]), "README.md")
+        self.assertEqual(output_path_for_lang("README.md", "de", ["de", "fr"]), "README.de.md")
+        self.assertEqual(output_path_for_lang("out", "fr", ["de", "fr"], is_dir=True), os.path.join("out", "fr"))
+
+    def test_language_list(self):
+        """Test that -l is split, stripped and deduplicated."""
+        argv = ["translate-md", "-i", "a.md", "-o", "b.md", "-l", "de, fr,de"]
+        with patch("sys.argv", argv):
+            self.assertEqual(parse_args().target_langs, ["de", "fr"])
+
+    def test_invalid_language_lists(self):
+        """Test that empty lists and codes with path separators are rejected."""
+        for languages in (",", "de,../fr", "de,fr\\x"):
+            argv = ["translate-md", "-i", "a.md", "-o", "{lang}.md", "-l", languages]
+            with self.subTest(languages=languages), patch("sys.argv", argv), \
+                    patch("sys.stderr", io.StringIO()), self.assertRaises(SystemExit):
+                parse_args()
+
+
+class TestMultiLanguageRuns(unittest.TestCase):
+    """Test cases for run_file and run_directory with several languages."""
+
+    def setUp(self):
+        """Create a temporary working directory."""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = self.tmp.name
+        self.input_path = os.path.join(self.root, "guide.md")
+        with open(self.input_path, "w", encoding="utf-8", newline="") as f:
+            f.write(DOCUMENT)
+
+    def tearDown(self):
+        """Remove the temporary working directory."""
+        self.tmp.cleanup()
+
+    def read(self, *parts):
+        with open(os.path.join(self.root, *parts), "r", encoding="utf-8", newline="") as f:
+            return f.read()
+
+    def run_with(self, run, args, cache=None):
+        client = FakeClient(tag_language)
+        stderr = io.StringIO()
+        with patch("translate_md.cli.openai_client_from_env", return_value=client), \
+                patch("sys.stderr", stderr):
+            run(args, MODEL, cache)
+        return client, stderr.getvalue()
+
+    def test_one_isolated_output_per_language(self):
+        """Test that each language gets its own file with only its own translation."""
+        args = run_args(input=self.input_path, output=os.path.join(self.root, "{lang}", "guide.md"))
+        client, _ = self.run_with(run_file, args)
+
+        for lang, other in (("de", "fr"), ("fr", "de")):
+            output = self.read(lang, "guide.md")
+            self.assertIn(f"[{lang}] First step.", output)
+            self.assertIn(f"[{lang}] Second step.", output)
+            self.assertNotIn(f"[{other}]", output)
+            # Code is masked, never translated
+            self.assertIn("```sh\nmake\n```", output)
+        # Every chunk is sent once per language
+        self.assertEqual(sorted(client.chunks("de")), sorted(client.chunks("fr")))
+        self.assertEqual(len(client.requests), 2 * len(client.chunks("de")))
+
+    def test_directory_gets_one_tree_per_language(self):
+        """Test that --output-dir without {lang} gets one subdirectory per language."""
+        os.makedirs(os.path.join(self.root, "src", "sub"))
+        with open(os.path.join(self.root, "src", "sub", "page.md"), "w", encoding="utf-8") as f:
+            f.write("Hello.\n")
+        args = run_args(input_dir=os.path.join(self.root, "src"), output_dir=os.path.join(self.root, "out"))
+        self.run_with(run_directory, args)
+
+        self.assertEqual(self.read("out", "de", "sub", "page.md"), "[de] Hello.\n")
+        self.assertEqual(self.read("out", "fr", "sub", "page.md"), "[fr] Hello.\n")
+
+    def test_progress_counts_per_language(self):
+        """Test that progress is counted per language, including cache hits."""
+        args = run_args(input=self.input_path, output=os.path.join(self.root, "guide.md"), progress=True)
+        cache = TranslationCache(os.path.join(self.root, "cache"))
+        try:
+            # Three chunks per language; the one holding only code needs no request
+            client, report = self.run_with(run_file, args, cache)
+            self.assertEqual(len(client.chunks("de")), 2)
+            self.assertEqual(sorted(report.splitlines()), ["de 3/3", "fr 3/3"])
+
+            # French was cached by the first run; only Spanish is translated now
+            args.target_langs = ["fr", "es"]
+            client, report = self.run_with(run_file, args, cache)
+        finally:
+            cache.close()
+        self.assertEqual({lang for lang, _ in client.requests}, {"es"})
+        self.assertEqual(report.splitlines(), ["fr 3/3 (2 cached)", "es 3/3"])
+        self.assertIn("[fr] Second step.", self.read("guide.fr.md"))
+        self.assertIn("[es] Second step.", self.read("guide.es.md"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,269 @@
+"""Unit tests for the shared rate limiter and retry scheduling."""
+
+import email.utils
+import json
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+import openai
+
+from translate_md import ratelimit
+from translate_md.cli import translate_chunks_multi
+from translate_md.ratelimit import (
+    MAX_RETRY_AFTER,
+    MIN_SCALE,
+    RateLimiter,
+    parse_duration,
+    retry_after_seconds,
+    retry_delay,
+)
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class APIError(Exception):
+    """Error shaped like the openai SDK's status errors."""
+
+    def __init__(self, status_code=None, headers=None):
+        super().__init__(f"status {status_code}")
+        self.status_code = status_code
+        self.response = type("Response", (), {"headers": headers or {}})()
+
+
+class TestRetryScheduling(unittest.TestCase):
+    """Test cases for parse_duration, retry_after_seconds and retry_delay."""
+
+    def test_parse_duration(self):
+        """Test the duration formats of the x-ratelimit-reset-* headers."""
+        self.assertEqual(parse_duration("1s"), 1.0)
+        self.assertEqual(parse_duration("6m0s"), 360.0)
+        self.assertEqual(parse_duration("20ms"), 0.02)
+        self.assertEqual(parse_duration("1h2m3.5s"), 3723.5)
+        self.assertEqual(parse_duration(" 2.5 "), 2.5)
+        for value in ("", "soon", "1x", "1s later"):
+            with self.subTest(value=value):
+                self.assertIsNone(parse_duration(value))
+
+    def test_retry_after_seconds(self):
+        """Test that retry-after-ms wins over retry-after, and HTTP dates are understood."""
+        self.assertEqual(retry_after_seconds({"retry-after-ms": "250", "retry-after": "9"}), 0.25)
+        self.assertEqual(retry_after_seconds({"retry-after": "3"}), 3.0)
+        self.assertEqual(retry_after_seconds({"retry-after": "-3"}), 0.0)
+        self.assertIsNone(retry_after_seconds({}))
+        date = email.utils.formatdate(time.time() + 30, usegmt=True)
+        self.assertAlmostEqual(retry_after_seconds({"retry-after": date}), 30, delta=2)
+
+    def test_retry_delay(self):
+        """Test final errors, server hints and the jittered backoff."""
+        self.assertIsNone(retry_delay(APIError(400), 1))
+        self.assertIsNone(retry_delay(APIError(401), 1))
+        self.assertEqual(retry_delay(APIError(429, {"retry-after": "2"}), 1), 2.0)
+        self.assertEqual(retry_delay(APIError(503, {"retry-after": "3600"}), 1), MAX_RETRY_AFTER)
+        delays = [retry_delay(APIError(500), 3) for _ in range(50)]
+        self.assertTrue(all(0 <= delay <= 8 for delay in delays))
+        self.assertGreater(len(set(delays)), 1)
+        # Connection errors have no status and are retried
+        self.assertIsNotNone(retry_delay(ConnectionError(), 0))
+
+
+class TestRateLimiter(unittest.TestCase):
+    """Test cases for RateLimiter."""
+
+    def setUp(self):
+        """Replace the limiter's clock."""
+        self.clock = FakeClock()
+        patcher = patch.object(ratelimit.time, "monotonic", self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_token_bucket_refills_over_time(self):
+        """Test that a burst drains the bucket and time refills it."""
+        limiter = RateLimiter(rpm=60)  # 10-second burst: 10 requests
+        for _ in range(10):
+            self.assertTrue(limiter.acquire())
+        stop = threading.Event()
+        stop.set()
+        self.assertFalse(limiter.acquire(stop_event=stop))
+
+        self.clock.now += 1.0
+        self.assertTrue(limiter.acquire())
+
+    def test_large_request_waits_for_a_full_bucket_only(self):
+        """Test that a request above the token capacity is still let through."""
+        limiter = RateLimiter(tpm=600)  # capacity: 100 tokens
+        self.assertTrue(limiter.acquire(tokens=5000))
+
+    def test_aimd_scaling(self):
+        """Test that 429s halve the rate down to MIN_SCALE and successes recover it."""
+        limiter = RateLimiter(rpm=60)
+        limiter.on_rate_limited(0)
+        self.assertEqual(limiter.scale, 0.5)
+        for _ in range(10):
+            limiter.on_rate_limited(0)
+        self.assertEqual(limiter.scale, MIN_SCALE)
+        for _ in range(100):
+            limiter.on_success()
+        self.assertEqual(limiter.scale, 1.0)
+
+    def test_learns_limits_and_pauses_on_exhausted_window(self):
+        """Test the x-ratelimit-* headers."""
+        limiter = RateLimiter()
+        limiter.update_from_headers({
+            "x-ratelimit-limit-requests": "120",
+            "x-ratelimit-limit-tokens": "6000",
+            "x-ratelimit-remaining-requests": "0",
+            "x-ratelimit-reset-requests": "1.5s",
+        })
+        self.assertEqual((limiter._rpm, limiter._tpm), (120.0, 6000.0))
+        self.assertEqual(limiter._paused_until, self.clock.now + 1.5)
+
+    def test_fixed_limits_are_not_overridden(self):
+        """Test that --rpm/--tpm win over the server's headers."""
+        limiter = RateLimiter(rpm=30)
+        limiter.update_from_headers({"x-ratelimit-limit-requests": "5000"})
+        self.assertEqual(limiter._rpm, 30)
+
+
+class TestRateLimiterWakeup(unittest.TestCase):
+    """Test cases for RateLimiter waits on the real clock."""
+
+    def test_stop_event_wakes_up_waiting_callers(self):
+        """Test that a caller paused by a 429 returns once the stop event is set."""
+        limiter = RateLimiter()
+        limiter.on_rate_limited(60)
+        stop = threading.Event()
+        results = []
+        waiter = threading.Thread(target=lambda: results.append(limiter.acquire(stop_event=stop)))
+        waiter.start()
+        stop.set()
+        waiter.join(2)
+        self.assertFalse(waiter.is_alive())
+        self.assertEqual(results, [False])
+
+
+class FakeChatAPI(ThreadingHTTPServer):
+    """OpenAI-compatible chat completions endpoint with scripted rate limits."""
+
+    daemon_threads = True
+
+    def __init__(self, held=0, retry_after_ms=500):
+        super().__init__(("127.0.0.1", 0), FakeChatHandler)
+        self.base = f"http://127.0.0.1:{self.server_address[1]}/v1"
+        self.lock = threading.Lock()
+        self.retry_after_ms = retry_after_ms
+        # The first ``held`` requests wait for each other; the first of them gets a 429,
+        # the others are answered successfully a little later.
+        self.held = held
+        self.barrier = threading.Barrier(held) if held else None
+        self.limited_at = None
+        self.arrivals = []
+        self.fail_with = {}  # chunk text -> status
+
+    def handle_chat(self, chunk):
+        """Return (status, headers, content) for one request."""
+        with self.lock:
+            position = len(self.arrivals)
+            self.arrivals.append((time.monotonic(), chunk))
+        if position < self.held:
+            self.barrier.wait(5)
+            if position:
+                time.sleep(0.2)  # let the client see the 429 first
+                return 200, {}, chunk.upper()
+            self.limited_at = time.monotonic()
+            return 429, {
+                "retry-after-ms": str(self.retry_after_ms),
+                "x-ratelimit-remaining-requests": "0",
+                "x-ratelimit-reset-requests": f"{self.retry_after_ms}ms",
+            }, None
+        if chunk in self.fail_with:
+            return self.fail_with[chunk], {}, None
+        return 200, {}, chunk.upper()
+
+
+class FakeChatHandler(BaseHTTPRequestHandler):
+    """Translates by upper-casing the chunk."""
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+        prompt = body["messages"][-1]["content"]
+        chunk = prompt.split("<markdown>\n", 1)[1].rsplit("\n</markdown>", 1)[0]
+        status, headers, content = self.server.handle_chat(chunk)
+        if status == 200:
+            data = {
+                "id": "chatcmpl-1",
+                "object": "chat.completion",
+                "created": 0,
+                "model": body["model"],
+                "choices": [{
+                    "index": 0,
+                    "finish_reason": "stop",
+                    "message": {"role": "assistant", "content": content},
+                }],
+            }
+        else:
+            data = {"error": {"message": f"injected {status}", "type": "fault"}}
+        payload = json.dumps(data).encode("utf-8")
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+
+class TestRateLimitedTranslation(unittest.TestCase):
+    """Test cases for workers sharing a limiter against a fake server."""
+
+    def _serve(self, server):
+        thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+        thread.start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        return openai.OpenAI(api_key="test-key", base_url=server.base, max_retries=0)
+
+    def test_429_pauses_every_worker(self):
+        """Test that a 429 for one worker holds back the others until the retry hint has passed."""
+        server = FakeChatAPI(held=4, retry_after_ms=500)
+        client = self._serve(server)
+        chunks = [f"chunk {i}" for i in range(12)]
+
+        outputs = translate_chunks_multi(client, chunks, ["de"], "gpt-4o-mini", workers=4, limiter=RateLimiter())
+
+        self.assertEqual(outputs[0], [chunk.upper() for chunk in chunks])
+        later = [arrival for arrival, _ in server.arrivals[4:]]
+        self.assertEqual(len(later), 9)  # the rate-limited chunk again, and 8 more
+        self.assertGreaterEqual(min(later) - server.limited_at, 0.5)
+
+    def test_client_errors_fail_at_once(self):
+        """Test that a 400 is not retried and stops the run."""
+        server = FakeChatAPI()
+        server.fail_with["bad"] = 400
+        client = self._serve(server)
+
+        with self.assertRaises(openai.BadRequestError):
+            translate_chunks_multi(
+                client, ["good", "bad", "later"], ["de"], "gpt-4o-mini", workers=1, limiter=RateLimiter()
+            )
+
+        self.assertEqual([chunk for _, chunk in server.arrivals], ["good", "bad"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,97 @@
+"""Unit tests for token budgets and token counting."""
+
+import unittest
+from unittest.mock import Mock, patch
+
+from translate_md import tokens
+from translate_md.cli import plan_chunks
+from translate_md.tokens import (
+    DEFAULT_OUTPUT_TOKENS,
+    MAX_CHUNK_TOKENS,
+    chunk_token_budget,
+    estimate_tokens,
+    output_token_limit,
+    token_counter_for_model,
+)
+
+
+class TestModelBudgets(unittest.TestCase):
+    """Test cases for output_token_limit and chunk_token_budget."""
+
+    def test_longest_prefix_wins(self):
+        """Test that dated and extended names use their most specific entry."""
+        self.assertEqual(output_token_limit("gpt-4"), 8192)
+        self.assertEqual(output_token_limit("gpt-4-0613"), 8192)
+        self.assertEqual(output_token_limit("gpt-4-turbo-2024-04-09"), 4096)
+        self.assertEqual(output_token_limit("gpt-4o-2024-08-06"), 16384)
+        self.assertEqual(output_token_limit("gpt-4.1-mini-2025-04-14"), 32768)
+        self.assertEqual(output_token_limit("o3-mini"), 100000)
+
+    def test_prefix_must_end_at_a_name_boundary(self):
+        """Test that a longer model name does not borrow a shorter name's budget."""
+        self.assertEqual(output_token_limit("gpt-4.5-preview"), DEFAULT_OUTPUT_TOKENS)
+        self.assertEqual(output_token_limit("o30"), DEFAULT_OUTPUT_TOKENS)
+        self.assertEqual(output_token_limit("my-gpt-4o"), DEFAULT_OUTPUT_TOKENS)
+
+    def test_chunk_budget(self):
+        """Test the share of the output limit, the cap and the override."""
+        self.assertEqual(chunk_token_budget("gpt-3.5-turbo"), 2048)
+        self.assertEqual(chunk_token_budget("gpt-4"), 4096)
+        self.assertEqual(chunk_token_budget("unknown-model"), DEFAULT_OUTPUT_TOKENS // 2)
+        self.assertEqual(chunk_token_budget("gpt-4o-mini"), MAX_CHUNK_TOKENS)
+        self.assertEqual(chunk_token_budget("gpt-5"), MAX_CHUNK_TOKENS)
+        self.assertEqual(chunk_token_budget("gpt-4o-mini", 300), 300)
+
+    def test_chunks_fit_the_budget(self):
+        """Test that planned chunks stay within the budget unless one block is larger."""
+        paragraph = "Ein Absatz mit einigen Wörtern, der mehrmals vorkommt.\n\n"
+        document = paragraph * 40 + "x" * 2000 + "\n"
+        chunks, bounds = plan_chunks([document], "gpt-4o-mini", max_chunk_tokens=100)
+        self.assertEqual("".join(chunks), document)
+        self.assertEqual(bounds, [(0, len(chunks))])
+        self.assertTrue(all(estimate_tokens(chunk) <= 100 for chunk in chunks[:-1]))
+        self.assertGreater(estimate_tokens(chunks[-1]), 100)
+        self.assertEqual(chunks[-1], "x" * 2000 + "\n")
+
+
+class TestTokenCounting(unittest.TestCase):
+    """Test cases for estimate_tokens and token_counter_for_model."""
+
+    def test_estimate_tokens(self):
+        """Test the heuristic for prose, punctuation, CJK and other scripts."""
+        self.assertEqual(estimate_tokens(""), 0)
+        self.assertEqual(estimate_tokens("abcd" * 10), 10)
+        self.assertEqual(estimate_tokens("{}()[];"), 5)
+        self.assertEqual(estimate_tokens("日本語"), 3)
+        self.assertEqual(estimate_tokens("Привет"), 3)
+        # Errs on the high side compared to ~4 characters per token of English prose
+        text = "The quick brown fox jumps over the lazy dog. " * 10
+        self.assertGreaterEqual(estimate_tokens(text), len(text) / 4)
+
+    def test_fallback_without_tiktoken(self):
+        """Test that the heuristic is used when tiktoken is missing."""
+        with patch.object(tokens, "TIKTOKEN_AVAILABLE", False):
+            self.assertIs(token_counter_for_model("gpt-4o"), estimate_tokens)
+
+    def test_fallback_when_the_encoding_cannot_be_loaded(self):
+        """Test that the heuristic is used when tiktoken cannot load an encoding offline."""
+        fake = Mock()
+        fake.encoding_for_model.side_effect = KeyError("unknown-model")
+        fake.get_encoding.side_effect = OSError("no network")
+        with patch.object(tokens, "TIKTOKEN_AVAILABLE", True), \
+                patch.object(tokens, "tiktoken", fake, create=True):
+            self.assertIs(token_counter_for_model("unknown-model"), estimate_tokens)
+        fake.get_encoding.assert_called_once_with("o200k_base")
+
+    def test_tiktoken_counter(self):
+        """Test that tiktoken's encoding counts when it is available."""
+        fake = Mock()
+        fake.encoding_for_model.return_value.encode.side_effect = lambda text, disallowed_special: text.split()
+        with patch.object(tokens, "TIKTOKEN_AVAILABLE", True), \
+                patch.object(tokens, "tiktoken", fake, create=True):
+            count = token_counter_for_model("gpt-4o")
+        self.assertEqual(count("one two three"), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
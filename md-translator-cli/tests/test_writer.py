@@ -0,0 +1,154 @@
+"""Unit tests for streaming translated chunks to disk."""
+
+import argparse
+import io
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from tests.fakes import FakeClient, StatusError, shout
+from translate_md.cli import translate_and_write
+from translate_md.writer import CHECKPOINT_SUFFIX, PART_SUFFIX, ChunkWriter
+
+
+class TestChunkWriter(unittest.TestCase):
+    """Test cases for ChunkWriter."""
+
+    def setUp(self):
+        """Create a temporary output directory."""
+        self.directory = tempfile.mkdtemp()
+        self.output = os.path.join(self.directory, "out", "doc.md")
+
+    def tearDown(self):
+        """Remove the temporary directory."""
+        shutil.rmtree(self.directory)
+
+    def _read(self, path):
+        with open(path, "r", encoding="utf-8") as f:
+            return f.read()
+
+    def test_chunks_are_written_in_order_and_committed(self):
+        """Test that out-of-order chunks are buffered and the document is committed when complete."""
+        writer = ChunkWriter(self.output, "fp", 3)
+        writer.add(2, "c")
+        self.assertFalse(os.path.exists(self.output + PART_SUFFIX))
+        writer.add(0, "a")
+        self.assertEqual(self._read(self.output + PART_SUFFIX), "a")
+        self.assertEqual(writer.completed, 1)
+
+        writer.add(1, "b")
+
+        self.assertTrue(writer.committed)
+        self.assertEqual(self._read(self.output), "abc")
+        self.assertFalse(os.path.exists(self.output + PART_SUFFIX))
+        self.assertFalse(os.path.exists(self.output + CHECKPOINT_SUFFIX))
+
+    def test_resume_continues_after_checkpoint(self):
+        """Test that a matching checkpoint skips finished chunks and drops bytes written after it."""
+        writer = ChunkWriter(self.output, "fp", 3)
+        writer.add(0, "first ")
+        writer.add(1, "second ")
+        # An interrupted write left bytes the checkpoint does not cover
+        with open(self.output + PART_SUFFIX, "ab") as f:
+            f.write(b"garbage")
+
+        resumed = ChunkWriter(self.output, "fp", 3, resume=True)
+        self.assertEqual(resumed.completed, 2)
+        resumed.add(2, "third")
+
+        self.assertEqual(self._read(self.output), "first second third")
+
+    def test_mismatched_or_disabled_resume_starts_over(self):
+        """Test that another plan, or resume=False, discards the part file."""
+        ChunkWriter(self.output, "fp", 2).add(0, "old ")
+
+        self.assertEqual(ChunkWriter(self.output, "other", 2, resume=True).completed, 0)
+        ChunkWriter(self.output, "fp", 2).add(0, "old ")
+        writer = ChunkWriter(self.output, "fp", 2, resume=False)
+        self.assertEqual(writer.completed, 0)
+        self.assertFalse(os.path.exists(self.output + PART_SUFFIX))
+        writer.add(1, "b")
+        writer.add(0, "a")
+
+        self.assertEqual(self._read(self.output), "ab")
+
+    def test_empty_document_is_committed(self):
+        """Test that a document without chunks still produces an output file."""
+        writer = ChunkWriter(self.output, "fp", 0)
+        self.assertTrue(writer.done)
+        writer.commit()
+        self.assertEqual(self._read(self.output), "")
+
+    def test_many_documents_do_not_hold_file_descriptors(self):
+        """Test that unfinished writers keep no file open between writes."""
+        writers = [ChunkWriter(os.path.join(self.directory, f"{i}.md"), "fp", 2) for i in range(50)]
+        for writer in writers:
+            writer.add(0, "a")
+        if os.path.isdir("/proc/self/fd"):
+            open_paths = []
+            for fd in os.listdir("/proc/self/fd"):
+                try:
+                    open_paths.append(os.readlink(os.path.join("/proc/self/fd", fd)))
+                except OSError:
+                    pass
+            self.assertFalse([path for path in open_paths if path.endswith(PART_SUFFIX)])
+        for writer in writers:
+            writer.add(1, "b")
+        self.assertTrue(all(writer.committed for writer in writers))
+
+
+class TestResumeHint(unittest.TestCase):
+    """Test cases for the --resume hint after a failed run."""
+
+    document = "First paragraph.\n\nSecond paragraph.\n\nThird paragraph.\n"
+
+    def setUp(self):
+        """Create a temporary output directory."""
+        self.directory = tempfile.mkdtemp()
+        self.output = os.path.join(self.directory, "doc.md")
+
+    def tearDown(self):
+        """Remove the temporary directory."""
+        shutil.rmtree(self.directory)
+
+    def _fail(self, failing_chunk, status_code):
+        def translate(chunk, target_lang):
+            if chunk.startswith(failing_chunk):
+                raise StatusError(status_code)
+            return shout(chunk, target_lang)
+
+        args = argparse.Namespace(
+            target_langs=["de"], incremental=False, resume=False, stats=False, progress=False,
+            workers=1, rpm=None, tpm=None, max_chunk_tokens=5,
+        )
+        stderr = io.StringIO()
+        with patch("translate_md.cli.MAX_ATTEMPTS", 1), patch("sys.stderr", stderr), \
+                self.assertRaises(SystemExit):
+            translate_and_write(FakeClient(translate), [self.document], [[self.output]], args, "gpt-4o-mini", None)
+        return stderr.getvalue()
+
+    def test_hint_after_transient_error_with_checkpoint(self):
+        """Test that the hint is shown when a retry can succeed and chunks were kept."""
+        message = self._fail("Second", 503)
+        self.assertTrue(os.path.exists(self.output + CHECKPOINT_SUFFIX))
+        self.assertIn("re-run with --resume", message)
+
+    def test_no_hint_after_final_error(self):
+        """Test that errors a retry cannot fix (auth, unknown model) get no hint."""
+        for status_code in (401, 404):
+            with self.subTest(status_code=status_code):
+                message = self._fail("Second", status_code)
+                self.assertIn(f"status {status_code}", message)
+                self.assertNotIn("--resume", message)
+
+    def test_no_hint_without_checkpoint(self):
+        """Test that no hint is shown when nothing was written yet."""
+        message = self._fail("First", 503)
+        self.assertFalse(os.path.exists(self.output + CHECKPOINT_SUFFIX))
+        self.assertNotIn("--resume", message)
+
+
+if __name__ == "__main__":
+    unittest.main()
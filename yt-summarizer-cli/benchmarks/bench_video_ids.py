@@ -0,0 +1,97 @@
+"""Microbenchmark: bulk video ID extraction vs. the previous per-URL parser.
+
+Run from the project root:
+
+    python benchmarks/bench_video_ids.py [--urls 200000] [--repeat 3]
+"""
+
+import argparse
+import os
+import random
+import re
+import sys
+import time
+from urllib.parse import urlparse, parse_qs
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from youtube_summarizer.video_ids import extract_video_ids  # noqa: E402
+
+
+def legacy_extract_video_id(url):
+    """TranscriptExtractor.extract_video_id as it was before extract_video_ids."""
+    patterns = [
+        r'(?:youtube\.com\/watch\?v=|youtu\.be\/|youtube\.com\/embed\/)([^&\n?#]+)',
+        r'youtube\.com\/v\/([^&\n?#]+)',
+    ]
+
+    for pattern in patterns:
+        match = re.search(pattern, url)
+        if match:
+            return match.group(1)
+
+    parsed = urlparse(url)
+    if parsed.netloc and 'youtube' in parsed.netloc.lower():
+        params = parse_qs(parsed.query)
+        if 'v' in params:
+            return params['v'][0]
+
+    raise ValueError(f"Invalid YouTube URL: {url}")
+
+
+def legacy_extract_video_ids(urls):
+    """Bulk extraction built on the legacy function, deduplicating like the new one."""
+    seen = set()
+    for url in urls:
+        try:
+            video_id = legacy_extract_video_id(url)
+        except ValueError:
+            continue
+        if video_id not in seen:
+            seen.add(video_id)
+            yield video_id
+
+
+def make_urls(count, seed=0):
+    """Build log-like input: mostly watch and short URLs, some noise, many repeats."""
+    rng = random.Random(seed)
+    alphabet = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789_-"
+    ids = ["".join(rng.choice(alphabet) for _ in range(11)) for _ in range(count // 4)]
+    forms = [
+        "https://www.youtube.com/watch?v={}",
+        "https://www.youtube.com/watch?v={}&t=42s",
+        "https://youtu.be/{}?si=AbCdEfGh",
+        "https://www.youtube.com/embed/{}",
+        "https://example.com/articles/{}/comments",
+    ]
+    return [rng.choice(forms).format(rng.choice(ids)) for _ in range(count)]
+
+
+def best_of(function, urls, repeat):
+    timings = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = list(function(urls))
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--urls", type=int, default=200000, help="URLs per run (default: %(default)s)")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per variant, best is reported (default: %(default)s)")
+    args = parser.parse_args()
+
+    urls = make_urls(args.urls)
+    legacy_time, legacy_ids = best_of(legacy_extract_video_ids, urls, args.repeat)
+    new_time, new_ids = best_of(extract_video_ids, urls, args.repeat)
+
+    assert new_ids == legacy_ids, "implementations disagree"
+    for name, elapsed in (("legacy extract_video_id", legacy_time), ("extract_video_ids", new_time)):
+        print(f"{name:<24} {elapsed:8.3f} s  {args.urls / elapsed:12,.0f} URLs/s")
+    print(f"speedup: {legacy_time / new_time:.1f}x ({len(new_ids)} unique IDs)")
+
+
+if __name__ == "__main__":
+    main()
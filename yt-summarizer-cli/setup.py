@@ -10,6 +10,7 @@ setup(
         "youtube-transcript-api>=0.6.2",
         "openai>=1.0.0",
         "rich>=13.0.0",
+        "requests>=2.25.0",
     ],
     entry_points={
         "console_scripts": [
@@ -0,0 +1,188 @@
+"""Unit tests for the async transcript extractor against a local stub server."""
+
+import asyncio
+import json
+import os
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+from urllib.parse import parse_qs, urlparse
+
+from youtube_summarizer.async_transcript import AsyncTranscriptExtractor, create_session
+
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures", "youtube")
+
+
+def _fixture(name):
+    with open(os.path.join(FIXTURES, name), "r", encoding="utf-8") as f:
+        return f.read()
+
+
+class StubYouTube(ThreadingHTTPServer):
+    """HTTP server replaying recorded YouTube responses."""
+
+    daemon_threads = True
+
+    def __init__(self, delay=0.02):
+        super().__init__(("127.0.0.1", 0), StubHandler)
+        self.base = f"http://127.0.0.1:{self.server_address[1]}"
+        self.delay = delay
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.peak = 0
+        self.requests = 0
+        self.connections = set()
+        # video_id -> number of timedtext requests still answered with 503
+        self.failures = {}
+        self.responses = {
+            "watch": _fixture("watch.html"),
+            "player": _fixture("player.json"),
+            "timedtext": _fixture("timedtext.xml"),
+        }
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Serves the watch page, the player API and timed text."""
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        self._handle()
+
+    def do_POST(self):
+        self._handle()
+
+    def _handle(self):
+        server = self.server
+        with server.lock:
+            server.in_flight += 1
+            server.requests += 1
+            server.peak = max(server.peak, server.in_flight)
+            server.connections.add(self.client_address)
+        try:
+            time.sleep(server.delay)
+            url = urlparse(self.path)
+            params = parse_qs(url.query)
+            body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            status = 200
+            if url.path == "/watch":
+                video_id = params["v"][0]
+                text = server.responses["watch"]
+            elif url.path == "/youtubei/v1/player":
+                video_id = json.loads(body)["videoId"]
+                text = server.responses["player"]
+            elif url.path == "/api/timedtext":
+                video_id = params["v"][0]
+                text = server.responses["timedtext"]
+                with server.lock:
+                    if server.failures.get(video_id, 0) > 0:
+                        server.failures[video_id] -= 1
+                        status, text = 503, "Service Unavailable"
+            else:
+                video_id = ""
+                status, text = 404, "Not Found"
+            data = text.replace("{base}", server.base).replace("{video_id}", video_id).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+        finally:
+            with server.lock:
+                server.in_flight -= 1
+
+
+class TestAsyncTranscriptExtractor(unittest.TestCase):
+    """Test cases for AsyncTranscriptExtractor."""
+
+    def setUp(self):
+        """Start the stub server and point youtube-transcript-api at it."""
+        self.server = StubYouTube()
+        thread = threading.Thread(target=self.server.serve_forever, args=(0.05,), daemon=True)
+        thread.start()
+        for name, url in (
+            ("WATCH_URL", self.server.base + "/watch?v={video_id}"),
+            ("INNERTUBE_API_URL", self.server.base + "/youtubei/v1/player?key={api_key}"),
+        ):
+            patcher = patch(f"youtube_transcript_api._transcripts.{name}", url)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        """Stop the stub server."""
+        self.server.shutdown()
+        self.server.server_close()
+
+    def _extractor(self, per_host=4, **kwargs):
+        session = create_session(per_host)
+        session.trust_env = False  # no proxies for the local server
+        self.addCleanup(session.close)
+        return AsyncTranscriptExtractor(session=session, **kwargs)
+
+    def test_fetch_transcript(self):
+        """Test fetching and parsing one transcript."""
+        extractor = self._extractor()
+
+        async def run():
+            async with extractor:
+                return await extractor.fetch_segments("video000001", language="en")
+
+        segments = asyncio.run(run())
+
+        self.assertEqual(
+            segments.text,
+            "Welcome to the video video000001 today we talk about & test connection pooling and that's all",
+        )
+        self.assertEqual(segments[1].start, 2.74)
+        self.assertEqual(self.server.requests, 3)
+
+    def test_fetch_many_respects_per_host_limit_and_reuses_connections(self):
+        """Test concurrency, the per-host connection limit and keep-alive reuse."""
+        extractor = self._extractor(per_host=2, concurrency=8)
+        video_ids = [f"video{i:06d}" for i in range(12)]
+
+        async def run():
+            async with extractor:
+                return await extractor.fetch_many(video_ids)
+
+        results = asyncio.run(run())
+
+        self.assertEqual([r.text.split()[4] for r in results], video_ids)
+        self.assertEqual(self.server.requests, 36)
+        self.assertEqual(self.server.peak, 2)
+        self.assertLessEqual(len(self.server.connections), 2)
+
+    def test_request_failures_are_retried(self):
+        """Test jittered retries after YouTubeRequestFailed."""
+        self.server.failures = {"video000001": 2, "video000002": 5}
+        extractor = self._extractor(retries=3, backoff=0.01)
+
+        async def run():
+            async with extractor:
+                return await extractor.fetch_many(["video000001", "video000002"])
+
+        flaky, broken = asyncio.run(run())
+
+        self.assertIn("video000001", flaky.text)
+        self.assertIsInstance(broken, ValueError)
+        self.assertIn("Failed to fetch transcript from YouTube", str(broken))
+        # Listing once per video, then one timed text request per attempt
+        self.assertEqual(self.server.requests, 2 * 2 + 3 + 4)
+
+    def test_retry_delay_is_jittered_and_capped(self):
+        """Test the backoff delays."""
+        extractor = self._extractor(backoff=1.0, max_backoff=4.0)
+        self.addCleanup(extractor.close)
+        delays = [extractor.retry_delay(attempt) for attempt in range(10) for _ in range(20)]
+        self.assertTrue(all(0 <= delay <= 4.0 for delay in delays))
+        self.assertGreater(len(set(delays)), 1)
+        self.assertTrue(all(extractor.retry_delay(0) <= 1.0 for _ in range(20)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,255 @@
+"""Unit tests for batch summarization module."""
+
+import io
+import json
+import threading
+import time
+import unittest
+from unittest.mock import Mock, MagicMock, patch
+
+from youtube_summarizer import cli
+from youtube_summarizer.batch import BatchItem, BatchPipeline, expand_urls, read_urls
+from youtube_summarizer.normalize import normalize_transcript
+from youtube_summarizer.playlist import extract_playlist_id, fetch_playlist_video_ids
+from youtube_summarizer.segments import TranscriptSegments
+from youtube_summarizer.transcript import TranscriptExtractor
+
+
+def segments(text, language_code="en"):
+    """Build fetched transcript segments holding a single caption."""
+    return TranscriptSegments.from_entries([{"text": text, "start": 0.0, "duration": 1.0}], language_code)
+
+
+class TestReadAndExpandUrls(unittest.TestCase):
+    """Test cases for reading and expanding batch input."""
+
+    def test_read_urls_skips_blank_lines_and_comments(self):
+        """Test that blank lines and comments are ignored."""
+        stream = io.StringIO("# nightly\nhttps://youtu.be/aaaaaaaaaaa\n\n  https://youtu.be/bbbbbbbbbbb  \n")
+        self.assertEqual(
+            read_urls(stream),
+            ["https://youtu.be/aaaaaaaaaaa", "https://youtu.be/bbbbbbbbbbb"],
+        )
+
+    def test_extract_playlist_id(self):
+        """Test that only real playlist URLs are treated as playlists."""
+        self.assertEqual(
+            extract_playlist_id("https://www.youtube.com/playlist?list=PL123"), "PL123"
+        )
+        self.assertIsNone(extract_playlist_id("https://www.youtube.com/watch?v=dQw4w9WgXcQ&list=PL123"))
+        self.assertIsNone(extract_playlist_id("https://youtu.be/dQw4w9WgXcQ"))
+
+    def test_fetch_playlist_video_ids(self):
+        """Test parsing of video IDs from the playlist page."""
+        page = (
+            '{"playlistVideoRenderer":{"videoId":"aaaaaaaaaaa","title":{}}},'
+            '{"playlistVideoRenderer":{"videoId":"bbbbbbbbbbb","title":{}}},'
+            '{"playlistVideoRenderer":{"videoId":"aaaaaaaaaaa","title":{}}}'
+        )
+        session = MagicMock()
+        session.get.return_value.text = page
+        self.assertEqual(
+            fetch_playlist_video_ids("PL123", session=session),
+            ["aaaaaaaaaaa", "bbbbbbbbbbb"],
+        )
+
+    def test_fetch_playlist_without_videos(self):
+        """Test that an empty playlist page raises ValueError."""
+        session = MagicMock()
+        session.get.return_value.text = "<html></html>"
+        with self.assertRaises(ValueError):
+            fetch_playlist_video_ids("PL123", session=session)
+
+    def test_fetch_playlist_ignores_videos_outside_the_playlist(self):
+        """Test that recommended videos are not taken for playlist entries."""
+        session = MagicMock()
+        session.get.return_value.text = (
+            '{"compactVideoRenderer":{"videoId":"rrrrrrrrrrr"}},'
+            '{"lockupViewModel":{"contentId":"x","videoId":"sssssssssss"}}'
+        )
+        with self.assertRaises(ValueError):
+            fetch_playlist_video_ids("PL123", session=session)
+
+    def test_expand_urls(self):
+        """Test playlist expansion, deduplication and invalid input."""
+        fetch_playlist = Mock(return_value=["aaaaaaaaaaa", "ccccccccccc"])
+        items, errors = expand_urls(
+            [
+                "https://youtu.be/aaaaaaaaaaa",
+                "https://www.youtube.com/playlist?list=PL123",
+                "https://example.com/video",
+            ],
+            TranscriptExtractor(),
+            fetch_playlist=fetch_playlist,
+        )
+
+        self.assertEqual([item.video_id for item in items], ["aaaaaaaaaaa", "ccccccccccc"])
+        self.assertEqual([item.index for item in items], [0, 1])
+        self.assertEqual(items[1].url, "https://www.youtube.com/watch?v=ccccccccccc")
+        fetch_playlist.assert_called_once_with("PL123")
+        self.assertEqual(len(errors), 1)
+        self.assertEqual(errors[0]["stage"], "input")
+
+
+class TestBatchPipeline(unittest.TestCase):
+    """Test cases for BatchPipeline."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.items = [BatchItem(i, f"https://youtu.be/video{i:06d}", f"video{i:06d}") for i in range(8)]
+
+    def _records(self, out):
+        return sorted((json.loads(line) for line in out.getvalue().splitlines()), key=lambda r: r["index"])
+
+    def test_run_writes_one_json_line_per_video(self):
+        """Test successful and failed videos in the JSON Lines output."""
+        def fetch_segments(video_id, language):
+            if video_id == "video000003":
+                raise ValueError("Transcripts are disabled")
+            return segments(f"text of {video_id}")
+
+        extractor = Mock()
+        extractor.fetch_segments.side_effect = fetch_segments
+        llm_client = Mock()
+        llm_client.summarize.side_effect = lambda transcript: {"summary": transcript.upper()}
+
+        out = io.StringIO()
+        counts = BatchPipeline(extractor, llm_client).run(self.items, out)
+
+        records = self._records(out)
+        self.assertEqual(counts, {"ok": 7, "error": 1})
+        self.assertEqual(len(records), 8)
+        self.assertEqual(records[0]["summary"], {"summary": "TEXT OF VIDEO000000"})
+        self.assertEqual(records[3]["status"], "error")
+        self.assertEqual(records[3]["stage"], "transcript")
+        self.assertEqual(llm_client.summarize.call_count, 7)
+
+    def test_run_without_llm_writes_transcripts(self):
+        """Test raw mode, where no summary stage runs."""
+        extractor = Mock()
+        extractor.fetch_segments.return_value = segments("hello")
+
+        out = io.StringIO()
+        BatchPipeline(extractor, None).run(self.items[:2], out)
+
+        records = self._records(out)
+        self.assertEqual([r["transcript"] for r in records], ["hello", "hello"])
+
+    def test_normalize_reports_tokens_saved(self):
+        """Test that normalized transcripts are summarized and record the savings."""
+        extractor = Mock()
+        extractor.fetch_segments.return_value = segments("[Music] so um we start here we start here")
+        llm_client = Mock()
+        llm_client.summarize.side_effect = lambda transcript: {"summary": transcript}
+
+        out = io.StringIO()
+        BatchPipeline(extractor, llm_client, normalize=True).run(self.items[:1], out)
+
+        record = self._records(out)[0]
+        self.assertEqual(record["summary"], {"summary": "so we start here"})
+        self.assertGreater(record["tokens_saved"], 0)
+
+    def test_normalize_uses_the_fetched_language(self):
+        """Test that filler words follow the fetched transcript, not the requested language."""
+        extractor = Mock()
+        extractor.fetch_segments.return_value = segments("[Musik] Wir fahren um acht Uhr los", "de")
+
+        out = io.StringIO()
+        BatchPipeline(extractor, None, language="en", normalize=True).run(self.items[:1], out)
+
+        extractor.fetch_segments.assert_called_once_with("video000000", language="en")
+        self.assertEqual(self._records(out)[0]["transcript"], "Wir fahren um acht Uhr los")
+
+    def test_unexpected_errors_do_not_leak_in_flight_slots(self):
+        """Test that a failure before the summary stage still frees its slot."""
+        semaphores = []
+
+        class CountingSemaphore(threading.BoundedSemaphore):
+            def __init__(self, value):
+                super().__init__(value)
+                self.acquired = self.released = 0
+                semaphores.append(self)
+
+            def acquire(self, *args, **kwargs):
+                self.acquired += 1
+                return super().acquire(*args, **kwargs)
+
+            def release(self, *args, **kwargs):
+                self.released += 1
+                return super().release(*args, **kwargs)
+
+        def normalize(text, language):
+            if text == "text of video000002":
+                raise RuntimeError("boom")
+            return normalize_transcript(text, language)
+
+        extractor = Mock()
+        extractor.fetch_segments.side_effect = lambda video_id, language: segments(f"text of {video_id}")
+        llm_client = Mock()
+        llm_client.summarize.return_value = {"summary": "s"}
+
+        # Enough slots for every video, so a leaked slot shows up in the counts instead of a hang
+        with patch("youtube_summarizer.batch.threading.BoundedSemaphore", CountingSemaphore), \
+                patch("youtube_summarizer.batch.normalize_transcript", side_effect=normalize):
+            with self.assertRaisesRegex(RuntimeError, "boom"):
+                BatchPipeline(extractor, llm_client, transcript_workers=8, normalize=True).run(
+                    self.items, io.StringIO()
+                )
+
+        self.assertEqual(semaphores[0].acquired, 8)
+        self.assertEqual(semaphores[0].released, 8)
+        self.assertEqual(llm_client.summarize.call_count, 7)
+
+    def test_stages_respect_their_concurrency_limits(self):
+        """Test that each stage runs at most its own number of workers."""
+        active = {"transcript": 0, "summary": 0}
+        peak = {"transcript": 0, "summary": 0}
+        lock = threading.Lock()
+
+        def tracked(stage, result):
+            def call(*args, **kwargs):
+                with lock:
+                    active[stage] += 1
+                    peak[stage] = max(peak[stage], active[stage])
+                time.sleep(0.02)
+                with lock:
+                    active[stage] -= 1
+                return result
+            return call
+
+        extractor = Mock()
+        extractor.fetch_segments.side_effect = tracked("transcript", segments("text"))
+        llm_client = Mock()
+        llm_client.summarize.side_effect = tracked("summary", {"summary": "s"})
+
+        out = io.StringIO()
+        counts = BatchPipeline(
+            extractor, llm_client, transcript_workers=3, summary_workers=2
+        ).run(self.items, out)
+
+        self.assertEqual(counts["ok"], 8)
+        self.assertLessEqual(peak["transcript"], 3)
+        self.assertLessEqual(peak["summary"], 2)
+        self.assertGreater(peak["transcript"], 1)
+
+
+class TestBatchCommand(unittest.TestCase):
+    """Test cases for the batch branch of the CLI."""
+
+    @patch("youtube_summarizer.cli.open_cache", return_value=None)
+    @patch("youtube_summarizer.cli.run_batch", side_effect=RuntimeError("disk on fire"))
+    def test_unexpected_errors_are_reported(self, mock_run_batch, mock_open_cache):
+        """Test that any error ends the run with a message instead of a traceback."""
+        stderr = io.StringIO()
+        with patch("sys.argv", ["youtube-summarize", "--urls-file", "urls.txt"]), \
+                patch("sys.stderr", stderr):
+            with self.assertRaises(SystemExit) as context:
+                cli.main()
+
+        self.assertEqual(context.exception.code, 1)
+        self.assertIn("disk on fire", stderr.getvalue())
+        self.assertNotIn("Traceback", stderr.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
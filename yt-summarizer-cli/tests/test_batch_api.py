@@ -0,0 +1,350 @@
+"""Unit tests for Batch API summarization against a local stub server."""
+
+import json
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from email import policy
+from email.parser import BytesParser
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+from youtube_summarizer.batch_api import BatchJob
+from youtube_summarizer.cache import DiskCache
+from youtube_summarizer.llm_client import BATCH_ENDPOINT, LLMClient
+
+
+class StubBatchAPI(ThreadingHTTPServer):
+    """HTTP server implementing the file and batch endpoints of the OpenAI API."""
+
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), StubBatchHandler)
+        self.base = f"http://127.0.0.1:{self.server_address[1]}/v1"
+        self.lock = threading.Lock()
+        self.files = {}
+        self.batches = {}
+        # Status reported by successive polls; the job finishes with the last one
+        self.statuses = ["validating", "in_progress", "completed"]
+
+    def run_batch(self, batch_id, input_file_id):
+        """Answer every request of an input file, as the real job would."""
+        output, errors = [], []
+        for line in self.files[input_file_id].decode("utf-8").splitlines():
+            request = json.loads(line)
+            prompt = request["body"]["messages"][-1]["content"]
+            custom_id = request["custom_id"]
+            if "DROP" in prompt:
+                continue
+            if "FAIL" in prompt:
+                errors.append({
+                    "id": f"req-{custom_id}",
+                    "custom_id": custom_id,
+                    "response": {"status_code": 400, "body": {"error": {"message": "Invalid prompt"}}},
+                    "error": None,
+                })
+                continue
+            content = json.dumps({"title": f"Summary of {custom_id}", "summary": "stub"})
+            output.append({
+                "id": f"req-{custom_id}",
+                "custom_id": custom_id,
+                "response": {
+                    "status_code": 200,
+                    "body": {"choices": [{"index": 0, "message": {"role": "assistant", "content": content}}]},
+                },
+                "error": None,
+            })
+        for name, lines in (("output", output), ("errors", errors)):
+            self.files[f"{batch_id}-{name}"] = "".join(json.dumps(line) + "\n" for line in lines).encode("utf-8")
+
+    def batch_object(self, batch):
+        """Serialize a batch as the API does."""
+        finished = batch["status"] == "completed"
+        return {
+            "id": batch["id"],
+            "object": "batch",
+            "endpoint": batch["endpoint"],
+            "input_file_id": batch["input_file_id"],
+            "completion_window": "24h",
+            "status": batch["status"],
+            "created_at": 0,
+            "output_file_id": f"{batch['id']}-output" if finished else None,
+            "error_file_id": f"{batch['id']}-errors" if finished else None,
+        }
+
+
+class StubBatchHandler(BaseHTTPRequestHandler):
+    """Serves /v1/files and /v1/batches (create, list, retrieve)."""
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status, body, content_type="application/json"):
+        data = body if isinstance(body, bytes) else json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_POST(self):
+        server = self.server
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        with server.lock:
+            if self.path == "/v1/files":
+                message = BytesParser(policy=policy.HTTP).parsebytes(
+                    b"Content-Type: " + self.headers["Content-Type"].encode("ascii") + b"\r\n\r\n" + body
+                )
+                part = next(
+                    part for part in message.iter_parts()
+                    if part.get_param("name", header="content-disposition") == "file"
+                )
+                file_id = f"file-{len(server.files) + 1}"
+                server.files[file_id] = part.get_payload(decode=True)
+                self._send(200, {
+                    "id": file_id, "object": "file", "bytes": len(server.files[file_id]),
+                    "created_at": 0, "filename": "batch.jsonl", "purpose": "batch", "status": "processed",
+                })
+            elif self.path == "/v1/batches":
+                params = json.loads(body)
+                batch_id = f"batch-{len(server.batches) + 1}"
+                server.batches[batch_id] = {
+                    "id": batch_id,
+                    "endpoint": params["endpoint"],
+                    "input_file_id": params["input_file_id"],
+                    "status": server.statuses[0],
+                    "polls": 0,
+                }
+                server.run_batch(batch_id, params["input_file_id"])
+                self._send(200, server.batch_object(server.batches[batch_id]))
+            else:
+                self._send(404, {"error": {"message": "Not found"}})
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            parts = self.path.split("?")[0].strip("/").split("/")
+            if parts == ["v1", "batches"]:
+                batches = [server.batch_object(batch) for batch in reversed(list(server.batches.values()))]
+                self._send(200, {"object": "list", "data": batches, "has_more": False})
+            elif parts[:2] == ["v1", "batches"] and parts[2] in server.batches:
+                batch = server.batches[parts[2]]
+                batch["polls"] += 1
+                batch["status"] = server.statuses[min(batch["polls"], len(server.statuses) - 1)]
+                self._send(200, server.batch_object(batch))
+            elif parts[:2] == ["v1", "files"] and parts[-1] == "content" and parts[2] in server.files:
+                self._send(200, server.files[parts[2]], "application/octet-stream")
+            else:
+                self._send(404, {"error": {"message": "Not found"}})
+
+
+class TestBatchJob(unittest.TestCase):
+    """Test cases for BatchJob and the LLMClient batch methods."""
+
+    def setUp(self):
+        """Start the stub server and point the OpenAI client at it."""
+        self.server = StubBatchAPI()
+        thread = threading.Thread(target=self.server.serve_forever, args=(0.05,), daemon=True)
+        thread.start()
+        patcher = patch.dict(os.environ, {"OPENAI_API_KEY": "test-key", "OPENAI_BASE_URL": self.server.base})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.directory = tempfile.mkdtemp()
+        self.state_path = os.path.join(self.directory, "batch-job.json")
+        self.sleeps = []
+        self.records = [
+            {"index": 0, "url": "https://youtu.be/aaaaaaaaaaa", "video_id": "aaaaaaaaaaa",
+             "status": "ok", "transcript": "first video", "tokens_saved": 3},
+            {"index": 1, "url": "https://youtu.be/bbbbbbbbbbb", "video_id": "bbbbbbbbbbb",
+             "status": "error", "stage": "transcript", "error": "Transcripts are disabled"},
+            {"index": 2, "url": "https://youtu.be/ccccccccccc", "video_id": "ccccccccccc",
+             "status": "ok", "transcript": "FAIL this one"},
+            {"index": 3, "url": "https://youtu.be/ddddddddddd", "video_id": "ddddddddddd",
+             "status": "ok", "transcript": "second video"},
+        ]
+
+    def tearDown(self):
+        """Stop the stub server and remove temporary files."""
+        self.server.shutdown()
+        self.server.server_close()
+        shutil.rmtree(self.directory)
+
+    def _job(self, cache=None):
+        return BatchJob(LLMClient(cache=cache), self.state_path, poll_interval=5, sleep=self.sleeps.append)
+
+    def test_batch_request(self):
+        """Test the JSONL request line of one transcript."""
+        request = LLMClient().batch_request("aaaaaaaaaaa", "some transcript", max_tokens=500)
+
+        self.assertEqual(request["custom_id"], "aaaaaaaaaaa")
+        self.assertEqual(request["url"], BATCH_ENDPOINT)
+        self.assertEqual(request["body"]["model"], "gpt-4o-mini")
+        self.assertEqual(request["body"]["max_tokens"], 500)
+        self.assertIn("some transcript", request["body"]["messages"][-1]["content"])
+
+    def test_submit_wait_and_map_results_to_videos(self):
+        """Test a full job: upload, polling and one record per video."""
+        job = self._job()
+        job.submit(self.records)
+
+        self.assertTrue(job.pending)
+        self.assertEqual(job.request_count, 3)
+        uploaded = self.server.files["file-1"].decode("utf-8").splitlines()
+        self.assertEqual([json.loads(line)["custom_id"] for line in uploaded],
+                         ["aaaaaaaaaaa", "ccccccccccc", "ddddddddddd"])
+
+        records = job.results(job.wait())
+
+        self.assertEqual(self.sleeps, [5])
+        self.assertEqual([r["index"] for r in records], [0, 1, 2, 3])
+        self.assertEqual([r["status"] for r in records], ["ok", "error", "error", "ok"])
+        self.assertEqual(records[0]["summary"]["title"], "Summary of aaaaaaaaaaa")
+        self.assertEqual(records[0]["tokens_saved"], 3)
+        self.assertEqual(records[1]["stage"], "transcript")
+        self.assertEqual(records[2]["stage"], "summary")
+        self.assertIn("Invalid prompt", records[2]["error"])
+        self.assertEqual(records[3]["url"], "https://youtu.be/ddddddddddd")
+        self.assertNotIn("transcript", records[3])
+
+        job.clear()
+        self.assertFalse(os.path.exists(self.state_path))
+
+    def test_job_resumes_after_restart(self):
+        """Test that a new process picks up the submitted job from the state file."""
+        self._job().submit(self.records)
+
+        job = self._job()
+
+        self.assertTrue(job.pending)
+        self.assertEqual(job.batch_id, "batch-1")
+        records = job.results(job.wait())
+        self.assertEqual(
+            [(r["video_id"], r["status"]) for r in records],
+            [("aaaaaaaaaaa", "ok"), ("bbbbbbbbbbb", "error"), ("ccccccccccc", "error"), ("ddddddddddd", "ok")],
+        )
+        self.assertEqual(len(self.server.batches), 1)
+
+    def test_state_is_saved_before_the_upload(self):
+        """Test that the request mapping is on disk before anything is paid for."""
+        client = LLMClient()
+        seen = []
+        upload = client.upload_batch_file
+
+        def checked_upload(requests):
+            with open(self.state_path, "r", encoding="utf-8") as f:
+                seen.append(json.load(f))
+            return upload(requests)
+
+        client.upload_batch_file = checked_upload
+        BatchJob(client, self.state_path).submit(self.records)
+
+        self.assertEqual(seen[0]["status"], "submitting")
+        self.assertIsNone(seen[0]["input_file_id"])
+        self.assertEqual(set(seen[0]["requests"]), {"aaaaaaaaaaa", "ccccccccccc", "ddddddddddd"})
+        with open(self.state_path, "r", encoding="utf-8") as f:
+            state = json.load(f)
+        self.assertEqual((state["status"], state["input_file_id"], state["batch_id"]), ("submitted", "file-1", "batch-1"))
+
+    def test_crash_after_creating_the_job_does_not_submit_it_again(self):
+        """Test that a job whose ID was never saved is found by its input file."""
+        client = LLMClient()
+        create = client.create_batch
+
+        def create_then_crash(input_file_id):
+            create(input_file_id)
+            raise KeyboardInterrupt
+
+        client.create_batch = create_then_crash
+        with self.assertRaises(KeyboardInterrupt):
+            BatchJob(client, self.state_path).submit(self.records)
+
+        job = self._job()
+        self.assertTrue(job.pending)
+        self.assertIsNone(job.batch_id)
+        records = job.results(job.wait())
+
+        self.assertEqual(job.batch_id, "batch-1")
+        self.assertEqual(len(self.server.batches), 1)
+        self.assertEqual([r["status"] for r in records], ["ok", "error", "error", "ok"])
+
+    def test_crash_after_the_upload_creates_the_job_on_resume(self):
+        """Test that an uploaded file without a job gets its job on the next run."""
+        client = LLMClient()
+
+        def crash(input_file_id):
+            raise KeyboardInterrupt
+
+        client.create_batch = crash
+        with self.assertRaises(KeyboardInterrupt):
+            BatchJob(client, self.state_path).submit(self.records)
+        self.assertEqual(self.server.batches, {})
+
+        job = self._job()
+        job.recover()
+
+        self.assertEqual(job.batch_id, "batch-1")
+        self.assertEqual(self.server.batches["batch-1"]["input_file_id"], "file-1")
+        self.assertEqual(len([name for name in self.server.files if name.startswith("file-")]), 1)
+
+    def test_crash_before_the_upload_starts_over(self):
+        """Test that a submission without an uploaded file is simply submitted again."""
+        client = LLMClient()
+
+        def crash(requests):
+            raise KeyboardInterrupt
+
+        client.upload_batch_file = crash
+        with self.assertRaises(KeyboardInterrupt):
+            BatchJob(client, self.state_path).submit(self.records)
+
+        job = self._job()
+        self.assertFalse(job.pending)
+        job.submit(self.records)
+        self.assertEqual(job.batch_id, "batch-1")
+
+    def test_submit_refuses_while_a_job_is_pending(self):
+        """Test that a pending job is not overwritten."""
+        self._job().submit(self.records)
+        with self.assertRaises(ValueError):
+            self._job().submit(self.records)
+
+    def test_unfinished_requests_are_reported(self):
+        """Test requests without a result, e.g. after the job expired."""
+        self.server.statuses = ["validating", "expired"]
+        self.records[0]["transcript"] = "DROP"
+        job = self._job()
+        job.submit(self.records)
+
+        records = job.results(job.wait())
+
+        self.assertEqual(records[0]["status"], "error")
+        self.assertIn("batch expired", records[0]["error"])
+
+    def test_cached_summaries_are_not_submitted(self):
+        """Test that finished summaries are cached and reused by the next job."""
+        cache = DiskCache(self.directory)
+        self.addCleanup(cache.close)
+        job = self._job(cache)
+        job.submit(self.records)
+        job.results(job.wait())
+        job.clear()
+
+        job = self._job(cache)
+        job.submit(self.records)
+
+        # Only the request that failed is sent again
+        self.assertEqual(job.request_count, 1)
+        uploaded = self.server.files["file-4"].decode("utf-8").splitlines()
+        self.assertEqual([json.loads(line)["custom_id"] for line in uploaded], ["ccccccccccc"])
+        records = job.results(job.wait())
+        self.assertEqual([r["status"] for r in records], ["ok", "error", "error", "ok"])
+        self.assertEqual(records[3]["summary"]["title"], "Summary of ddddddddddd")
+
+
+if __name__ == "__main__":
+    unittest.main()
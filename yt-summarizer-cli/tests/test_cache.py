@@ -0,0 +1,126 @@
+"""Unit tests for the disk cache and cached transcript fetching."""
+
+import random
+import shutil
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+from youtube_summarizer.cache import DiskCache
+from youtube_summarizer.transcript import TranscriptExtractor
+
+
+class TestDiskCache(unittest.TestCase):
+    """Test cases for DiskCache."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.directory = tempfile.mkdtemp()
+        self.cache = DiskCache(self.directory)
+
+    def tearDown(self):
+        """Remove the cache directory."""
+        self.cache.close()
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def test_set_and_get(self):
+        """Test storing and reading a value."""
+        self.cache.set("transcript", "abc", [{"text": "Hello", "start": 0.0}])
+        self.assertEqual(self.cache.get("transcript", "abc"), [{"text": "Hello", "start": 0.0}])
+        self.assertIsNone(self.cache.get("transcript", "missing"))
+        self.assertIsNone(self.cache.get("other", "abc"))
+
+    def test_persists_across_instances(self):
+        """Test that entries survive reopening the cache."""
+        self.cache.set("transcript", "abc", "value")
+        self.cache.close()
+        self.cache = DiskCache(self.directory)
+        self.assertEqual(self.cache.get("transcript", "abc"), "value")
+
+    @patch('youtube_summarizer.cache.time.time')
+    def test_expired_entries_are_not_returned(self, mock_time):
+        """Test TTL expiry."""
+        mock_time.return_value = 1000.0
+        self.cache.set("transcript", "abc", "value", ttl=60)
+        mock_time.return_value = 1059.0
+        self.assertEqual(self.cache.get("transcript", "abc"), "value")
+        mock_time.return_value = 1061.0
+        self.assertIsNone(self.cache.get("transcript", "abc"))
+
+    @patch('youtube_summarizer.cache.time.time')
+    def test_evicts_least_recently_used(self, mock_time):
+        """Test size-bounded eviction."""
+        self.cache.close()
+        self.cache = DiskCache(self.directory, max_bytes=3600)
+        # Random hex strings compress to ~1050 bytes each, so only three entries fit
+        values = {key: random.Random(key).getrandbits(8000).to_bytes(1000, "big").hex() for key in "abcd"}
+        for now, key in enumerate("abc"):
+            mock_time.return_value = float(now)
+            self.cache.set("transcript", key, values[key])
+        mock_time.return_value = 10.0
+        self.cache.get("transcript", "a")
+        mock_time.return_value = 11.0
+        self.cache.set("transcript", "d", values["d"])
+
+        self.assertIsNone(self.cache.get("transcript", "b"))
+        self.assertEqual(self.cache.get("transcript", "a"), values["a"])
+        self.assertEqual(self.cache.get("transcript", "d"), values["d"])
+
+
+class TestCachedTranscriptExtractor(unittest.TestCase):
+    """Test cases for TranscriptExtractor with a cache."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.directory = tempfile.mkdtemp()
+        self.cache = DiskCache(self.directory)
+
+    def tearDown(self):
+        """Remove the cache directory."""
+        self.cache.close()
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def _mock_api(self, mock_api_class):
+        transcript = MagicMock()
+        transcript.language_code = "en"
+        transcript.language = "English"
+        transcript.is_generated = False
+        transcript.is_translatable = False
+        transcript.translation_languages = []
+        transcript.fetch.return_value = [
+            {"text": "Hello", "start": 0.0, "duration": 1.0},
+            {"text": "world", "start": 1.0, "duration": 1.0},
+        ]
+        mock_api = MagicMock()
+        mock_api.list.return_value = [transcript]
+        mock_api_class.return_value = mock_api
+        return mock_api, transcript
+
+    @patch('youtube_summarizer.transcript.YouTubeTranscriptApi')
+    def test_second_fetch_skips_youtube(self, mock_api_class):
+        """Test that a cached video is served without listing or fetching."""
+        mock_api, transcript = self._mock_api(mock_api_class)
+
+        first = TranscriptExtractor(cache=self.cache).fetch_transcript("video", language="en")
+        second = TranscriptExtractor(cache=self.cache).fetch_transcript("video", language="en")
+
+        self.assertEqual(first, "Hello world")
+        self.assertEqual(second, "Hello world")
+        mock_api.list.assert_called_once_with("video")
+        transcript.fetch.assert_called_once()
+
+    @patch('youtube_summarizer.transcript.YouTubeTranscriptApi')
+    def test_cached_listing_fetches_missing_snippets(self, mock_api_class):
+        """Test that a cached listing still fetches snippets that are not cached."""
+        mock_api, transcript = self._mock_api(mock_api_class)
+        TranscriptExtractor(cache=self.cache).get_available_languages("video")
+
+        result = TranscriptExtractor(cache=self.cache).fetch_transcript("video", language="en")
+
+        self.assertEqual(result, "Hello world")
+        self.assertEqual(mock_api.list.call_count, 2)
+        transcript.fetch.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -80,6 +80,21 @@ class TestOutputFormatter(unittest.TestCase):
             self.fail(f"print_info raised {e} unexpectedly")
 
 
+    def test_live_summary_with_partial_data(self):
+        """Test progressive rendering of partial and final summaries."""
+        partials = [
+            {"title": "Test"},
+            {"title": "Test", "key_insights": [{}]},
+            {"title": "Test", "key_insights": [{"insight": "First"}]},
+            {"summary": "Plain text", "format": "text"},
+        ]
+        try:
+            with self.formatter.live_summary(title="Test Video") as update:
+                for partial in partials:
+                    update(partial)
+        except Exception as e:
+            self.fail(f"live_summary raised {e} unexpectedly")
+
 if __name__ == "__main__":
     unittest.main()
 
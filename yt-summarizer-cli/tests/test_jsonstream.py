@@ -0,0 +1,89 @@
+"""Unit tests for incremental JSON parsing."""
+
+import json
+import unittest
+
+from youtube_summarizer.jsonstream import IncrementalJSONParser, repair_json
+
+
+class TestIncrementalJSONParser(unittest.TestCase):
+    """Test cases for IncrementalJSONParser."""
+
+    def _feed_chars(self, text):
+        parser = IncrementalJSONParser()
+        values = []
+        for char in text:
+            parser.feed(char)
+            values.append(parser.value())
+        return parser, values
+
+    def test_every_prefix_parses_and_final_value_is_exact(self):
+        """Test that each prefix of a streamed object yields a parseable partial."""
+        data = {
+            "title": "Quotes \"and\" escapes \\ é",
+            "key_insights": [
+                {"insight": "A", "explanation": "x", "certainty": "high"},
+                {"insight": "B", "certainty": "low"},
+            ],
+            "summary": "Done.",
+            "count": 12,
+            "flag": True,
+        }
+        parser, values = self._feed_chars(json.dumps(data))
+
+        self.assertTrue(parser.done)
+        self.assertEqual(values[-1], data)
+        self.assertTrue(all(isinstance(value, dict) for value in values))
+
+    def test_open_string_is_cut_and_incomplete_member_dropped(self):
+        """Test partial values in the middle of a string and of a literal."""
+        parser = IncrementalJSONParser()
+        parser.feed('{"summary": "Hel')
+        self.assertEqual(parser.value(), {"summary": "Hel"})
+        parser.feed('lo", "done": tr')
+        self.assertEqual(parser.value(), {"summary": "Hello"})
+        parser.feed('ue, "key_insights": [{"insight": "A", "cert')
+        self.assertEqual(parser.value(), {"summary": "Hello", "done": True, "key_insights": [{"insight": "A"}]})
+
+    def test_incomplete_unicode_escape_is_dropped(self):
+        """Test that a half-received \\u escape does not break parsing."""
+        parser = IncrementalJSONParser()
+        parser.feed('{"a": "caf\\u00')
+        self.assertEqual(parser.value(), {"a": "caf"})
+        parser.feed('e9"}')
+        self.assertEqual(parser.value(), {"a": "café"})
+
+    def test_value_before_start_is_none(self):
+        """Test that text without an object yet has no value."""
+        parser = IncrementalJSONParser()
+        parser.feed("```json\n")
+        self.assertFalse(parser.started)
+        self.assertIsNone(parser.value())
+
+
+class TestRepairJson(unittest.TestCase):
+    """Test cases for repair_json."""
+
+    def test_code_fence_and_trailing_commas(self):
+        """Test that fences, surrounding prose and trailing commas are tolerated."""
+        text = 'Here you go:\n```json\n{"a": [1, 2,], "b": {"c": "x",},}\n```\nHope this helps.'
+        self.assertEqual(repair_json(text), {"a": [1, 2], "b": {"c": "x"}})
+
+    def test_truncated_output(self):
+        """Test that output cut off mid-object is closed."""
+        self.assertEqual(repair_json('{"title": "T", "key_insights": [{"insight": "A"'), {
+            "title": "T", "key_insights": [{"insight": "A"}],
+        })
+
+    def test_no_json(self):
+        """Test that plain text yields None."""
+        self.assertIsNone(repair_json("Just a plain summary."))
+
+    def test_braces_in_prose_are_ignored(self):
+        """Test that only an object at the start or in a code fence is parsed."""
+        self.assertIsNone(repair_json("In Python, an empty dict {} is falsy. The talk covers config files."))
+        self.assertIsNone(repair_json('Use `{"debug": true}` to enable it.'))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -3,8 +3,20 @@
 import unittest
 from unittest.mock import Mock, patch, MagicMock
 import os
+import shutil
+import tempfile
 
-from youtube_summarizer.llm_client import LLMClient
+import httpx
+import openai
+
+from youtube_summarizer.cache import DiskCache
+from youtube_summarizer.llm_client import (
+    DEFAULT_TIMEOUT,
+    SUMMARY_SCHEMA,
+    WINDOW_SCHEMA,
+    LLMClient,
+    split_transcript,
+)
 
 
 class TestLLMClient(unittest.TestCase):
@@ -17,14 +29,14 @@ class TestLLMClient(unittest.TestCase):
         client = LLMClient(model="gpt-4o-mini")
         self.assertEqual(client.model, "gpt-4o-mini")
         self.assertEqual(client.api_key, "test-key")
-        mock_openai.assert_called_once_with(api_key="test-key")
+        mock_openai.assert_called_once_with(api_key="test-key", timeout=DEFAULT_TIMEOUT, max_retries=0)
 
     @patch('youtube_summarizer.llm_client.OpenAI')
     def test_init_with_provided_key(self, mock_openai):
         """Test initialization with provided API key."""
         client = LLMClient(model="gpt-4", api_key="provided-key")
         self.assertEqual(client.api_key, "provided-key")
-        mock_openai.assert_called_once_with(api_key="provided-key")
+        mock_openai.assert_called_once_with(api_key="provided-key", timeout=DEFAULT_TIMEOUT, max_retries=0)
 
     @patch.dict(os.environ, {}, clear=True)
     def test_init_no_api_key(self):
@@ -95,6 +107,334 @@ class TestLLMClient(unittest.TestCase):
         self.assertEqual(result["format"], "text")
 
 
+class TestLLMClientCache(unittest.TestCase):
+    """Test cases for the summary cache of LLMClient."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.directory = tempfile.mkdtemp()
+        self.cache = DiskCache(self.directory)
+
+    def tearDown(self):
+        """Remove the cache directory."""
+        self.cache.close()
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def _mock_openai(self, mock_openai_class, content='{"summary": "Test summary"}'):
+        mock_client = MagicMock()
+        mock_openai_class.return_value = mock_client
+        mock_response = MagicMock()
+        mock_response.choices = [MagicMock()]
+        mock_response.choices[0].message.content = content
+        mock_client.chat.completions.create.return_value = mock_response
+        return mock_client
+
+    @patch.dict(os.environ, {"OPENAI_API_KEY": "test-key"})
+    @patch('youtube_summarizer.llm_client.OpenAI')
+    def test_cached_summary_skips_api_call(self, mock_openai_class):
+        """Test that an identical request is answered from the cache."""
+        mock_client = self._mock_openai(mock_openai_class)
+
+        first = LLMClient(cache=self.cache).summarize("Test transcript")
+        second = LLMClient(cache=self.cache).summarize("Test transcript")
+
+        self.assertEqual(first, {"summary": "Test summary"})
+        self.assertEqual(second, first)
+        mock_client.chat.completions.create.assert_called_once()
+
+    @patch.dict(os.environ, {"OPENAI_API_KEY": "test-key"})
+    @patch('youtube_summarizer.llm_client.OpenAI')
+    def test_cache_key_includes_model_and_max_tokens(self, mock_openai_class):
+        """Test that a different model or max_tokens is not served from the cache."""
+        mock_client = self._mock_openai(mock_openai_class)
+
+        LLMClient(cache=self.cache).summarize("Test transcript")
+        LLMClient(model="gpt-4", cache=self.cache).summarize("Test transcript")
+        LLMClient(cache=self.cache).summarize("Test transcript", max_tokens=500)
+
+        self.assertEqual(mock_client.chat.completions.create.call_count, 3)
+
+    @patch.dict(os.environ, {"OPENAI_API_KEY": "test-key"})
+    @patch('youtube_summarizer.llm_client.OpenAI')
+    def test_refresh_requeries_and_updates_cache(self, mock_openai_class):
+        """Test that refresh ignores the cached summary and stores the new one."""
+        mock_client = self._mock_openai(mock_openai_class)
+        LLMClient(cache=self.cache).summarize("Test transcript")
+
+        mock_client.chat.completions.create.return_value.choices[0].message.content = '{"summary": "New"}'
+        refreshed = LLMClient(cache=self.cache, refresh=True).summarize("Test transcript")
+        cached = LLMClient(cache=self.cache).summarize("Test transcript")
+
+        self.assertEqual(refreshed, {"summary": "New"})
+        self.assertEqual(cached, {"summary": "New"})
+        self.assertEqual(mock_client.chat.completions.create.call_count, 2)
+
+
+class TestMapReduce(unittest.TestCase):
+    """Test cases for map-reduce summarization of long transcripts."""
+
+    def test_split_transcript_keeps_all_text(self):
+        """Test that windows respect the size and cover the whole transcript."""
+        transcript = " ".join(f"Sentence number {i} is here." for i in range(200))
+        windows = split_transcript(transcript, 500)
+
+        self.assertGreater(len(windows), 1)
+        self.assertTrue(all(len(window) <= 500 for window in windows))
+        self.assertTrue(all(window.endswith(".") for window in windows))
+        self.assertEqual(" ".join(windows), transcript)
+
+    def test_split_transcript_without_spaces(self):
+        """Test hard cuts when there is no boundary to split at."""
+        self.assertEqual(split_transcript("A" * 25, 10), ["A" * 10, "A" * 10, "A" * 5])
+
+    def _mock_openai(self, mock_openai_class):
+        mock_client = MagicMock()
+        mock_openai_class.return_value = mock_client
+        prompts = []
+
+        def create(**kwargs):
+            prompt = kwargs["messages"][1]["content"]
+            prompts.append(prompt)
+            response = MagicMock()
+            response.choices = [MagicMock()]
+            if prompt.startswith("The following JSON objects"):
+                content = '{"title": "Merged", "key_insights": [], "summary": "All parts"}'
+            else:
+                content = '{"key_insights": [{"insight": "part"}], "summary": "Part"}'
+            response.choices[0].message.content = content
+            return response
+
+        mock_client.chat.completions.create.side_effect = create
+        return prompts
+
+    @patch.dict(os.environ, {"OPENAI_API_KEY": "test-key"})
+    @patch('youtube_summarizer.llm_client.OpenAI')
+    def test_long_transcript_is_mapped_and_reduced(self, mock_openai_class):
+        """Test that every window is summarized and merged by one final call."""
+        prompts = self._mock_openai(mock_openai_class)
+        transcript = " ".join(f"Sentence number {i} is here." for i in range(2000))
+
+        client = LLMClient(map_reduce=True, window_tokens=1000)
+        result = client.summarize(transcript)
+
+        self.assertEqual(result["title"], "Merged")
+        window_prompts = [p for p in prompts if p.startswith("The following text is part")]
+        reduce_prompts = [p for p in prompts if p.startswith("The following JSON objects")]
+        self.assertEqual(len(window_prompts), len(split_transcript(transcript, 4000)))
+        self.assertEqual(len(reduce_prompts), 1)
+        self.assertIn("Sentence number 1999 is here.", "".join(window_prompts))
+        self.assertNotIn("[Transcript truncated...]", "".join(prompts))
+
+    @patch.dict(os.environ, {"OPENAI_API_KEY": "test-key"})
+    @patch('youtube_summarizer.llm_client.OpenAI')
+    def test_partials_are_merged_hierarchically(self, mock_openai_class):
+        """Test that partials too large for one merge prompt are merged in rounds."""
+        prompts = self._mock_openai(mock_openai_class)
+        transcript = " ".join(f"Sentence number {i} is here." for i in range(200))
+
+        client = LLMClient(map_reduce=True, window_tokens=20)
+        result = client.summarize(transcript)
+
+        self.assertEqual(result["title"], "Merged")
+        reduce_prompts = [p for p in prompts if p.startswith("The following JSON objects")]
+        self.assertGreater(len(reduce_prompts), 1)
+
+    @patch.dict(os.environ, {"OPENAI_API_KEY": "test-key"})
+    @patch('youtube_summarizer.llm_client.OpenAI')
+    def test_short_transcript_uses_single_prompt(self, mock_openai_class):
+        """Test that a transcript within one window is summarized directly."""
+        prompts = self._mock_openai(mock_openai_class)
+
+        LLMClient(map_reduce=True).summarize("Short transcript.")
+
+        self.assertEqual(len(prompts), 1)
+        self.assertIn("Short transcript.", prompts[0])
+
+
+class TestStreaming(unittest.TestCase):
+    """Test cases for streamed summaries."""
+
+    def _stream_of(self, mock_openai_class, text, size=7):
+        chunks = []
+        for start in range(0, len(text), size):
+            chunk = Mock()
+            chunk.choices = [Mock()]
+            chunk.choices[0].delta.content = text[start:start + size]
+            chunks.append(chunk)
+        mock_client = MagicMock()
+        mock_client.chat.completions.create.return_value = iter(chunks)
+        mock_openai_class.return_value = mock_client
+        return mock_client
+
+    @patch.dict(os.environ, {"OPENAI_API_KEY": "test-key"})
+    @patch('youtube_summarizer.llm_client.OpenAI')
+    def test_partials_grow_until_final_result(self, mock_openai_class):
+        """Test that partial summaries are reported while the JSON streams in."""
+        text = (
+            '{"title": "Test", "key_insights": [{"insight": "First", "certainty": "high"}, '
+            '{"insight": "Second", "certainty": "low"}], "summary": "All done."}'
+        )
+        mock_client = self._stream_of(mock_openai_class, text)
+        partials = []
+
+        result = LLMClient().summarize("Test transcript", on_partial=partials.append)
+
+        self.assertEqual(result["summary"], "All done.")
+        self.assertTrue(mock_client.chat.completions.create.call_args.kwargs["stream"])
+        self.assertIn({"title": "Test"}, partials)
+        self.assertTrue(any(
+            [i.get("insight") for i in p.get("key_insights", [])] == ["First"] for p in partials
+        ))
+        self.assertEqual(partials[-1], result)
+        self.assertEqual(len(partials), len({repr(p) for p in partials}))
+
+    @patch.dict(os.environ, {"OPENAI_API_KEY": "test-key"})
+    @patch('youtube_summarizer.llm_client.OpenAI')
+    def test_text_response_falls_back_to_text_format(self, mock_openai_class):
+        """Test that a non-JSON stream is reported and returned as text."""
+        self._stream_of(mock_openai_class, "- Point one\n- Point two")
+        partials = []
+
+        result = LLMClient().summarize("Test transcript", on_partial=partials.append)
+
+        self.assertEqual(result, {"summary": "- Point one\n- Point two", "format": "text"})
+        self.assertEqual(partials[0]["format"], "text")
+        self.assertEqual(partials[-1], result)
+
+    @patch.dict(os.environ, {"OPENAI_API_KEY": "test-key"})
+    @patch('youtube_summarizer.llm_client.OpenAI')
+    def test_braces_in_text_response_keep_text_format(self, mock_openai_class):
+        """Test that braces in a streamed text summary do not replace it."""
+        text = "{} is falsy in Python. The talk covers config files."
+        self._stream_of(mock_openai_class, text)
+        partials = []
+
+        result = LLMClient().summarize("Test transcript", on_partial=partials.append)
+
+        self.assertEqual(result, {"summary": text, "format": "text"})
+        self.assertEqual(partials[-1], result)
+
+    @patch.dict(os.environ, {"OPENAI_API_KEY": "test-key"})
+    @patch('youtube_summarizer.llm_client.OpenAI')
+    def test_without_callback_does_not_stream(self, mock_openai_class):
+        """Test that summarize without on_partial makes a regular request."""
+        mock_client = MagicMock()
+        mock_client.chat.completions.create.return_value.choices = [Mock()]
+        mock_client.chat.completions.create.return_value.choices[0].message.content = '{"summary": "s"}'
+        mock_openai_class.return_value = mock_client
+
+        LLMClient().summarize("Test transcript")
+
+        self.assertNotIn("stream", mock_client.chat.completions.create.call_args.kwargs)
+
+
+
+class TestStructuredOutput(unittest.TestCase):
+    """Test cases for schema-enforced output and JSON repair."""
+
+    def _client_returning(self, mock_openai_class, *contents, **kwargs):
+        mock_client = MagicMock()
+        responses = []
+        for content in contents:
+            if isinstance(content, Exception):
+                responses.append(content)
+                continue
+            response = MagicMock()
+            response.choices = [Mock()]
+            response.choices[0].message.content = content
+            responses.append(response)
+        mock_client.chat.completions.create.side_effect = responses
+        mock_openai_class.return_value = mock_client
+        return LLMClient(**kwargs), mock_client
+
+    @patch.dict(os.environ, {"OPENAI_API_KEY": "test-key"})
+    @patch('youtube_summarizer.llm_client.OpenAI')
+    def test_structured_mode_sends_schema(self, mock_openai_class):
+        """Test that the summary schema is requested as strict JSON schema."""
+        client, mock_client = self._client_returning(
+            mock_openai_class, '{"title": "T", "key_insights": [], "summary": "S", "uncertainties": []}',
+            structured=True,
+        )
+
+        result = client.summarize("Test transcript")
+
+        self.assertEqual(result["title"], "T")
+        response_format = mock_client.chat.completions.create.call_args.kwargs["response_format"]
+        self.assertEqual(response_format["type"], "json_schema")
+        self.assertEqual(response_format["json_schema"]["name"], SUMMARY_SCHEMA["name"])
+        self.assertTrue(response_format["json_schema"]["strict"])
+        self.assertEqual(
+            set(response_format["json_schema"]["schema"]["required"]),
+            {"title", "key_insights", "summary", "uncertainties"},
+        )
+
+    @patch.dict(os.environ, {"OPENAI_API_KEY": "test-key"})
+    @patch('youtube_summarizer.llm_client.OpenAI')
+    def test_map_windows_use_window_schema(self, mock_openai_class):
+        """Test that windows and the merge request their own schemas."""
+        partial = '{"key_insights": [], "summary": "part", "uncertainties": []}'
+        client, mock_client = self._client_returning(
+            mock_openai_class, partial, partial, '{"title": "T", "summary": "S"}',
+            structured=True, map_reduce=True, window_tokens=10, map_workers=1,
+        )
+
+        client.summarize("First sentence here. Second sentence here.")
+
+        names = [
+            call.kwargs["response_format"]["json_schema"]["name"]
+            for call in mock_client.chat.completions.create.call_args_list
+        ]
+        self.assertEqual(names, [WINDOW_SCHEMA["name"]] * 2 + [SUMMARY_SCHEMA["name"]])
+
+    @patch.dict(os.environ, {"OPENAI_API_KEY": "test-key"})
+    @patch('youtube_summarizer.llm_client.OpenAI')
+    def test_falls_back_when_schema_is_unsupported(self, mock_openai_class):
+        """Test that a provider rejecting response_format is asked again without it, once."""
+        rejection = openai.BadRequestError(
+            "Unsupported parameter: 'response_format'",
+            response=httpx.Response(400, request=httpx.Request("POST", "http://localhost/v1/chat/completions")),
+            body=None,
+        )
+        client, mock_client = self._client_returning(
+            mock_openai_class, rejection, '{"summary": "first"}', '{"summary": "second"}',
+            structured=True,
+        )
+
+        self.assertEqual(client.summarize("one"), {"summary": "first"})
+        self.assertEqual(client.summarize("two"), {"summary": "second"})
+
+        calls = mock_client.chat.completions.create.call_args_list
+        self.assertEqual(len(calls), 3)
+        self.assertIn("response_format", calls[0].kwargs)
+        self.assertNotIn("response_format", calls[1].kwargs)
+        self.assertNotIn("response_format", calls[2].kwargs)
+
+    @patch.dict(os.environ, {"OPENAI_API_KEY": "test-key"})
+    @patch('youtube_summarizer.llm_client.OpenAI')
+    def test_malformed_json_is_repaired(self, mock_openai_class):
+        """Test that fenced, chatty or truncated JSON is parsed instead of kept as text."""
+        client, _ = self._client_returning(
+            mock_openai_class,
+            'Here is the analysis:\n```json\n{"title": "T", "uncertainties": [],}\n```',
+            '{"title": "Cut", "key_insights": [{"insight": "First", "certainty": "hi',
+        )
+
+        self.assertEqual(client.summarize("one"), {"title": "T", "uncertainties": []})
+        truncated = client.summarize("two")
+        self.assertEqual(truncated["title"], "Cut")
+        self.assertEqual(truncated["key_insights"][0]["insight"], "First")
+
+    @patch.dict(os.environ, {"OPENAI_API_KEY": "test-key"})
+    @patch('youtube_summarizer.llm_client.OpenAI')
+    def test_braces_in_prose_stay_text(self, mock_openai_class):
+        """Test that prose mentioning JSON is not repaired into an empty summary."""
+        prose = "In Python, an empty dict {} is falsy. The talk covers config files."
+        client, _ = self._client_returning(mock_openai_class, prose, "{} is falsy, says the talk.")
+
+        self.assertEqual(client.summarize("one"), {"summary": prose, "format": "text"})
+        self.assertEqual(client.summarize("two")["format"], "text")
+
+
 if __name__ == "__main__":
     unittest.main()
 
@@ -0,0 +1,80 @@
+"""Unit tests for caption normalization."""
+
+import unittest
+
+from youtube_summarizer.normalize import estimate_tokens, normalize_transcript
+
+
+class TestNormalizeTranscript(unittest.TestCase):
+    """Test cases for normalize_transcript."""
+
+    def test_removes_non_speech_tags(self):
+        """Test that sound annotations and speaker marks are dropped."""
+        result = normalize_transcript(
+            "[Music] hello there (applause) >> welcome ♪ la la la ♪ back [Laughter]"
+        )
+        self.assertEqual(result.text, "hello there welcome back")
+
+    def test_keeps_ordinary_parentheses(self):
+        """Test that parenthesized speech is not mistaken for a tag."""
+        result = normalize_transcript("the result (in percent) is ten")
+        self.assertEqual(result.text, "the result (in percent) is ten")
+
+    def test_removes_filler_words(self):
+        """Test that filler words are dropped regardless of case and punctuation."""
+        result = normalize_transcript("Um, so uh we begin, hmm... now")
+        self.assertEqual(result.text, "so we begin, now")
+
+    def test_filler_words_depend_on_language(self):
+        """Test that English fillers that are real words elsewhere are kept."""
+        text = "Er sagt, er hat ah keine Zeit. Hmm, das ist er."
+        self.assertEqual(normalize_transcript(text, "de").text, "Er sagt, er hat ah keine Zeit. das ist er.")
+        self.assertEqual(normalize_transcript("Er is er een, umm, probleem", "nl").text, "Er is er een, probleem")
+        self.assertEqual(normalize_transcript("so uh, we begin", "en-GB").text, "so we begin")
+
+    def test_collapses_rolling_caption_repeats(self):
+        """Test that phrases repeated by rolling auto-captions are kept once."""
+        result = normalize_transcript(
+            "today we are going to talk about today we are going to talk about caching"
+        )
+        self.assertEqual(result.text, "today we are going to talk about caching")
+
+    def test_collapses_repeats_ignoring_case_and_punctuation(self):
+        """Test that repeats differing only in case or punctuation are collapsed."""
+        result = normalize_transcript("and then we go. And then we go, home")
+        self.assertEqual(result.text, "and then we go. home")
+
+    def test_keeps_single_repeated_words(self):
+        """Test that intended single-word repeats survive."""
+        result = normalize_transcript("it was very very good")
+        self.assertEqual(result.text, "it was very very good")
+
+    def test_collapses_whitespace(self):
+        """Test that line breaks and runs of spaces become single spaces."""
+        result = normalize_transcript("  one\n\ntwo\t three   ")
+        self.assertEqual(result.text, "one two three")
+
+    def test_reports_tokens_saved(self):
+        """Test the token estimates of the result."""
+        text = "[Music] " * 50 + "actual content"
+        result = normalize_transcript(text)
+        self.assertEqual(result.text, "actual content")
+        self.assertEqual(result.tokens_before, estimate_tokens(text))
+        self.assertEqual(result.tokens_after, estimate_tokens("actual content"))
+        self.assertEqual(result.tokens_saved, result.tokens_before - result.tokens_after)
+
+    def test_empty_input(self):
+        """Test that empty text normalizes to empty text."""
+        result = normalize_transcript("")
+        self.assertEqual(result.text, "")
+        self.assertEqual(result.tokens_saved, 0)
+
+    def test_runs_in_linear_time(self):
+        """Test that long repetitive input is processed quickly."""
+        text = "we we we go go go " * 20000
+        result = normalize_transcript(text)
+        self.assertLess(len(result.text), 100)
+
+
+if __name__ == "__main__":
+    unittest.main()
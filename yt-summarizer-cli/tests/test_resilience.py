@@ -0,0 +1,251 @@
+"""Unit tests for retries, timeouts and the circuit breaker of LLM calls."""
+
+import json
+import os
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+from youtube_summarizer.llm_client import MAX_RETRY_AFTER, LLMClient
+from youtube_summarizer.resilience import CallStats, CircuitBreaker, CircuitOpenError
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class FaultyChatAPI(ThreadingHTTPServer):
+    """Chat completions endpoint that fails on demand."""
+
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), FaultyChatHandler)
+        self.base = f"http://127.0.0.1:{self.server_address[1]}/v1"
+        self.lock = threading.Lock()
+        self.requests = 0
+        # Faults for the next requests: (status, headers, delay in seconds)
+        self.faults = []
+
+
+class FaultyChatHandler(BaseHTTPRequestHandler):
+    """Answers with the next scripted fault, or with a summary."""
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_POST(self):
+        server = self.server
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        with server.lock:
+            server.requests += 1
+            status, headers, delay = server.faults.pop(0) if server.faults else (200, {}, 0)
+        if delay:
+            threading.Event().wait(delay)
+        if status == 200:
+            body = {
+                "id": "chatcmpl-1",
+                "object": "chat.completion",
+                "created": 0,
+                "model": "gpt-4o-mini",
+                "choices": [{
+                    "index": 0,
+                    "finish_reason": "stop",
+                    "message": {"role": "assistant", "content": '{"summary": "ok"}'},
+                }],
+            }
+        else:
+            body = {"error": {"message": f"injected {status}", "type": "fault"}}
+        data = json.dumps(body).encode("utf-8")
+        try:
+            self.send_response(status)
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+        except OSError:
+            pass  # the client gave up (timeout)
+
+
+class TestLLMClientResilience(unittest.TestCase):
+    """Test cases for LLMClient retries against a fault-injecting server."""
+
+    def setUp(self):
+        """Start the fake server and point the OpenAI client at it."""
+        self.server = FaultyChatAPI()
+        thread = threading.Thread(target=self.server.serve_forever, args=(0.05,), daemon=True)
+        thread.start()
+        patcher = patch.dict(os.environ, {"OPENAI_API_KEY": "test-key", "OPENAI_BASE_URL": self.server.base})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        sleeper = patch("youtube_summarizer.llm_client.time.sleep")
+        self.sleep = sleeper.start()
+        self.addCleanup(sleeper.stop)
+        self.clock = FakeClock()
+
+    def tearDown(self):
+        """Stop the fake server."""
+        self.server.shutdown()
+        self.server.server_close()
+
+    def _client(self, **kwargs):
+        kwargs.setdefault("breaker", CircuitBreaker(failure_threshold=5, reset_timeout=30, clock=self.clock))
+        return LLMClient(**kwargs)
+
+    def test_transient_errors_are_retried_honoring_retry_after(self):
+        """Test that 429 and 5xx responses are retried."""
+        self.server.faults = [(429, {"Retry-After": "2"}, 0), (503, {}, 0)]
+        client = self._client(backoff=0.5)
+
+        result = client.summarize("transcript")
+
+        self.assertEqual(result, {"summary": "ok"})
+        self.assertEqual(self.server.requests, 3)
+        delays = [call.args[0] for call in self.sleep.call_args_list]
+        self.assertEqual(delays[0], 2.0)
+        self.assertLessEqual(delays[1], 1.0)  # jittered 0.5 * 2 ** 1
+        stats = client.stats.snapshot()
+        self.assertEqual((stats["calls"], stats["failures"], stats["retries"]), (3, 2, 2))
+        self.assertGreater(stats["latency_max"], 0)
+
+    def test_timeouts_are_retried(self):
+        """Test that a call exceeding the timeout is abandoned and retried."""
+        self.server.faults = [(200, {}, 1.0)]
+        client = self._client(timeout=0.2)
+
+        self.assertEqual(client.summarize("transcript"), {"summary": "ok"})
+        stats = client.stats.snapshot()
+        self.assertEqual((stats["timeouts"], stats["retries"]), (1, 1))
+
+    def test_client_errors_are_not_retried(self):
+        """Test that a 400 fails at once and does not count against the endpoint."""
+        self.server.faults = [(400, {}, 0)]
+        client = self._client()
+
+        with self.assertRaises(ValueError) as context:
+            client.summarize("transcript")
+
+        self.assertIn("injected 400", str(context.exception))
+        self.assertEqual(self.server.requests, 1)
+        self.assertEqual(client.breaker.state, "closed")
+
+    def test_retries_are_limited(self):
+        """Test that the last error is raised once retries are exhausted."""
+        self.server.faults = [(500, {}, 0)] * 5
+        client = self._client(retries=2)
+
+        with self.assertRaises(ValueError):
+            client.summarize("transcript")
+        self.assertEqual(self.server.requests, 3)
+
+    def test_circuit_breaker_sheds_load_and_recovers(self):
+        """Test that a degraded endpoint is not called until the reset timeout."""
+        self.server.faults = [(503, {}, 0)] * 3
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=30, clock=self.clock)
+        client = self._client(breaker=breaker)
+
+        with self.assertRaises(ValueError) as context:
+            client.summarize("first")
+        self.assertIn("circuit open", str(context.exception))
+        self.assertEqual(self.server.requests, 2)
+
+        # Later calls fail fast without reaching the server
+        with self.assertRaises(ValueError):
+            client.summarize("second")
+        self.assertEqual(self.server.requests, 2)
+        self.assertEqual(client.stats.snapshot()["rejected"], 2)
+
+        # After the reset timeout one probe goes through; it fails, so the circuit reopens
+        self.clock.now = 31
+        with self.assertRaises(ValueError):
+            client.summarize("third")
+        self.assertEqual(self.server.requests, 3)
+        self.assertEqual(breaker.state, "open")
+
+        self.clock.now = 62
+        self.assertEqual(client.summarize("fourth"), {"summary": "ok"})
+        self.assertEqual(breaker.state, "closed")
+
+    def test_retry_delay(self):
+        """Test jittered, capped backoff and the cap on Retry-After."""
+        client = self._client(backoff=1.0, max_backoff=4.0)
+        delays = [client.retry_delay(attempt) for attempt in range(10) for _ in range(20)]
+        self.assertTrue(all(0 <= delay <= 4.0 for delay in delays))
+        self.assertGreater(len(set(delays)), 1)
+        self.assertEqual(client.retry_delay(0, retry_after=3600), MAX_RETRY_AFTER)
+        self.assertEqual(client.retry_delay(0, retry_after=-5), 0.0)
+
+
+class TestCircuitBreaker(unittest.TestCase):
+    """Test cases for CircuitBreaker."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.clock = FakeClock()
+        self.breaker = CircuitBreaker(failure_threshold=3, reset_timeout=10, clock=self.clock)
+
+    def test_opens_after_consecutive_failures(self):
+        """Test that only consecutive failures open the circuit."""
+        self.breaker.record_failure()
+        self.breaker.record_failure()
+        self.breaker.record_success()
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, "closed")
+        self.breaker.record_failure()
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, "open")
+        with self.assertRaises(CircuitOpenError):
+            self.breaker.before_call()
+
+    def test_half_open_allows_a_single_probe(self):
+        """Test that only one call probes the endpoint after the reset timeout."""
+        for _ in range(3):
+            self.breaker.record_failure()
+        self.clock.now = 10
+        self.assertEqual(self.breaker.state, "half_open")
+
+        self.breaker.before_call()
+        with self.assertRaises(CircuitOpenError):
+            self.breaker.before_call()
+
+        self.breaker.record_success()
+        self.assertEqual(self.breaker.state, "closed")
+        self.breaker.before_call()
+
+
+class TestCallStats(unittest.TestCase):
+    """Test cases for CallStats."""
+
+    def test_snapshot(self):
+        """Test the counters and the derived average latency."""
+        stats = CallStats()
+        stats.record_call(0.5)
+        stats.record_call(1.5, failed=True, timed_out=True)
+        stats.record_retry()
+        stats.record_rejected()
+
+        self.assertEqual(stats.snapshot(), {
+            "calls": 2,
+            "failures": 1,
+            "timeouts": 1,
+            "retries": 1,
+            "rejected": 1,
+            "latency_total": 2.0,
+            "latency_max": 1.5,
+            "latency_avg": 1.0,
+        })
+
+
+if __name__ == "__main__":
+    unittest.main()
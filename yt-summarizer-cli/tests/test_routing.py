@@ -0,0 +1,174 @@
+"""Unit tests for model routing."""
+
+import os
+import unittest
+from unittest.mock import MagicMock, Mock, patch
+
+from youtube_summarizer.llm_client import SUMMARY_SCHEMA, LLMClient, matches_schema
+from youtube_summarizer.routing import ModelRouter, ModelTier, parse_tiers
+
+
+VALID = '{"title": "T", "key_insights": [], "summary": "S", "uncertainties": []}'
+
+
+class TestParseTiers(unittest.TestCase):
+    """Test cases for parse_tiers."""
+
+    def test_parse_tiers(self):
+        """Test limits, models and optional max_tokens."""
+        self.assertEqual(
+            parse_tiers("4000=gpt-4o-mini:600, 30000=gpt-4o-mini ,*=gpt-4o:1500"),
+            [
+                ModelTier(4000, "gpt-4o-mini", 600),
+                ModelTier(30000, "gpt-4o-mini", None),
+                ModelTier(None, "gpt-4o", 1500),
+            ],
+        )
+
+    def test_model_names_with_colons(self):
+        """Test that fine-tuned model names keep their colons."""
+        self.assertEqual(
+            parse_tiers("*=ft:gpt-4o-mini:org::abc123"),
+            [ModelTier(None, "ft:gpt-4o-mini:org::abc123", None)],
+        )
+        self.assertEqual(
+            parse_tiers("*=ft:gpt-4o-mini:org::abc123:800"),
+            [ModelTier(None, "ft:gpt-4o-mini:org::abc123", 800)],
+        )
+
+    def test_invalid_tables(self):
+        """Test malformed entries and unordered limits."""
+        for spec in ("gpt-4o", "4000=", "four=gpt-4o", "8000=a,4000=b", "*=a,4000=b"):
+            with self.subTest(spec=spec):
+                with self.assertRaises(ValueError):
+                    parse_tiers(spec)
+
+
+class TestModelRouter(unittest.TestCase):
+    """Test cases for ModelRouter."""
+
+    def test_select(self):
+        """Test that the first tier whose limit is not exceeded is chosen."""
+        router = ModelRouter(parse_tiers("1000=small,5000=medium"))
+        self.assertEqual(router.select(10), 0)
+        self.assertEqual(router.select(1000), 0)
+        self.assertEqual(router.select(1001), 1)
+        self.assertEqual(router.select(99999), 1)  # above every limit: last tier
+
+    def test_requires_tiers(self):
+        """Test that an empty table is rejected."""
+        with self.assertRaises(ValueError):
+            ModelRouter([])
+
+    def test_snapshot(self):
+        """Test the per-model and escalation counters."""
+        router = ModelRouter(parse_tiers("*=small"))
+        router.record("small")
+        router.record("large", escalations=1)
+        router.record("small")
+        self.assertEqual(router.snapshot(), {"models": {"small": 2, "large": 1}, "escalations": 1})
+
+
+class TestMatchesSchema(unittest.TestCase):
+    """Test cases for matches_schema."""
+
+    def test_summary_schema(self):
+        """Test required fields, types and enums of the summary schema."""
+        schema = SUMMARY_SCHEMA["schema"]
+        insight = {"insight": "I", "explanation": "E", "certainty": "high"}
+        valid = {"title": "T", "key_insights": [insight], "summary": "S", "uncertainties": []}
+
+        self.assertTrue(matches_schema(valid, schema))
+        self.assertTrue(matches_schema({**valid, "extra": 1}, schema))
+        self.assertFalse(matches_schema({"summary": "text", "format": "text"}, schema))
+        self.assertFalse(matches_schema({**valid, "key_insights": "none"}, schema))
+        self.assertFalse(matches_schema({**valid, "key_insights": [{**insight, "certainty": "sure"}]}, schema))
+        self.assertFalse(matches_schema([valid], schema))
+
+
+class TestLLMClientRouting(unittest.TestCase):
+    """Test cases for routing in LLMClient."""
+
+    def _client(self, mock_openai_class, contents, tiers, escalate=False):
+        mock_client = MagicMock()
+        responses = []
+        for content in contents:
+            response = MagicMock()
+            response.choices = [Mock()]
+            response.choices[0].message.content = content
+            responses.append(response)
+        mock_client.chat.completions.create.side_effect = responses
+        mock_openai_class.return_value = mock_client
+        router = ModelRouter(parse_tiers(tiers), escalate=escalate)
+        return LLMClient(router=router), mock_client
+
+    def _models(self, mock_client):
+        return [call.kwargs["model"] for call in mock_client.chat.completions.create.call_args_list]
+
+    @patch.dict(os.environ, {"OPENAI_API_KEY": "test-key"})
+    @patch('youtube_summarizer.llm_client.OpenAI')
+    def test_model_and_max_tokens_follow_transcript_size(self, mock_openai_class):
+        """Test that short and long transcripts go to different tiers."""
+        client, mock_client = self._client(
+            mock_openai_class, [VALID, VALID], "100=small:300,*=large:1500"
+        )
+
+        client.summarize("short clip")
+        client.summarize("word " * 200)
+
+        self.assertEqual(self._models(mock_client), ["small", "large"])
+        max_tokens = [call.kwargs["max_tokens"] for call in mock_client.chat.completions.create.call_args_list]
+        self.assertEqual(max_tokens, [300, 1500])
+        self.assertEqual(client.router.snapshot(), {"models": {"small": 1, "large": 1}, "escalations": 0})
+
+    @patch.dict(os.environ, {"OPENAI_API_KEY": "test-key"})
+    @patch('youtube_summarizer.llm_client.OpenAI')
+    def test_tier_without_max_tokens_uses_callers(self, mock_openai_class):
+        """Test that max_tokens falls back to the summarize argument."""
+        client, mock_client = self._client(mock_openai_class, [VALID], "*=small")
+
+        client.summarize("clip", max_tokens=700)
+
+        self.assertEqual(mock_client.chat.completions.create.call_args.kwargs["max_tokens"], 700)
+
+    @patch.dict(os.environ, {"OPENAI_API_KEY": "test-key"})
+    @patch('youtube_summarizer.llm_client.OpenAI')
+    def test_invalid_summary_escalates(self, mock_openai_class):
+        """Test that a summary failing the schema is redone on the next tier."""
+        client, mock_client = self._client(
+            mock_openai_class, ["Just some bullet points", VALID], "100=small,1000=medium,*=large", escalate=True
+        )
+
+        result = client.summarize("short clip")
+
+        self.assertEqual(result["title"], "T")
+        self.assertEqual(self._models(mock_client), ["small", "medium"])
+        self.assertEqual(client.router.snapshot(), {"models": {"medium": 1}, "escalations": 1})
+
+    @patch.dict(os.environ, {"OPENAI_API_KEY": "test-key"})
+    @patch('youtube_summarizer.llm_client.OpenAI')
+    def test_no_escalation_without_flag_or_beyond_last_tier(self, mock_openai_class):
+        """Test that invalid summaries are returned when escalation is off or exhausted."""
+        client, mock_client = self._client(mock_openai_class, ["text"], "100=small,*=large")
+        self.assertEqual(client.summarize("clip")["format"], "text")
+        self.assertEqual(self._models(mock_client), ["small"])
+
+        client, mock_client = self._client(mock_openai_class, ["text"], "100=small,*=large", escalate=True)
+        self.assertEqual(client.summarize("word " * 200)["format"], "text")
+        self.assertEqual(self._models(mock_client), ["large"])
+
+    @patch.dict(os.environ, {"OPENAI_API_KEY": "test-key"})
+    @patch('youtube_summarizer.llm_client.OpenAI')
+    def test_batch_requests_are_routed(self, mock_openai_class):
+        """Test that Batch API requests use the tier of their transcript."""
+        client, _ = self._client(mock_openai_class, [], "100=small:300,*=large")
+
+        short = client.batch_request("a", "short clip")
+        long = client.batch_request("b", "word " * 200, max_tokens=900)
+
+        self.assertEqual((short["body"]["model"], short["body"]["max_tokens"]), ("small", 300))
+        self.assertEqual((long["body"]["model"], long["body"]["max_tokens"]), ("large", 900))
+
+
+if __name__ == "__main__":
+    unittest.main()
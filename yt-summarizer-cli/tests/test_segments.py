@@ -0,0 +1,102 @@
+"""Unit tests for the timestamped segment store."""
+
+import unittest
+from unittest.mock import MagicMock, patch
+
+from youtube_summarizer.segments import Segment, TranscriptSegments
+from youtube_summarizer.transcript import TranscriptExtractor
+
+
+class TestTranscriptSegments(unittest.TestCase):
+    """Test cases for TranscriptSegments."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.segments = TranscriptSegments.from_entries([
+            {"text": "Hello", "start": 0.0, "duration": 1.5},
+            {"text": "  ", "start": 1.5, "duration": 0.5},
+            {"text": "wonderful", "start": 2.0, "duration": 2.0},
+            {"text": "world ", "start": 4.0, "duration": 1.0},
+        ])
+
+    def test_text_matches_joined_segments(self):
+        """Test that the text is the non-empty segments joined by spaces."""
+        self.assertEqual(self.segments.text, "Hello wonderful world")
+        self.assertEqual(len(self.segments), 3)
+        self.assertEqual(self.segments[1], Segment("wonderful", 2.0, 2.0, 6))
+        self.assertEqual(self.segments[-1].text, "world")
+        self.assertEqual([s.text for s in self.segments], ["Hello", "wonderful", "world"])
+        self.assertEqual(self.segments.duration, 5.0)
+
+    def test_time_to_offset(self):
+        """Test lookup of the text offset playing at a time."""
+        self.assertEqual(self.segments.offset_at_time(0.0), 0)
+        self.assertEqual(self.segments.offset_at_time(1.9), 0)
+        self.assertEqual(self.segments.offset_at_time(2.0), 6)
+        self.assertEqual(self.segments.offset_at_time(100.0), 16)
+        self.assertEqual(self.segments.offset_at_time(-1.0), 0)
+
+    def test_offset_to_time_and_span(self):
+        """Test lookup of timestamps for text offsets and slices."""
+        text = self.segments.text
+        self.assertEqual(self.segments.time_at_offset(text.index("wonderful") + 3), 2.0)
+        self.assertEqual(self.segments.time_at_offset(len(text) - 1), 4.0)
+        self.assertEqual(self.segments.time_span(0, text.index("world")), (0.0, 4.0))
+        self.assertEqual(self.segments.time_span(text.index("wonderful"), len(text)), (2.0, 5.0))
+
+    def test_object_entries_and_unsorted_input(self):
+        """Test snippet objects and entries out of time order."""
+        late = MagicMock(text="second", start=3.0, duration=1.0)
+        early = MagicMock(text="first", start=1.0, duration=1.0)
+        segments = TranscriptSegments.from_entries([late, early])
+        self.assertEqual(segments.text, "first second")
+        self.assertEqual(segments.offset_at_time(3.5), 6)
+
+    def test_empty(self):
+        """Test a transcript without segments."""
+        segments = TranscriptSegments.from_entries([])
+        self.assertEqual(segments.text, "")
+        self.assertEqual(segments.duration, 0.0)
+        with self.assertRaises(IndexError):
+            segments.offset_at_time(1.0)
+
+
+class TestFetchSegments(unittest.TestCase):
+    """Test cases for TranscriptExtractor.fetch_segments."""
+
+    @patch('youtube_summarizer.transcript.YouTubeTranscriptApi')
+    def test_fetch_segments_keeps_timings(self, mock_api_class):
+        """Test that fetched segments keep their start and duration."""
+        transcript = MagicMock()
+        transcript.language_code = "en"
+        transcript.is_generated = False
+        transcript.fetch.return_value = [
+            {"text": "Hello", "start": 0.0, "duration": 1.0},
+            {"text": "world", "start": 61.0, "duration": 2.0},
+        ]
+        mock_api_class.return_value.list.return_value = [transcript]
+
+        segments = TranscriptExtractor().fetch_segments("video", language="en")
+
+        self.assertEqual(segments.text, "Hello world")
+        self.assertEqual(segments[1].start, 61.0)
+        self.assertEqual(segments.time_at_offset(segments.text.index("world")), 61.0)
+        self.assertEqual(segments.language_code, "en")
+
+    @patch('youtube_summarizer.transcript.YouTubeTranscriptApi')
+    def test_fetch_segments_reports_the_fallback_language(self, mock_api_class):
+        """Test that the language of a fallback transcript is reported."""
+        transcript = MagicMock()
+        transcript.language_code = "de"
+        transcript.is_generated = False
+        transcript.fetch.return_value = [{"text": "Hallo", "start": 0.0, "duration": 1.0}]
+        mock_api_class.return_value.list.return_value = [transcript]
+
+        segments = TranscriptExtractor().fetch_segments("video", language="en")
+
+        self.assertEqual(segments.text, "Hallo")
+        self.assertEqual(segments.language_code, "de")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+"""Startup-time tests for the CLI (run in fresh interpreters)."""
+
+import os
+import subprocess
+import sys
+import unittest
+
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Dependencies that must only be imported on the code paths that use them
+HEAVY_MODULES = ("openai", "rich", "requests", "youtube_transcript_api")
+
+# Cumulative import time of youtube_summarizer.cli in microseconds. Importing
+# openai alone takes several hundred milliseconds, so this catches a
+# regression to eager imports while leaving room for slow machines.
+IMPORT_BUDGET_US = 150000
+
+
+def _import_times(*args):
+    """Run Python with -X importtime and return ({module: cumulative µs}, process)."""
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", *args],
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        text=True,
+        timeout=60,
+    )
+    times = {}
+    for line in process.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|", 2)
+        if cumulative.strip().isdigit():
+            times[name.strip()] = int(cumulative)
+    return times, process
+
+
+def _heavy(modules):
+    return sorted(
+        name for name in modules
+        if any(name == heavy or name.startswith(heavy + ".") for heavy in HEAVY_MODULES)
+    )
+
+
+class TestStartup(unittest.TestCase):
+    """Test cases for lazy imports in the CLI."""
+
+    def test_help_does_not_import_heavy_dependencies(self):
+        """Test that --help loads none of openai, rich, requests or the transcript API."""
+        times, process = _import_times("-m", "youtube_summarizer.cli", "--help")
+        self.assertEqual(process.returncode, 0, process.stderr)
+        self.assertIn("--url", process.stdout)
+        self.assertEqual(_heavy(times), [])
+
+    def test_raw_path_does_not_import_openai_or_markdown(self):
+        """Test that the modules used by --raw do not load openai or rich.markdown."""
+        times, process = _import_times(
+            "-c",
+            "import youtube_summarizer.cli, youtube_summarizer.transcript, youtube_summarizer.formatter",
+        )
+        self.assertEqual(process.returncode, 0, process.stderr)
+        self.assertFalse([name for name in times if name.split(".")[0] == "openai"])
+        self.assertNotIn("rich.markdown", times)
+
+    def test_import_time_budget(self):
+        """Test that importing the CLI module stays within the startup budget."""
+        best = None
+        for _ in range(3):
+            times, process = _import_times("-c", "import youtube_summarizer.cli")
+            self.assertEqual(process.returncode, 0, process.stderr)
+            cumulative = times["youtube_summarizer.cli"]
+            best = cumulative if best is None else min(best, cumulative)
+        self.assertLess(best, IMPORT_BUDGET_US, f"import took {best} µs")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -3,7 +3,7 @@
 import unittest
 from unittest.mock import Mock, patch, MagicMock
 
-from youtube_summarizer.transcript import TranscriptExtractor
+from youtube_summarizer.transcript import TranscriptExtractor, TranscriptIndex
 
 
 class TestTranscriptExtractor(unittest.TestCase):
@@ -74,36 +74,105 @@ class TestTranscriptExtractor(unittest.TestCase):
         """Test successful transcript fetching."""
         # Mock transcript data
         mock_transcript = MagicMock()
+        mock_transcript.language_code = "en"
+        mock_transcript.is_generated = False
         mock_transcript.fetch.return_value = [
             {"text": "Hello", "start": 0.0},
             {"text": "world", "start": 1.0},
         ]
         
-        mock_transcript_list = MagicMock()
-        mock_transcript_list.find_transcript.return_value = mock_transcript
-        mock_api.list_transcripts.return_value = mock_transcript_list
+        mock_api.return_value.list.return_value = [mock_transcript]
         
         extractor = TranscriptExtractor()
         result = extractor.fetch_transcript("test_video_id", language="en")
         
         self.assertEqual(result, "Hello world")
-        mock_api.list_transcripts.assert_called_once_with("test_video_id")
+        mock_api.return_value.list.assert_called_once_with("test_video_id")
+
+    @patch('youtube_summarizer.transcript.YouTubeTranscriptApi')
+    def test_session_with_old_api(self, mock_api):
+        """Test that an API without the http_client argument (before 1.0) still works."""
+        def old_api(*args, **kwargs):
+            if kwargs:
+                raise TypeError("__init__() got an unexpected keyword argument 'http_client'")
+            return MagicMock()
+        mock_api.side_effect = old_api
+        
+        extractor = TranscriptExtractor(http_client=MagicMock())
+        
+        self.assertFalse(extractor.shares_session)
+        mock_api.side_effect = None
+        self.assertTrue(TranscriptExtractor(http_client=MagicMock()).shares_session)
 
     @patch('youtube_summarizer.transcript.YouTubeTranscriptApi')
     def test_fetch_transcript_no_transcript_found(self, mock_api):
         """Test handling when no transcript is found."""
-        from youtube_transcript_api._errors import NoTranscriptFound
-        
-        mock_transcript_list = MagicMock()
-        mock_transcript_list.find_transcript.side_effect = NoTranscriptFound(
-            "test_video_id", ["en"], None, None
-        )
-        mock_api.list_transcripts.return_value = mock_transcript_list
+        mock_api.return_value.list.return_value = []
         
         extractor = TranscriptExtractor()
         with self.assertRaises(ValueError):
             extractor.fetch_transcript("test_video_id", language="en")
 
+    @patch('youtube_summarizer.transcript.YouTubeTranscriptApi')
+    def test_languages_then_fetch_lists_once(self, mock_api):
+        """Test that listing languages and fetching share one listing call."""
+        manual = _transcript("de", generated=False)
+        generated = _transcript("en", generated=True)
+        mock_api.return_value.list.return_value = [manual, generated]
+        
+        extractor = TranscriptExtractor()
+        languages = extractor.get_available_languages("test_video_id")
+        result = extractor.fetch_transcript("test_video_id", language="en")
+        
+        self.assertEqual([lang["code"] for lang in languages], ["de", "en", "fr"])
+        self.assertEqual(languages[2]["type"], "translation")
+        self.assertEqual(result, "en text")
+        mock_api.return_value.list.assert_called_once_with("test_video_id")
+        manual.fetch.assert_not_called()
+        generated.fetch.assert_called_once()
+
+
+def _transcript(code, generated=False):
+    transcript = MagicMock()
+    transcript.language_code = code
+    transcript.language = code.upper()
+    transcript.is_generated = generated
+    transcript.is_translatable = not generated
+    transcript.translation_languages = [{"language_code": "fr", "language": "French"}] if not generated else []
+    transcript.fetch.return_value = [{"text": f"{code} text", "start": 0.0, "duration": 1.0}]
+    return transcript
+
+
+class TestTranscriptIndex(unittest.TestCase):
+    """Test cases for TranscriptIndex."""
+
+    def test_exact_match_prefers_manual(self):
+        """Test that an exact code wins and manual beats generated."""
+        generated = _transcript("en", generated=True)
+        manual = _transcript("en", generated=False)
+        regional = _transcript("en-GB", generated=False)
+        index = TranscriptIndex([regional, generated, manual])
+        self.assertIs(index.match("en"), manual)
+
+    def test_prefix_matching(self):
+        """Test regional variants and parent languages."""
+        us = _transcript("en-US", generated=True)
+        gb = _transcript("en-GB", generated=False)
+        pt = _transcript("pt", generated=True)
+        index = TranscriptIndex([us, gb, pt])
+        self.assertIs(index.match("en"), gb)
+        self.assertIs(index.match("pt-BR"), pt)
+        self.assertIsNone(index.match("es"))
+        self.assertIsNone(index.match("e"))
+
+    def test_resolve_fallbacks(self):
+        """Test preferred languages, then manual, then generated transcripts."""
+        generated = _transcript("ja", generated=True)
+        manual = _transcript("ko", generated=False)
+        self.assertIs(TranscriptIndex([generated, manual]).resolve(["ko", "ja"]), manual)
+        self.assertIs(TranscriptIndex([generated, manual]).resolve(["en"]), manual)
+        self.assertIs(TranscriptIndex([generated]).resolve(["en"]), generated)
+        self.assertIsNone(TranscriptIndex([]).resolve(["en"]))
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,76 @@
+"""Unit tests for bulk video ID extraction."""
+
+import unittest
+
+from youtube_summarizer.video_ids import extract_video_ids, parse_video_id
+
+
+class TestParseVideoId(unittest.TestCase):
+    """Test cases for parse_video_id."""
+
+    def test_supported_url_forms(self):
+        """Test every supported host and path form."""
+        urls = [
+            "https://www.youtube.com/watch?v=dQw4w9WgXcQ",
+            "https://youtube.com/watch?feature=share&v=dQw4w9WgXcQ&t=42s",
+            "http://m.youtube.com/watch?v=dQw4w9WgXcQ",
+            "https://music.youtube.com/watch?v=dQw4w9WgXcQ&list=RDAMVM",
+            "https://youtu.be/dQw4w9WgXcQ?si=abc",
+            "https://www.youtube.com/embed/dQw4w9WgXcQ",
+            "https://www.youtube-nocookie.com/embed/dQw4w9WgXcQ?rel=0",
+            "https://www.youtube.com/v/dQw4w9WgXcQ",
+            "https://www.youtube.com/shorts/dQw4w9WgXcQ",
+            "https://m.youtube.com/shorts/dQw4w9WgXcQ?feature=share",
+            "https://www.youtube.com/live/dQw4w9WgXcQ",
+            "www.youtube.com/watch?v=dQw4w9WgXcQ#t=10",
+            "2024-05-01 GET /r?u=https://youtu.be/dQw4w9WgXcQ 200",
+            "https://www.YouTube.com/watch?v=dQw4w9WgXcQ",
+            "HTTPS://M.YOUTUBE.COM/shorts/dQw4w9WgXcQ",
+            "https://YOUTU.BE/dQw4w9WgXcQ",
+        ]
+        for url in urls:
+            with self.subTest(url=url):
+                self.assertEqual(parse_video_id(url), "dQw4w9WgXcQ")
+
+    def test_non_video_urls(self):
+        """Test inputs without a video URL."""
+        for url in [
+            "https://example.com/video",
+            "https://www.youtube.com/playlist?list=PL123",
+            "https://www.youtube.com/watch?v=short",
+            "https://www.youtube.com/watch?v=dQw4w9WgXcQextra",
+            "https://www.youtube.com/@channel",
+            "",
+        ]:
+            with self.subTest(url=url):
+                self.assertIsNone(parse_video_id(url))
+
+
+class TestExtractVideoIds(unittest.TestCase):
+    """Test cases for extract_video_ids."""
+
+    def test_deduplicates_in_input_order(self):
+        """Test streaming deduplication and skipping of invalid lines."""
+        lines = [
+            "https://youtu.be/aaaaaaaaaaa",
+            "not a url",
+            "https://www.youtube.com/shorts/bbbbbbbbbbb",
+            "https://m.youtube.com/watch?v=aaaaaaaaaaa",
+            "https://www.youtube-nocookie.com/embed/ccccccccccc",
+        ]
+        self.assertEqual(
+            list(extract_video_ids(lines)), ["aaaaaaaaaaa", "bbbbbbbbbbb", "ccccccccccc"]
+        )
+        self.assertEqual(len(list(extract_video_ids(lines, unique=False))), 4)
+
+    def test_consumes_input_lazily(self):
+        """Test that IDs are produced before the input is exhausted."""
+        def lines():
+            yield "https://youtu.be/aaaaaaaaaaa"
+            raise AssertionError("input read too far")
+
+        self.assertEqual(next(extract_video_ids(lines())), "aaaaaaaaaaa")
+
+
+if __name__ == "__main__":
+    unittest.main()
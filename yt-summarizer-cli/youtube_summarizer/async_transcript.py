@@ -0,0 +1,210 @@
+"""Module for fetching many transcripts concurrently."""
+
+import asyncio
+import functools
+import random
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, List, Optional, Union
+
+import requests
+from requests.adapters import HTTPAdapter
+from youtube_transcript_api._errors import YouTubeRequestFailed
+
+from youtube_summarizer.segments import TranscriptSegments
+from youtube_summarizer.transcript import TranscriptExtractor, transcript_error
+
+
+DEFAULT_CONCURRENCY = 8
+DEFAULT_PER_HOST = 4
+DEFAULT_RETRIES = 3
+DEFAULT_BACKOFF = 0.5  # seconds, doubled per retry
+MAX_BACKOFF = 8.0
+
+# Distinct hosts whose connection pools are kept (YouTube needs one or two)
+POOLED_HOSTS = 10
+
+
+def create_session(per_host: int = DEFAULT_PER_HOST) -> requests.Session:
+    """
+    Create an HTTP session with a keep-alive connection pool.
+
+    At most ``per_host`` connections are open to any one host; further
+    requests to that host wait for a free connection instead of opening
+    a new one.
+
+    Args:
+        per_host: Connection limit per host
+
+    Returns:
+        requests.Session
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=POOLED_HOSTS, pool_maxsize=per_host, pool_block=True)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+class AsyncTranscriptExtractor:
+    """Fetches transcripts of many videos concurrently.
+
+    Requests share one pooled keep-alive session, so connections to YouTube
+    are reused across videos (youtube-transcript-api 1.0 or later; older
+    versions cannot take a session and connect per request, see
+    ``extractor.shares_session``). youtube-transcript-api is synchronous, so
+    fetches run on a bounded thread pool and are awaited from asyncio;
+    backoff between retries does not hold a worker.
+    """
+
+    def __init__(
+        self,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        per_host: int = DEFAULT_PER_HOST,
+        retries: int = DEFAULT_RETRIES,
+        backoff: float = DEFAULT_BACKOFF,
+        max_backoff: float = MAX_BACKOFF,
+        cache=None,
+        session: Optional[requests.Session] = None
+    ):
+        """
+        Initialize async transcript extractor.
+
+        Args:
+            concurrency: Videos fetched at the same time
+            per_host: Open connections per host (ignored if session is given)
+            retries: Retries after YouTubeRequestFailed before giving up
+            backoff: Base delay of the first retry in seconds
+            max_backoff: Upper bound of a retry delay in seconds
+            cache: Optional DiskCache for transcript listings and snippets
+            session: Optional session to use instead of a new pooled one
+        """
+        self.concurrency = concurrency
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self._owns_session = session is None
+        self.session = session if session is not None else create_session(per_host)
+        self.extractor = TranscriptExtractor(cache=cache, http_client=self.session)
+        self._executor = ThreadPoolExecutor(
+            max_workers=concurrency, thread_name_prefix="transcript"
+        )
+        self._random = random.Random()
+
+    async def __aenter__(self) -> "AsyncTranscriptExtractor":
+        """Use the extractor as an async context manager."""
+        return self
+
+    async def __aexit__(self, *exc_info):
+        """Close the extractor."""
+        self.close()
+
+    def close(self):
+        """Stop the worker threads and close the session if it was created here."""
+        self._executor.shutdown(wait=True)
+        if self._owns_session:
+            self.session.close()
+
+    def retry_delay(self, attempt: int) -> float:
+        """
+        Get the delay before a retry ("full jitter" exponential backoff).
+
+        Args:
+            attempt: 0 for the first retry
+
+        Returns:
+            Random delay in seconds between 0 and the capped backoff
+        """
+        return self._random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+
+    async def fetch_segments(
+        self,
+        video_id: str,
+        language: str = 'en',
+        languages: Optional[List[str]] = None
+    ) -> TranscriptSegments:
+        """
+        Fetch transcript for a YouTube video, keeping segment timings.
+
+        Language selection is the same as in ``TranscriptExtractor``.
+
+        Args:
+            video_id: YouTube video ID
+            language: Preferred language code (default: 'en')
+            languages: Fallback languages to try
+
+        Returns:
+            TranscriptSegments
+
+        Raises:
+            ValueError: If transcript cannot be fetched (after retries)
+        """
+        if languages is None:
+            languages = [language, 'en', 'en-US', 'en-GB']
+        loop = asyncio.get_running_loop()
+        call = functools.partial(self.extractor._fetch_segments, video_id, languages)
+
+        attempt = 0
+        while True:
+            try:
+                segments = await loop.run_in_executor(self._executor, call)
+                break
+            except YouTubeRequestFailed as e:
+                if attempt >= self.retries:
+                    raise transcript_error(video_id, e)
+                await asyncio.sleep(self.retry_delay(attempt))
+                attempt += 1
+            except Exception as e:
+                raise transcript_error(video_id, e)
+
+        if segments is None:
+            raise ValueError(
+                f"No transcript found for video {video_id} in any available language."
+            )
+        return segments
+
+    async def fetch_transcript(
+        self,
+        video_id: str,
+        language: str = 'en',
+        languages: Optional[List[str]] = None
+    ) -> str:
+        """
+        Fetch transcript for a YouTube video.
+
+        Args:
+            video_id: YouTube video ID
+            language: Preferred language code (default: 'en')
+            languages: Fallback languages to try
+
+        Returns:
+            Transcript text as a single string
+
+        Raises:
+            ValueError: If transcript cannot be fetched (after retries)
+        """
+        segments = await self.fetch_segments(video_id, language=language, languages=languages)
+        return segments.text
+
+    async def fetch_many(
+        self,
+        video_ids: Iterable[str],
+        language: str = 'en'
+    ) -> List[Union[TranscriptSegments, ValueError]]:
+        """
+        Fetch the transcripts of several videos concurrently.
+
+        Args:
+            video_ids: YouTube video IDs
+            language: Preferred language code (default: 'en')
+
+        Returns:
+            One entry per video, in input order: TranscriptSegments, or the
+            ValueError describing why that video failed
+        """
+        async def fetch_one(video_id: str):
+            try:
+                return await self.fetch_segments(video_id, language=language)
+            except ValueError as e:
+                return e
+
+        return list(await asyncio.gather(*(fetch_one(video_id) for video_id in video_ids)))
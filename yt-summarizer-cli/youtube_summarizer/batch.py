@@ -0,0 +1,225 @@
+"""Module for summarizing many videos in one run."""
+
+import json
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, IO, Iterable, List, NamedTuple, Tuple
+
+from youtube_summarizer.normalize import normalize_transcript
+from youtube_summarizer.playlist import extract_playlist_id, fetch_playlist_video_ids
+
+
+WATCH_URL = "https://www.youtube.com/watch?v={video_id}"
+
+
+class BatchItem(NamedTuple):
+    """One video of a batch run."""
+
+    index: int
+    url: str
+    video_id: str
+
+
+def read_urls(stream: IO[str]) -> List[str]:
+    """
+    Read URLs from a file or stdin, one per line.
+
+    Args:
+        stream: Text stream to read from
+
+    Returns:
+        URLs in input order; blank lines and lines starting with '#' are skipped
+    """
+    urls = []
+    for line in stream:
+        line = line.strip()
+        if line and not line.startswith('#'):
+            urls.append(line)
+    return urls
+
+
+def expand_urls(
+    urls: Iterable[str],
+    extractor,
+    fetch_playlist: Callable[[str], List[str]] = fetch_playlist_video_ids
+) -> Tuple[List[BatchItem], List[Dict[str, Any]]]:
+    """
+    Turn input URLs into batch items, expanding playlists into their videos.
+
+    Args:
+        urls: Video or playlist URLs
+        extractor: TranscriptExtractor used to parse video URLs
+        fetch_playlist: Function returning the video IDs of a playlist ID
+
+    Returns:
+        Tuple of (items without duplicate videos, error records for inputs
+        that could not be resolved)
+    """
+    items: List[BatchItem] = []
+    errors: List[Dict[str, Any]] = []
+    seen = set()
+    index = 0
+
+    for url in urls:
+        try:
+            playlist_id = extract_playlist_id(url)
+            if playlist_id is not None:
+                resolved = [
+                    (WATCH_URL.format(video_id=video_id), video_id)
+                    for video_id in fetch_playlist(playlist_id)
+                ]
+            else:
+                resolved = [(url, extractor.extract_video_id(url))]
+        except ValueError as e:
+            errors.append({
+                "url": url,
+                "status": "error",
+                "stage": "input",
+                "error": str(e),
+            })
+            continue
+
+        for video_url, video_id in resolved:
+            if video_id in seen:
+                continue
+            seen.add(video_id)
+            items.append(BatchItem(index, video_url, video_id))
+            index += 1
+
+    return items, errors
+
+
+class BatchPipeline:
+    """Fetches transcripts and summarizes them for many videos at once.
+
+    Both stages run in their own thread pool with their own concurrency limit,
+    so slow LLM calls do not hold back transcript downloads and vice versa.
+    Transcripts waiting for a summary worker are capped, which keeps memory
+    bounded when downloads are faster than summaries. Every video is written
+    as one JSON line as soon as it is done, in completion order.
+    """
+
+    def __init__(
+        self,
+        extractor,
+        llm_client=None,
+        language: str = 'en',
+        transcript_workers: int = 4,
+        summary_workers: int = 2,
+        normalize: bool = False
+    ):
+        """
+        Initialize the pipeline.
+
+        Args:
+            extractor: TranscriptExtractor used for the transcript stage
+            llm_client: LLMClient used for the summary stage; if None, the
+                transcripts themselves are written
+            language: Preferred subtitle language code
+            transcript_workers: Number of concurrent transcript fetches
+            summary_workers: Number of concurrent LLM calls
+            normalize: Clean up transcripts with normalize_transcript before
+                summarizing; records then carry 'tokens_saved'
+        """
+        self.extractor = extractor
+        self.llm_client = llm_client
+        self.language = language
+        self.transcript_workers = transcript_workers
+        self.summary_workers = summary_workers
+        self.normalize = normalize
+        self._write_lock = threading.Lock()
+
+    def run(self, items: List[BatchItem], out: IO[str]) -> Dict[str, int]:
+        """
+        Process all items and write one JSON line per video to ``out``.
+
+        Args:
+            items: Videos to process
+            out: Text stream receiving the JSON Lines output
+
+        Returns:
+            Dictionary with the number of 'ok' and 'error' records written
+        """
+        counts = {"ok": 0, "error": 0}
+
+        def write(record: Dict[str, Any]):
+            out.write(json.dumps(record, ensure_ascii=False) + "\n")
+            out.flush()
+            counts[record["status"]] += 1
+
+        self._process(items, write, self.llm_client)
+        return counts
+
+    def collect(self, items: List[BatchItem]) -> List[Dict[str, Any]]:
+        """
+        Run the transcript stage only and return the records.
+
+        Used when summaries are produced elsewhere, e.g. by a Batch API job.
+
+        Args:
+            items: Videos to process
+
+        Returns:
+            Records in input order; successful ones carry 'transcript'
+        """
+        records: List[Dict[str, Any]] = []
+        self._process(items, records.append, None)
+        return sorted(records, key=lambda record: record["index"])
+
+    def _process(self, items: List[BatchItem], write: Callable[[Dict[str, Any]], None], llm_client):
+        """Run both stages, passing each finished record to ``write`` (serialized)."""
+        in_flight = threading.BoundedSemaphore(self.transcript_workers + 2 * self.summary_workers)
+        futures: List[Future] = []
+
+        def emit(item: BatchItem, record: Dict[str, Any]):
+            record = {"index": item.index, "url": item.url, "video_id": item.video_id, **record}
+            with self._write_lock:
+                write(record)
+
+        def summarize(item: BatchItem, transcript: str, extra: Dict[str, Any]):
+            try:
+                summary = llm_client.summarize(transcript)
+            except Exception as e:
+                emit(item, {"status": "error", "stage": "summary", "error": str(e), **extra})
+                return
+            finally:
+                in_flight.release()
+            emit(item, {"status": "ok", "summary": summary, **extra})
+
+        def fetch(item: BatchItem):
+            in_flight.acquire()
+            handed_off = False
+            try:
+                try:
+                    segments = self.extractor.fetch_segments(item.video_id, language=self.language)
+                except Exception as e:
+                    emit(item, {"status": "error", "stage": "transcript", "error": str(e)})
+                    return
+                transcript = segments.text
+                extra: Dict[str, Any] = {}
+                if self.normalize:
+                    # The fetched transcript may be in a fallback language
+                    normalized = normalize_transcript(transcript, segments.language_code or self.language)
+                    transcript = normalized.text
+                    extra["tokens_saved"] = normalized.tokens_saved
+                if llm_client is None:
+                    emit(item, {"status": "ok", "transcript": transcript, **extra})
+                    return
+                futures.append(summary_pool.submit(summarize, item, transcript, extra))
+                handed_off = True
+            finally:
+                # Once handed off, summarize() releases the slot; on every other path
+                # (including unexpected errors) it is released here.
+                if not handed_off:
+                    in_flight.release()
+
+        # The transcript pool is shut down first, so every summary is queued before
+        # the summary pool waits for its workers.
+        with ThreadPoolExecutor(max_workers=self.summary_workers) as summary_pool:
+            with ThreadPoolExecutor(max_workers=self.transcript_workers) as transcript_pool:
+                fetches = [transcript_pool.submit(fetch, item) for item in items]
+        futures.extend(fetches)
+
+        # Surface unexpected failures such as a closed output stream
+        for future in futures:
+            future.result()
@@ -0,0 +1,209 @@
+"""Module for summarizing many videos through the OpenAI Batch API."""
+
+import json
+import os
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+
+DEFAULT_STATE_FILE = "batch-job.json"
+DEFAULT_POLL_INTERVAL = 60.0  # seconds
+
+# Batch statuses after which the job does not change anymore
+TERMINAL_STATUSES = frozenset({"completed", "failed", "expired", "cancelled"})
+
+
+class BatchJob:
+    """A Batch API job summarizing the transcripts of a batch run.
+
+    ``submit`` sends every transcript as one request of a batch job.
+    The mapping of request IDs to videos is written to a JSON state file
+    before the upload, and the input file ID and the job ID are added as
+    soon as each is known, so a later process can wait for the same job
+    and write its results after a restart. If the process died between
+    the upload and saving the job ID, the job is found again by its input
+    file (or created on it) instead of being submitted twice. Summaries
+    found in the cache are not submitted again, and finished summaries
+    are added to the cache.
+    """
+
+    def __init__(
+        self,
+        llm_client,
+        state_path: str = DEFAULT_STATE_FILE,
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+        sleep: Callable[[float], None] = time.sleep
+    ):
+        """
+        Initialize the job, loading its state if the state file exists.
+
+        Args:
+            llm_client: LLMClient that builds, submits and parses the requests
+            state_path: JSON file holding the state of a submitted job
+            poll_interval: Seconds between two status requests
+            sleep: Function used to wait between status requests
+        """
+        self.llm_client = llm_client
+        self.state_path = state_path
+        self.poll_interval = poll_interval
+        self._sleep = sleep
+        self._state: Optional[Dict[str, Any]] = None
+        if os.path.exists(state_path):
+            with open(state_path, "r", encoding="utf-8") as f:
+                self._state = json.load(f)
+
+    @property
+    def pending(self) -> bool:
+        """Whether a job was (or may have been) submitted and waits for its results."""
+        return self._state is not None and (
+            self._state.get("batch_id") is not None or self._state.get("input_file_id") is not None
+        )
+
+    @property
+    def batch_id(self) -> Optional[str]:
+        """ID of the submitted job, if any."""
+        return self._state.get("batch_id") if self._state else None
+
+    @property
+    def request_count(self) -> int:
+        """Number of requests in the submitted job."""
+        return len(self._state["requests"]) if self._state else 0
+
+    def submit(self, records: List[Dict[str, Any]], max_tokens: int = 1000):
+        """
+        Submit the transcripts of a batch run as one job.
+
+        Args:
+            records: Records from ``BatchPipeline.collect``; error records
+                are passed through to the results unchanged
+            max_tokens: Maximum tokens per response
+
+        Raises:
+            ValueError: If a job is already pending or the submission fails
+        """
+        if self.pending:
+            raise ValueError(f"A batch job is still pending ({self.state_path})")
+
+        finished: List[Dict[str, Any]] = []
+        requests: List[Dict[str, Any]] = []
+        mapping: Dict[str, Dict[str, Any]] = {}
+        for record in records:
+            if record["status"] != "ok":
+                finished.append(record)
+                continue
+            record = dict(record)
+            transcript = record.pop("transcript")
+            # Items are unique per video, so the video ID identifies the request
+            custom_id = record["video_id"]
+            request = self.llm_client.batch_request(custom_id, transcript, max_tokens)
+            key = self.llm_client.batch_cache_key(request)
+            summary = self.llm_client.cached_summary(key)
+            if summary is not None:
+                finished.append({**record, "summary": summary})
+                continue
+            requests.append(request)
+            mapping[custom_id] = {**record, "cache_key": key}
+
+        self._state = {
+            "status": "submitting",
+            "input_file_id": None,
+            "batch_id": None,
+            "requests": mapping,
+            "records": finished,
+        }
+        if not requests:
+            return
+        # Saved before anything is paid for, and again as soon as each ID is known
+        self._save()
+        self._state["input_file_id"] = self.llm_client.upload_batch_file(requests)
+        self._save()
+        self._create()
+
+    def recover(self):
+        """
+        Finish a submission interrupted after the upload.
+
+        The job created on the uploaded file is looked up, since it may
+        exist although its ID was never saved; otherwise it is created now.
+        Does nothing if the job ID is known.
+        """
+        if not self.pending or self.batch_id is not None:
+            return
+        batch_id = self.llm_client.find_batch(self._state["input_file_id"])
+        if batch_id is None:
+            self._create()
+            return
+        self._state.update({"status": "submitted", "batch_id": batch_id})
+        self._save()
+
+    def _create(self):
+        """Start the job on the uploaded file and save its ID."""
+        self._state["batch_id"] = self.llm_client.create_batch(self._state["input_file_id"])
+        self._state["status"] = "submitted"
+        self._save()
+
+    def wait(self, on_status: Optional[Callable[[Any], None]] = None):
+        """
+        Poll the job until it is finished.
+
+        Args:
+            on_status: Optional callback receiving the batch after each poll
+
+        Returns:
+            The finished openai Batch object, or None if nothing was submitted
+        """
+        if not self.pending:
+            return None
+        self.recover()
+        while True:
+            batch = self.llm_client.retrieve_batch(self.batch_id)
+            if on_status is not None:
+                on_status(batch)
+            if batch.status in TERMINAL_STATUSES:
+                return batch
+            self._sleep(self.poll_interval)
+
+    def results(self, batch=None) -> List[Dict[str, Any]]:
+        """
+        Build one record per video from the finished job.
+
+        Args:
+            batch: Batch object returned by ``wait``
+
+        Returns:
+            Records in input order, in the format of ``BatchPipeline.run``
+        """
+        if self._state is None:
+            return []
+        mapping = self._state["requests"]
+        summaries = {}
+        if batch is not None:
+            keys = {custom_id: entry.get("cache_key") for custom_id, entry in mapping.items()}
+            summaries = self.llm_client.batch_results(batch, keys)
+
+        records = list(self._state["records"])
+        for custom_id, entry in mapping.items():
+            record = {field: value for field, value in entry.items() if field != "cache_key"}
+            result = summaries.get(custom_id)
+            if isinstance(result, dict):
+                record.update({"status": "ok", "summary": result})
+            else:
+                if result is None:
+                    status = batch.status if batch is not None else "unknown"
+                    result = f"No result for this request (batch {status})"
+                record.update({"status": "error", "stage": "summary", "error": str(result)})
+            records.append(record)
+        return sorted(records, key=lambda record: record.get("index", -1))
+
+    def clear(self):
+        """Forget the job once its results are written."""
+        self._state = None
+        if os.path.exists(self.state_path):
+            os.remove(self.state_path)
+
+    def _save(self):
+        """Write the state file atomically."""
+        temp_path = self.state_path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(self._state, f, ensure_ascii=False)
+        os.replace(temp_path, self.state_path)
@@ -0,0 +1,170 @@
+"""Module for the local on-disk cache."""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Any, Optional
+
+
+DEFAULT_TTL = 7 * 24 * 3600  # seconds
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+CACHE_FILE_NAME = "cache.sqlite3"
+
+# Fraction of max_bytes left after an eviction pass, so eviction does not run on every write
+EVICT_TARGET = 0.9
+
+
+def default_cache_dir() -> str:
+    """
+    Get the default cache directory.
+
+    Returns:
+        ``$XDG_CACHE_HOME/youtube-summarizer`` or ``~/.cache/youtube-summarizer``
+    """
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "youtube-summarizer")
+
+
+class DiskCache:
+    """SQLite-backed key/value cache with expiry and a size limit.
+
+    Values are JSON-serializable objects stored zlib-compressed, grouped by
+    namespace. Expired entries are never returned. When the stored values
+    exceed ``max_bytes``, expired and then least recently used entries are
+    evicted. One instance can be shared between threads.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        ttl: Optional[float] = DEFAULT_TTL,
+        max_bytes: int = DEFAULT_MAX_BYTES
+    ):
+        """
+        Open (or create) the cache.
+
+        Args:
+            directory: Directory holding the cache file
+            ttl: Default lifetime of entries in seconds (None: no expiry)
+            max_bytes: Size limit of the stored values
+
+        Raises:
+            OSError: If the directory cannot be created
+            sqlite3.Error: If the cache file cannot be opened
+        """
+        os.makedirs(directory, exist_ok=True)
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            os.path.join(directory, CACHE_FILE_NAME),
+            check_same_thread=False,
+            isolation_level=None,
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            " namespace TEXT NOT NULL,"
+            " key TEXT NOT NULL,"
+            " value BLOB NOT NULL,"
+            " size INTEGER NOT NULL,"
+            " expires REAL,"
+            " accessed REAL NOT NULL,"
+            " PRIMARY KEY (namespace, key))"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed)")
+        self._total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+
+    def get(self, namespace: str, key: str) -> Optional[Any]:
+        """
+        Look up a value.
+
+        Args:
+            namespace: Kind of entry (e.g. 'transcript')
+            key: Entry key within the namespace
+
+        Returns:
+            The stored value, or None if missing or expired
+        """
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires FROM entries WHERE namespace = ? AND key = ?",
+                (namespace, key),
+            ).fetchone()
+            if row is None:
+                return None
+            if row[1] is not None and row[1] <= now:
+                self._delete(namespace, key)
+                return None
+            self._conn.execute(
+                "UPDATE entries SET accessed = ? WHERE namespace = ? AND key = ?",
+                (now, namespace, key),
+            )
+        return json.loads(zlib.decompress(row[0]).decode("utf-8"))
+
+    def set(self, namespace: str, key: str, value: Any, ttl: Optional[float] = None):
+        """
+        Store a value, replacing any previous one.
+
+        Args:
+            namespace: Kind of entry (e.g. 'transcript')
+            key: Entry key within the namespace
+            value: JSON-serializable value
+            ttl: Lifetime in seconds (default: the cache's ttl)
+        """
+        data = zlib.compress(json.dumps(value, ensure_ascii=False).encode("utf-8"))
+        now = time.time()
+        ttl = self.ttl if ttl is None else ttl
+        expires = now + ttl if ttl is not None else None
+        with self._lock:
+            self._delete(namespace, key)
+            self._conn.execute(
+                "INSERT INTO entries (namespace, key, value, size, expires, accessed) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (namespace, key, data, len(data), expires, now),
+            )
+            self._total += len(data)
+            if self._total > self.max_bytes:
+                self._evict(now)
+
+    def delete(self, namespace: str, key: str):
+        """
+        Remove an entry if present.
+
+        Args:
+            namespace: Kind of entry
+            key: Entry key within the namespace
+        """
+        with self._lock:
+            self._delete(namespace, key)
+
+    def close(self):
+        """Close the cache file."""
+        with self._lock:
+            self._conn.close()
+
+    def _delete(self, namespace: str, key: str):
+        row = self._conn.execute(
+            "SELECT size FROM entries WHERE namespace = ? AND key = ?", (namespace, key)
+        ).fetchone()
+        if row is not None:
+            self._conn.execute("DELETE FROM entries WHERE namespace = ? AND key = ?", (namespace, key))
+            self._total -= row[0]
+
+    def _evict(self, now: float):
+        self._conn.execute("DELETE FROM entries WHERE expires IS NOT NULL AND expires <= ?", (now,))
+        self._total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        target = self.max_bytes * EVICT_TARGET
+        if self._total <= target:
+            return
+        rows = self._conn.execute("SELECT namespace, key, size FROM entries ORDER BY accessed").fetchall()
+        for namespace, key, size in rows:
+            if self._total <= target:
+                break
+            self._conn.execute("DELETE FROM entries WHERE namespace = ? AND key = ?", (namespace, key))
+            self._total -= size
@@ -1,12 +1,53 @@
 """CLI entry point for YouTube Summarizer."""
 
 import sys
+import json
 import argparse
-from typing import Optional
+from typing import TYPE_CHECKING, List, Optional
 
-from youtube_summarizer.transcript import TranscriptExtractor
-from youtube_summarizer.llm_client import LLMClient
-from youtube_summarizer.formatter import OutputFormatter
+# Only lightweight modules are imported up front. Transcript fetching
+# (requests), the LLM client (openai) and output formatting (rich) are
+# imported on the code paths that use them, so --help and --raw start fast.
+from youtube_summarizer.llm_client import DEFAULT_RETRIES, DEFAULT_TIMEOUT, DEFAULT_WINDOW_TOKENS
+from youtube_summarizer.playlist import extract_playlist_id
+from youtube_summarizer.cache import DEFAULT_MAX_BYTES, DEFAULT_TTL, DiskCache, default_cache_dir
+from youtube_summarizer.batch_api import DEFAULT_POLL_INTERVAL, DEFAULT_STATE_FILE
+from youtube_summarizer.routing import ModelTier, parse_tiers
+
+if TYPE_CHECKING:
+    from youtube_summarizer.batch_api import BatchJob
+    from youtube_summarizer.formatter import OutputFormatter
+    from youtube_summarizer.llm_client import LLMClient
+
+
+def positive_int(value: str) -> int:
+    """Argparse type for integers >= 1."""
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid integer: {value!r}")
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1: {value!r}")
+    return number
+
+
+def non_negative_int(value: str) -> int:
+    """Argparse type for integers >= 0."""
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid integer: {value!r}")
+    if number < 0:
+        raise argparse.ArgumentTypeError(f"must not be negative: {value!r}")
+    return number
+
+
+def model_tiers(value: str) -> List[ModelTier]:
+    """Argparse type for a model routing table."""
+    try:
+        return parse_tiers(value)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
 
 
 def parse_arguments():
@@ -20,14 +61,25 @@ Examples:
   youtube-summarize --url "https://youtu.be/dQw4w9WgXcQ" --language es
   youtube-summarize --url "https://youtu.be/dQw4w9WgXcQ" --raw
   youtube-summarize --url "https://youtu.be/dQw4w9WgXcQ" --model gpt-4
+  youtube-summarize --url "https://youtu.be/dQw4w9WgXcQ" --stream
+  youtube-summarize --urls-file videos.txt --output summaries.jsonl
+  youtube-summarize --urls-file videos.txt --output summaries.jsonl --batch-api
+  youtube-summarize --urls-file videos.txt --model-tiers "4000=gpt-4o-mini:600,*=gpt-4o:1500" --escalate
+  youtube-summarize --url "https://www.youtube.com/playlist?list=PL..." --summary-workers 4
         """
     )
     
-    parser.add_argument(
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument(
         "--url",
         type=str,
-        required=True,
-        help="YouTube video URL"
+        help="YouTube video URL (a playlist URL starts a batch run)"
+    )
+    
+    source.add_argument(
+        "--urls-file",
+        type=str,
+        help="File with one video or playlist URL per line ('-' reads stdin); starts a batch run"
     )
     
     parser.add_argument(
@@ -44,6 +96,20 @@ Examples:
         help="LLM model to use (default: gpt-4o-mini)"
     )
     
+    parser.add_argument(
+        "--model-tiers",
+        type=model_tiers,
+        default=None,
+        metavar="LIMIT=MODEL[:MAX_TOKENS],...",
+        help="Pick the model by transcript tokens instead of --model, e.g. '4000=gpt-4o-mini:600,*=gpt-4o:1500'"
+    )
+    
+    parser.add_argument(
+        "--escalate",
+        action="store_true",
+        help="With --model-tiers: retry on the next tier if a summary does not match the expected format"
+    )
+    
     parser.add_argument(
         "--raw",
         action="store_true",
@@ -57,22 +123,398 @@ Examples:
         help="OpenAI API key (defaults to OPENAI_API_KEY environment variable)"
     )
     
-    return parser.parse_args()
+    parser.add_argument(
+        "--normalize",
+        action="store_true",
+        help="Clean up captions before summarizing: drop [Music]-style tags, filler words and repeated phrases"
+    )
+    
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Show the summary progressively while the model generates it (single videos only)"
+    )
+    
+    parser.add_argument(
+        "--structured",
+        action="store_true",
+        help="Enforce the summary format with JSON-schema structured output (falls back if the provider lacks it)"
+    )
+    
+    parser.add_argument(
+        "--map-reduce",
+        action="store_true",
+        help="Summarize long transcripts window by window and merge the results instead of truncating them"
+    )
+    
+    parser.add_argument(
+        "--window-tokens",
+        type=positive_int,
+        default=DEFAULT_WINDOW_TOKENS,
+        help="Map-reduce: transcript tokens per window (default: %(default)s)"
+    )
+    
+    parser.add_argument(
+        "--map-workers",
+        type=positive_int,
+        default=4,
+        help="Map-reduce: windows summarized concurrently per video (default: 4)"
+    )
+    
+    parser.add_argument(
+        "--timeout",
+        type=positive_int,
+        default=int(DEFAULT_TIMEOUT),
+        help="Seconds before an LLM API call is abandoned and retried (default: %(default)s)"
+    )
+    
+    parser.add_argument(
+        "--retries",
+        type=non_negative_int,
+        default=DEFAULT_RETRIES,
+        help="Retries of an LLM API call after rate limits, server errors or timeouts (default: %(default)s)"
+    )
+    
+    parser.add_argument(
+        "--output",
+        type=str,
+        default=None,
+        help="Batch runs: write JSON Lines to this file instead of stdout"
+    )
+    
+    parser.add_argument(
+        "--transcript-workers",
+        type=positive_int,
+        default=4,
+        help="Batch runs: concurrent transcript downloads (default: 4)"
+    )
+    
+    parser.add_argument(
+        "--summary-workers",
+        type=positive_int,
+        default=2,
+        help="Batch runs: concurrent LLM calls (default: 2)"
+    )
+    
+    parser.add_argument(
+        "--batch-api",
+        action="store_true",
+        help="Batch runs: summarize through the OpenAI Batch API (cheaper, results within 24 hours)"
+    )
+    
+    parser.add_argument(
+        "--batch-state",
+        type=str,
+        default=DEFAULT_STATE_FILE,
+        help="Batch API: file keeping the submitted job, used to resume after a restart (default: %(default)s)"
+    )
+    
+    parser.add_argument(
+        "--poll-interval",
+        type=positive_int,
+        default=int(DEFAULT_POLL_INTERVAL),
+        help="Batch API: seconds between status checks (default: %(default)s)"
+    )
+    
+    parser.add_argument(
+        "--cache-dir",
+        type=str,
+        default=default_cache_dir(),
+        help="Directory of the local cache (default: %(default)s)"
+    )
+    
+    parser.add_argument(
+        "--cache-ttl",
+        type=positive_int,
+        default=DEFAULT_TTL // 3600,
+        help="Hours before cached transcripts and summaries expire (default: %(default)s)"
+    )
+    
+    parser.add_argument(
+        "--cache-max-mb",
+        type=positive_int,
+        default=DEFAULT_MAX_BYTES // (1024 * 1024),
+        help="Size limit of the cache in MB before old entries are evicted (default: %(default)s)"
+    )
+    
+    parser.add_argument(
+        "--cache",
+        dest="cache",
+        action="store_true",
+        default=True,
+        help="Use the local cache for transcripts and summaries (default)"
+    )
+    
+    parser.add_argument(
+        "--no-cache",
+        dest="cache",
+        action="store_false",
+        help="Do not read or write the local cache"
+    )
+    
+    parser.add_argument(
+        "--refresh",
+        action="store_true",
+        help="Re-query the model even if a cached summary exists (the cache is updated)"
+    )
+    
+    args = parser.parse_args()
+    if args.escalate and not args.model_tiers:
+        parser.error("--escalate requires --model-tiers")
+    return args
+
+
+def open_cache(args, formatter: "OutputFormatter") -> Optional[DiskCache]:
+    """
+    Open the local cache unless disabled.
+    
+    Args:
+        args: Parsed command-line arguments
+        formatter: Formatter for warnings
+        
+    Returns:
+        DiskCache, or None if disabled or unavailable
+    """
+    if not args.cache:
+        return None
+    try:
+        return DiskCache(
+            args.cache_dir,
+            ttl=args.cache_ttl * 3600,
+            max_bytes=args.cache_max_mb * 1024 * 1024,
+        )
+    except Exception as e:
+        formatter.print_info(f"Cache disabled: {str(e)}")
+        return None
+
+
+def create_llm_client(args, cache: Optional[DiskCache] = None) -> "LLMClient":
+    """
+    Create the LLM client from the command-line arguments.
+    
+    Args:
+        args: Parsed command-line arguments
+        cache: Optional cache for summaries
+        
+    Returns:
+        Configured LLMClient
+    """
+    from youtube_summarizer.llm_client import LLMClient
+    from youtube_summarizer.routing import ModelRouter
+    
+    router = None
+    if args.model_tiers:
+        router = ModelRouter(args.model_tiers, escalate=args.escalate)
+    
+    return LLMClient(
+        model=args.model,
+        api_key=args.api_key,
+        cache=cache,
+        refresh=args.refresh,
+        map_reduce=args.map_reduce,
+        window_tokens=args.window_tokens,
+        map_workers=args.map_workers,
+        timeout=args.timeout,
+        retries=args.retries,
+        structured=args.structured,
+        router=router,
+    )
+
+
+def report_call_stats(formatter: "OutputFormatter", llm_client: "LLMClient"):
+    """
+    Print the retry, latency and routing counters of the LLM client.
+    
+    Args:
+        formatter: Formatter for the message
+        llm_client: Client whose calls are reported
+    """
+    stats = llm_client.stats.snapshot()
+    if not stats["calls"] and not stats["rejected"]:
+        return
+    formatter.print_info(
+        f"LLM calls: {stats['calls']} ({stats['retries']} retried, "
+        f"{stats['timeouts']} timed out, {stats['rejected']} rejected by the circuit breaker), "
+        f"latency avg {stats['latency_avg']:.1f}s, max {stats['latency_max']:.1f}s"
+    )
+    if llm_client.router is not None:
+        routed = llm_client.router.snapshot()
+        models = ", ".join(f"{model}: {count}" for model, count in sorted(routed["models"].items()))
+        formatter.print_info(f"Summaries per model: {models} ({routed['escalations']} escalation(s))")
+
+
+def run_batch(args, formatter: "OutputFormatter", cache: Optional[DiskCache] = None) -> int:
+    """
+    Summarize every video of a URL list or playlist and write JSON Lines.
+    
+    Args:
+        args: Parsed command-line arguments
+        formatter: Formatter for progress messages (on stderr)
+        cache: Optional cache for transcripts and summaries
+        
+    Returns:
+        Process exit code: 0 if every video succeeded, 1 otherwise
+    """
+    from youtube_summarizer.batch import BatchPipeline, expand_urls, read_urls
+    from youtube_summarizer.transcript import TranscriptExtractor
+    
+    job = None
+    if args.batch_api and not args.raw:
+        from youtube_summarizer.batch_api import BatchJob
+        job = BatchJob(
+            create_llm_client(args, cache),
+            args.batch_state,
+            poll_interval=args.poll_interval,
+        )
+        if job.pending:
+            job.recover()
+            formatter.print_info(
+                f"Resuming batch {job.batch_id} from {args.batch_state} (input is not read again)"
+            )
+            return finish_batch_job(args, formatter, job)
+    
+    if args.urls_file is not None:
+        if args.urls_file == "-":
+            urls = read_urls(sys.stdin)
+        else:
+            with open(args.urls_file, "r", encoding="utf-8") as f:
+                urls = read_urls(f)
+    else:
+        urls = [args.url]
+    
+    extractor = TranscriptExtractor(cache=cache)
+    items, errors = expand_urls(urls, extractor)
+    formatter.print_info(f"{len(items)} video(s) to process")
+    
+    llm_client = None
+    if job is None and not args.raw and items:
+        llm_client = create_llm_client(args, cache)
+    
+    pipeline = BatchPipeline(
+        extractor,
+        llm_client,
+        language=args.language,
+        transcript_workers=args.transcript_workers,
+        summary_workers=args.summary_workers,
+        normalize=args.normalize,
+    )
+    
+    if job is not None:
+        job.submit(errors + pipeline.collect(items))
+        if job.pending:
+            formatter.print_info(
+                f"Submitted batch {job.batch_id} with {job.request_count} request(s); "
+                f"an interrupted run resumes from {args.batch_state}"
+            )
+        return finish_batch_job(args, formatter, job)
+    
+    out = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    try:
+        for record in errors:
+            out.write(json.dumps(record, ensure_ascii=False) + "\n")
+        counts = pipeline.run(items, out)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    
+    failed = counts["error"] + len(errors)
+    formatter.print_info(f"Done: {counts['ok']} succeeded, {failed} failed")
+    if llm_client is not None:
+        report_call_stats(formatter, llm_client)
+    return 1 if failed else 0
+
+
+def finish_batch_job(args, formatter: "OutputFormatter", job: "BatchJob") -> int:
+    """
+    Wait for a Batch API job and write its records as JSON Lines.
+    
+    The state file is removed only after the output is written, so an
+    interrupted run can be resumed.
+    
+    Args:
+        args: Parsed command-line arguments
+        formatter: Formatter for progress messages (on stderr)
+        job: Submitted (or empty) BatchJob
+        
+    Returns:
+        Process exit code: 0 if every video succeeded, 1 otherwise
+    """
+    last_status = None
+    
+    def report(batch):
+        nonlocal last_status
+        if batch.status != last_status:
+            formatter.print_info(f"Batch {batch.id}: {batch.status}")
+            last_status = batch.status
+    
+    records = job.results(job.wait(on_status=report))
+    
+    out = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    try:
+        for record in records:
+            out.write(json.dumps(record, ensure_ascii=False) + "\n")
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    job.clear()
+    
+    failed = sum(1 for record in records if record["status"] == "error")
+    formatter.print_info(f"Done: {len(records) - failed} succeeded, {failed} failed")
+    report_call_stats(formatter, job.llm_client)
+    return 1 if failed else 0
 
 
 def main():
     """Main CLI entry point."""
     args = parse_arguments()
+    
+    from youtube_summarizer.formatter import OutputFormatter
+    
+    if args.urls_file is not None or extract_playlist_id(args.url) is not None:
+        # stdout carries the JSON Lines, so messages go to stderr
+        formatter = OutputFormatter(stderr=True)
+        cache = open_cache(args, formatter)
+        try:
+            sys.exit(run_batch(args, formatter, cache))
+        except (ValueError, OSError) as e:
+            formatter.print_error("Invalid input or processing error", str(e))
+            sys.exit(1)
+        except ImportError as e:
+            formatter.print_error("Missing dependency", str(e))
+            sys.exit(1)
+        except KeyboardInterrupt:
+            formatter.print_info("\nOperation cancelled by user")
+            sys.exit(130)
+        except Exception as e:
+            formatter.print_error("Unexpected error", str(e))
+            sys.exit(1)
+        finally:
+            if cache is not None:
+                cache.close()
+    
     formatter = OutputFormatter()
+    cache = open_cache(args, formatter)
     
     try:
         # Extract transcript
         formatter.print_info("Extracting transcript...")
-        extractor = TranscriptExtractor()
+        from youtube_summarizer.transcript import TranscriptExtractor
+        extractor = TranscriptExtractor(cache=cache)
         video_id = extractor.extract_video_id(args.url)
         formatter.print_info(f"Video ID: {video_id}")
         
-        transcript = extractor.fetch_transcript(video_id, language=args.language)
+        segments = extractor.fetch_segments(video_id, language=args.language)
+        transcript = segments.text
+        
+        if args.normalize:
+            from youtube_summarizer.normalize import normalize_transcript
+            # Filler words follow the transcript actually fetched, which may be a fallback language
+            normalized = normalize_transcript(transcript, segments.language_code or args.language)
+            transcript = normalized.text
+            formatter.print_info(
+                f"Normalized transcript: ~{normalized.tokens_saved} tokens saved "
+                f"({normalized.tokens_before} -> {normalized.tokens_after})"
+            )
         
         if args.raw:
             # Print raw transcript only
@@ -81,7 +523,16 @@ def main():
         
         # Summarize with LLM
         formatter.print_info("Summarizing with LLM...")
-        llm_client = LLMClient(model=args.model, api_key=args.api_key)
+        llm_client = create_llm_client(args, cache)
+        if llm_client.router is not None:
+            model, max_tokens = llm_client.route(transcript)
+            formatter.print_info(f"Model: {model} (max_tokens {max_tokens})")
+        if args.stream:
+            with formatter.live_summary(title=args.url) as update:
+                summary = llm_client.summarize(transcript, on_partial=update)
+                # The final render also covers responses that were not valid JSON
+                update(summary)
+            return
         summary = llm_client.summarize(transcript)
         
         # Print formatted summary
@@ -99,6 +550,9 @@ def main():
     except Exception as e:
         formatter.print_error("Unexpected error", str(e))
         sys.exit(1)
+    finally:
+        if cache is not None:
+            cache.close()
 
 
 if __name__ == "__main__":
@@ -1,25 +1,28 @@
 """Module for formatting output."""
 
-from typing import Dict, Any, Optional
+from contextlib import contextmanager
+from typing import Callable, Dict, Any, Iterator, Optional
 import json
 
-from rich.console import Console
-from rich.panel import Panel
+from rich.console import Console, Group
 from rich.text import Text
-from rich.markdown import Markdown
+
+# rich.panel, rich.live and especially rich.markdown are imported where they
+# are used, so printing a status line does not load them
 
 
 class OutputFormatter:
     """Handles formatting and display of results."""
 
-    def __init__(self, use_color: bool = True):
+    def __init__(self, use_color: bool = True, stderr: bool = False):
         """
         Initialize formatter.
         
         Args:
             use_color: Whether to use colored output
+            stderr: Print to stderr instead of stdout (keeps stdout free for data)
         """
-        self.console = Console(force_terminal=use_color)
+        self.console = Console(force_terminal=use_color, stderr=stderr)
 
     def print_transcript(self, transcript: str):
         """
@@ -28,6 +31,8 @@ class OutputFormatter:
         Args:
             transcript: Transcript text
         """
+        from rich.panel import Panel
+        
         self.console.print("\n[bold]Transcript:[/bold]")
         self.console.print(Panel(transcript, border_style="blue"))
 
@@ -41,26 +46,64 @@ class OutputFormatter:
         """
         if title:
             self.console.print(f"\n[bold cyan]Video:[/bold cyan] {title}\n")
+        self.console.print(self.render_summary(summary_data))
+
+    @contextmanager
+    def live_summary(self, title: Optional[str] = None) -> Iterator[Callable[[Dict[str, Any]], None]]:
+        """
+        Render a summary progressively while it is being generated.
+        
+        Yields a callback that redraws the summary in place; pass it each
+        partial summary and finally the complete one.
+        
+        Args:
+            title: Optional title to display
+            
+        Yields:
+            Callback taking summary data
+        """
+        from rich.live import Live
+        
+        if title:
+            self.console.print(f"\n[bold cyan]Video:[/bold cyan] {title}\n")
+        with Live(console=self.console, refresh_per_second=8) as live:
+            yield lambda summary_data: live.update(self.render_summary(summary_data))
+
+    def render_summary(self, summary_data: Dict[str, Any]) -> Group:
+        """
+        Build the renderable of a summary.
+        
+        Partial summaries (missing fields, incomplete insights) are rendered
+        as far as they go.
+        
+        Args:
+            summary_data: Summary data dictionary or plain text summary
+            
+        Returns:
+            Group of renderables
+        """
+        from rich.markdown import Markdown
+        from rich.panel import Panel
         
         # Handle different response formats
         if isinstance(summary_data, str):
             # Plain text summary
-            self.console.print(Markdown(summary_data))
-            return
+            return Group(Markdown(summary_data))
         
         if "format" in summary_data and summary_data["format"] == "text":
             # Text format summary
-            self.console.print(Markdown(summary_data.get("summary", "")))
-            return
+            return Group(Markdown(summary_data.get("summary", "")))
         
         # Structured JSON format
+        parts = []
+        line = self.console.render_str
         video_title = summary_data.get("title", "Untitled Video")
-        self.console.print(f"\n[bold cyan]Video: {video_title}[/bold cyan]\n")
+        parts.append(line(f"\n[bold cyan]Video: {video_title}[/bold cyan]\n"))
         
         # Overall summary
         overall_summary = summary_data.get("summary", "")
         if overall_summary:
-            self.console.print(Panel(
+            parts.append(Panel(
                 overall_summary,
                 title="[bold]Summary[/bold]",
                 border_style="green"
@@ -69,12 +112,14 @@ class OutputFormatter:
         # Key insights
         insights = summary_data.get("key_insights", [])
         if insights:
-            self.console.print("\n[bold yellow]Key Insights:[/bold yellow]\n")
+            parts.append(line("\n[bold yellow]Key Insights:[/bold yellow]\n"))
             
             for i, insight in enumerate(insights, 1):
+                if not isinstance(insight, dict):
+                    insight = {"insight": str(insight)}
                 insight_text = insight.get("insight", "")
                 explanation = insight.get("explanation", "")
-                certainty = insight.get("certainty", "medium").lower()
+                certainty = str(insight.get("certainty", "medium")).lower()
                 
                 # Color code by certainty
                 if certainty == "high":
@@ -84,18 +129,20 @@ class OutputFormatter:
                 else:
                     bullet_color = "blue"
                 
-                self.console.print(f"[{bullet_color}]•[/{bullet_color}] [bold]{insight_text}[/bold]")
+                parts.append(line(f"[{bullet_color}]•[/{bullet_color}] [bold]{insight_text}[/bold]"))
                 if explanation:
-                    self.console.print(f"  {explanation}")
-                self.console.print()  # Empty line
+                    parts.append(line(f"  {explanation}"))
+                parts.append(Text())  # Empty line
         
         # Uncertainties
         uncertainties = summary_data.get("uncertainties", [])
         if uncertainties:
-            self.console.print("\n[bold yellow]WARNING - Uncertainties:[/bold yellow]\n")
+            parts.append(line("\n[bold yellow]WARNING - Uncertainties:[/bold yellow]\n"))
             for uncertainty in uncertainties:
-                self.console.print(f"[yellow]•[/yellow] {uncertainty}")
-            self.console.print()
+                parts.append(line(f"[yellow]•[/yellow] {uncertainty}"))
+            parts.append(Text())
+        
+        return Group(*parts)
 
     def print_error(self, message: str, details: Optional[str] = None):
         """
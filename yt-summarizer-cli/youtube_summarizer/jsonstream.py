@@ -0,0 +1,195 @@
+"""Module for parsing JSON that arrives in pieces or is slightly malformed."""
+
+import json
+from typing import Any, List, Optional, Tuple
+
+
+class IncrementalJSONParser:
+    """Best-effort parser for a JSON object that is still being generated.
+
+    Text is fed in chunks as it arrives from a streaming response. Every chunk
+    is scanned once to track nesting, strings and escapes, so ``value()`` can
+    close whatever is still open and return the object parsed so far: an open
+    string value is cut at the current position, and a member that cannot be
+    completed yet (a half-written key, or ``tr`` of ``true``) is left out.
+    The object must start the text or open a Markdown code fence; a ``{``
+    inside prose does not start it. Text after the end of the object is
+    ignored, and trailing commas are dropped.
+    """
+
+    def __init__(self):
+        """Initialize an empty parser."""
+        self._chunks: List[str] = []
+        self._length = 0
+        self._start: Optional[int] = None
+        # Where the text before the object stands: "leading" (only whitespace),
+        # "fence" (in the info line of a code fence), "fenced" (only whitespace
+        # since the fence) or "text"
+        self._prefix = "leading"
+        self._ticks = 0
+        self._end: Optional[int] = None
+        self._stack: List[str] = []
+        self._in_string = False
+        self._escape_at: Optional[int] = None
+        self._escape_left = 0
+        # Last point where an incomplete member can be cut off: (position, open containers there)
+        self._safe: Optional[Tuple[int, Tuple[str, ...]]] = None
+        self._comma_at: Optional[int] = None
+        self._drops: List[int] = []
+
+    @property
+    def started(self) -> bool:
+        """Whether the top-level value has begun."""
+        return self._start is not None
+
+    @property
+    def done(self) -> bool:
+        """Whether the top-level value is complete."""
+        return self._end is not None
+
+    @property
+    def text(self) -> str:
+        """All text fed so far."""
+        return "".join(self._chunks)
+
+    def feed(self, chunk: str):
+        """
+        Add the next piece of text.
+
+        Args:
+            chunk: Text following everything fed before
+        """
+        offset = self._length
+        self._chunks.append(chunk)
+        self._length += len(chunk)
+        if self._end is not None:
+            return
+
+        for i, char in enumerate(chunk, offset):
+            if self._start is None:
+                self._scan_prefix(char, i)
+                continue
+
+            if self._in_string:
+                if self._escape_at is not None:
+                    # \uXXXX escapes end four characters after the "u"
+                    if i == self._escape_at + 1 and char == "u":
+                        self._escape_left = 4
+                    elif self._escape_left:
+                        self._escape_left -= 1
+                    if not self._escape_left:
+                        self._escape_at = None
+                elif char == "\\":
+                    self._escape_at = i
+                elif char == '"':
+                    self._in_string = False
+                continue
+
+            if char.isspace():
+                continue
+            if self._comma_at is not None:
+                if char in "}]":
+                    self._drops.append(self._comma_at)
+                self._comma_at = None
+            if char == '"':
+                self._in_string = True
+            elif char in "{[":
+                self._open(char, i)
+            elif char in "}]":
+                self._stack.pop()
+                if not self._stack:
+                    self._end = i + 1
+                    return
+            elif char == ",":
+                self._comma_at = i
+                self._safe = (i, tuple(self._stack))
+
+    def _scan_prefix(self, char: str, index: int):
+        if char == "{" and self._prefix in ("leading", "fenced"):
+            self._start = index
+            self._open(char, index)
+            return
+        if char == "`":
+            self._ticks += 1
+            if self._ticks == 3:
+                self._prefix = "fence"
+            return
+        self._ticks = 0
+        if self._prefix == "fence":
+            if char == "\n":
+                self._prefix = "fenced"
+        elif not char.isspace():
+            self._prefix = "text"
+
+    def _open(self, char: str, index: int):
+        self._stack.append("}" if char == "{" else "]")
+        self._safe = (index + 1, tuple(self._stack))
+
+    def value(self) -> Optional[Any]:
+        """
+        Parse what has been fed so far.
+
+        Returns:
+            The (possibly partial) top-level value, or None if it has not begun
+        """
+        if self._start is None:
+            return None
+        text = self.text
+        if self._end is not None:
+            candidate = self._without_drops(text[self._start:self._end], self._start)
+            try:
+                return json.loads(candidate)
+            except json.JSONDecodeError:
+                return None
+
+        body = text
+        if self._in_string:
+            if self._escape_at is not None:
+                body = body[:self._escape_at]
+            body += '"'
+        closers = "".join(reversed(self._stack))
+        try:
+            return json.loads(self._without_drops(body[self._start:], self._start) + closers)
+        except json.JSONDecodeError:
+            pass
+
+        # Drop the incomplete last member and close the containers open before it
+        position, stack = self._safe
+        body = self._without_drops(text[self._start:position], self._start).rstrip().rstrip(",")
+        try:
+            return json.loads(body + "".join(reversed(stack)))
+        except json.JSONDecodeError:
+            return None
+
+    def _without_drops(self, text: str, offset: int) -> str:
+        if not self._drops:
+            return text
+        kept = []
+        previous = 0
+        for position in self._drops:
+            position -= offset
+            if 0 <= position < len(text):
+                kept.append(text[previous:position])
+                previous = position + 1
+        kept.append(text[previous:])
+        return "".join(kept)
+
+
+def repair_json(text: str) -> Optional[Any]:
+    """
+    Parse a JSON object leniently: code fences, text after the object,
+    trailing commas and truncated output are tolerated.
+
+    Only an object at the start of the text or at the start of a fenced code
+    block is considered, so braces mentioned in prose are not mistaken for
+    the answer.
+
+    Args:
+        text: Model output expected to contain one JSON object
+
+    Returns:
+        The parsed (possibly partial) value, or None if no object was found
+    """
+    parser = IncrementalJSONParser()
+    parser.feed(text)
+    return parser.value()
@@ -1,28 +1,316 @@
 """Module for LLM integration and summarization."""
 
 import os
-from typing import Optional, Dict, Any
+import hashlib
+import importlib.util
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import parsedate_to_datetime
+from typing import Callable, Optional, Dict, Any, List, Tuple, Union
 import json
 
-try:
-    from openai import OpenAI
-    OPENAI_AVAILABLE = True
-except ImportError:
-    OPENAI_AVAILABLE = False
+from youtube_summarizer.jsonstream import IncrementalJSONParser, repair_json
+from youtube_summarizer.resilience import CallStats, CircuitBreaker, CircuitOpenError
+from youtube_summarizer.routing import ModelRouter
+
+# openai is slow to import, so it is only imported when a client is created;
+# --raw and --help runs never pay for it
+OPENAI_AVAILABLE = importlib.util.find_spec("openai") is not None
+OpenAI = None
+
+
+SYSTEM_PROMPT = (
+    "You are a helpful assistant that summarizes video transcripts. "
+    "You provide factual, objective summaries with key insights. "
+    "You indicate uncertainty when information is unclear."
+)
+
+# Bump whenever SYSTEM_PROMPT or _build_prompt changes, so cached summaries
+# produced with the old prompt are no longer used.
+PROMPT_VERSION = 1
+
+SUMMARY_NAMESPACE = "summary"
+
+# Transcript characters sent in single-prompt mode
+MAX_TRANSCRIPT_LENGTH = 15000
+
+# Map-reduce mode: transcript tokens per window, estimated from characters
+DEFAULT_WINDOW_TOKENS = 3500
+CHARS_PER_TOKEN = 4
+
+# Retries of transient API errors (429, 5xx, timeouts, connection errors)
+DEFAULT_TIMEOUT = 60.0  # seconds per call
+DEFAULT_RETRIES = 3
+DEFAULT_BACKOFF = 1.0  # seconds, doubled per retry
+MAX_BACKOFF = 30.0
+MAX_RETRY_AFTER = 60.0  # longest server-requested wait that is honored
+RETRY_STATUS_CODES = frozenset({408, 409, 429})
+
+# Batch API: endpoint the requests are sent to and time allowed for the job
+BATCH_ENDPOINT = "/v1/chat/completions"
+BATCH_COMPLETION_WINDOW = "24h"
+# Most recent jobs searched for one whose ID was lost
+BATCH_LIST_LIMIT = 100
+
+_RESPONSE_REQUIREMENTS = """1. Be factual and avoid hallucination - only summarize what is actually in the transcript
+2. Identify the most important insights and takeaways
+3. Provide brief explanations for each takeaway
+4. Indicate uncertainty if information is unclear or speculative
+5. Use a neutral and objective tone"""
+
+_INSIGHT_FORMAT = """{
+      "insight": "Key insight or takeaway",
+      "explanation": "Brief explanation",
+      "certainty": "high|medium|low"
+    }"""
+
+
+# JSON schemas of the responses, for structured output (response_format)
+_INSIGHT_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "insight": {"type": "string"},
+        "explanation": {"type": "string"},
+        "certainty": {"type": "string", "enum": ["high", "medium", "low"]},
+    },
+    "required": ["insight", "explanation", "certainty"],
+    "additionalProperties": False,
+}
+
+_PART_PROPERTIES = {
+    "key_insights": {"type": "array", "items": _INSIGHT_SCHEMA},
+    "summary": {"type": "string"},
+    "uncertainties": {"type": "array", "items": {"type": "string"}},
+}
+
+# Whole video: single prompt and merge prompts
+SUMMARY_SCHEMA = {
+    "name": "video_summary",
+    "schema": {
+        "type": "object",
+        "properties": {"title": {"type": "string"}, **_PART_PROPERTIES},
+        "required": ["title", "key_insights", "summary", "uncertainties"],
+        "additionalProperties": False,
+    },
+}
+
+# One window in map-reduce mode
+WINDOW_SCHEMA = {
+    "name": "transcript_part_summary",
+    "schema": {
+        "type": "object",
+        "properties": _PART_PROPERTIES,
+        "required": ["key_insights", "summary", "uncertainties"],
+        "additionalProperties": False,
+    },
+}
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimate the number of tokens of a text.
+
+    Args:
+        text: Any text
+
+    Returns:
+        Token estimate (characters / CHARS_PER_TOKEN, rounded up)
+    """
+    return -(-len(text) // CHARS_PER_TOKEN)
+
+
+def matches_schema(value: Any, schema: Dict[str, Any]) -> bool:
+    """
+    Check a parsed response against a response schema.
+
+    Required properties, types and enums are checked; extra properties are
+    allowed, since they do not make a summary unusable.
+
+    Args:
+        value: Parsed response
+        schema: JSON schema (the 'schema' part of SUMMARY_SCHEMA or WINDOW_SCHEMA)
+
+    Returns:
+        True if the value is valid
+    """
+    if "enum" in schema and value not in schema["enum"]:
+        return False
+    kind = schema.get("type")
+    if kind == "object":
+        if not isinstance(value, dict):
+            return False
+        properties = schema.get("properties", {})
+        return all(name in value for name in schema.get("required", ())) and all(
+            matches_schema(value[name], properties[name]) for name in value if name in properties
+        )
+    if kind == "array":
+        return isinstance(value, list) and all(matches_schema(item, schema.get("items", {})) for item in value)
+    if kind == "string":
+        return isinstance(value, str)
+    return True
+
+
+def _looks_like_summary(value: Any) -> bool:
+    """Whether a repaired value is a summary rather than JSON quoted in prose."""
+    return isinstance(value, dict) and any(name in value for name in SUMMARY_SCHEMA["schema"]["properties"])
+
+
+def _response_format(schema: Dict[str, Any]) -> Dict[str, Any]:
+    """Build the response_format parameter enforcing a schema."""
+    return {"type": "json_schema", "json_schema": {**schema, "strict": True}}
+
+
+def _rejects_schema(error: Exception) -> bool:
+    """Whether an API error says structured output is not supported."""
+    if getattr(error, "status_code", None) not in (400, 422):
+        return False
+    message = str(error).lower()
+    return "response_format" in message or "json_schema" in message
+
+
+def _openai_class():
+    """Import openai.OpenAI on first use."""
+    global OpenAI
+    if OpenAI is None:
+        from openai import OpenAI as openai_class
+        OpenAI = openai_class
+    return OpenAI
+
+
+def _is_retryable(error: Exception) -> bool:
+    """Whether an API error is transient (rate limit, server error, network)."""
+    import openai
+    if isinstance(error, openai.APIConnectionError):  # includes timeouts
+        return True
+    status = getattr(error, "status_code", None)
+    return status is not None and (status in RETRY_STATUS_CODES or status >= 500)
+
+
+def _retry_after(error: Exception) -> Optional[float]:
+    """
+    Read the wait requested by the server from an error response.
+
+    Args:
+        error: API error
+        
+    Returns:
+        Seconds from the retry-after-ms or Retry-After header, or None
+    """
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+    try:
+        if headers.get("retry-after-ms"):
+            return float(headers["retry-after-ms"]) / 1000
+        value = headers.get("retry-after")
+        if not value:
+            return None
+        try:
+            return float(value)
+        except ValueError:
+            # HTTP date
+            return parsedate_to_datetime(value).timestamp() - time.time()
+    except (TypeError, ValueError):
+        return None
+
+
+def split_transcript(transcript: str, window_chars: int) -> List[str]:
+    """
+    Split a transcript into consecutive windows of at most ``window_chars``.
+
+    Windows end at a sentence boundary where possible, otherwise at a space;
+    together they contain the whole transcript.
+
+    Args:
+        transcript: Transcript text
+        window_chars: Maximum characters per window
+
+    Returns:
+        List of windows in order
+    """
+    windows = []
+    start = 0
+    length = len(transcript)
+    while length - start > window_chars:
+        end = start + window_chars
+        cut = max(transcript.rfind(mark, start, end) for mark in (". ", "? ", "! "))
+        if cut > start:
+            cut += 1
+        else:
+            cut = transcript.rfind(" ", start, end)
+            if cut <= start:
+                cut = end
+        windows.append(transcript[start:cut].strip())
+        start = cut
+    if transcript[start:].strip():
+        windows.append(transcript[start:].strip())
+    return windows
 
 
 class LLMClient:
     """Handles LLM API calls for summarization."""
 
-    def __init__(self, model: str = "gpt-4o-mini", api_key: Optional[str] = None):
+    def __init__(
+        self,
+        model: str = "gpt-4o-mini",
+        api_key: Optional[str] = None,
+        cache=None,
+        refresh: bool = False,
+        map_reduce: bool = False,
+        window_tokens: int = DEFAULT_WINDOW_TOKENS,
+        map_workers: int = 4,
+        timeout: float = DEFAULT_TIMEOUT,
+        retries: int = DEFAULT_RETRIES,
+        backoff: float = DEFAULT_BACKOFF,
+        max_backoff: float = MAX_BACKOFF,
+        breaker: Optional[CircuitBreaker] = None,
+        structured: bool = False,
+        router: Optional[ModelRouter] = None
+    ):
         """
         Initialize LLM client.
         
         Args:
             model: Model name to use (default: gpt-4o-mini)
             api_key: API key (if None, will try to get from environment)
+            cache: Optional DiskCache for finished summaries
+            refresh: Ignore cached summaries and re-query the model
+                (new results still update the cache)
+            map_reduce: Summarize transcripts longer than one window as
+                concurrently summarized windows merged by a final call,
+                instead of truncating them
+            window_tokens: Transcript tokens per window in map-reduce mode
+            map_workers: Windows summarized concurrently in map-reduce mode
+            timeout: Seconds before an API call is abandoned
+            retries: Retries of a call after a transient error
+            backoff: Base delay of the first retry in seconds
+            max_backoff: Upper bound of a retry delay in seconds
+            breaker: Circuit breaker shared by all calls (default: a new one)
+            structured: Request JSON-schema structured output; if the
+                provider rejects it, the client falls back to the prompt and
+                repairs malformed JSON
+            router: Optional ModelRouter choosing model and max_tokens by
+                transcript size; ``model`` is then only used by callers
+                that do not summarize
         """
         self.model = model
+        self.cache = cache
+        self.refresh = refresh
+        self.map_reduce = map_reduce
+        self.window_tokens = window_tokens
+        self.map_workers = map_workers
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.breaker = breaker if breaker is not None else CircuitBreaker()
+        self.structured = structured
+        self.router = router
+        self.stats = CallStats()
+        self._schema_supported = True
+        self._random = random.Random()
         if not OPENAI_AVAILABLE:
             raise ImportError(
                 "OpenAI package not installed. Install with: pip install openai"
@@ -35,12 +323,14 @@ class LLMClient:
                 "or pass api_key parameter."
             )
         
-        self.client = OpenAI(api_key=self.api_key)
+        # Retries are done by _call, so the client's own retries are disabled
+        self.client = _openai_class()(api_key=self.api_key, timeout=timeout, max_retries=0)
 
     def summarize(
         self, 
         transcript: str, 
-        max_tokens: int = 1000
+        max_tokens: int = 1000,
+        on_partial: Optional[Callable[[Dict[str, Any]], None]] = None
     ) -> Dict[str, Any]:
         """
         Summarize transcript using LLM.
@@ -48,6 +338,9 @@ class LLMClient:
         Args:
             transcript: Video transcript text
             max_tokens: Maximum tokens for response
+            on_partial: Optional callback; if given, the response is streamed
+                and the callback receives the summary parsed so far whenever
+                it grows (in map-reduce mode, only the final merge is streamed)
             
         Returns:
             Dictionary with summary data
@@ -55,41 +348,605 @@ class LLMClient:
         Raises:
             ValueError: If API call fails
         """
-        prompt = self._build_prompt(transcript)
+        if self.router is None:
+            return self._summarize(transcript, max_tokens, on_partial, self.model)
         
-        try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are a helpful assistant that summarizes video transcripts. "
-                                 "You provide factual, objective summaries with key insights. "
-                                 "You indicate uncertainty when information is unclear."
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                temperature=0.3,  # Lower temperature for more factual output
-                max_tokens=max_tokens,
+        # Escalate to the next tier while the summary does not match the schema
+        tiers = self.router.tiers
+        index = first = self.router.select(estimate_tokens(transcript))
+        while True:
+            tier = tiers[index]
+            result = self._summarize(transcript, tier.max_tokens or max_tokens, on_partial, tier.model)
+            if (
+                not self.router.escalate
+                or index + 1 == len(tiers)
+                or matches_schema(result, SUMMARY_SCHEMA["schema"])
+            ):
+                self.router.record(tier.model, escalations=index - first)
+                return result
+            index += 1
+
+    def route(self, transcript: str, max_tokens: int = 1000) -> Tuple[str, int]:
+        """
+        Get the model and max_tokens a transcript is summarized with first.
+        
+        Args:
+            transcript: Video transcript text
+            max_tokens: Maximum tokens for response without a tier limit
+            
+        Returns:
+            Tuple of (model, max_tokens)
+        """
+        if self.router is None:
+            return self.model, max_tokens
+        tier = self.router.tiers[self.router.select(estimate_tokens(transcript))]
+        return tier.model, tier.max_tokens or max_tokens
+
+    def _summarize(
+        self,
+        transcript: str,
+        max_tokens: int,
+        on_partial: Optional[Callable[[Dict[str, Any]], None]],
+        model: str
+    ) -> Dict[str, Any]:
+        """Summarize with one model, in single-prompt or map-reduce mode."""
+        if self.map_reduce and len(transcript) > self.window_tokens * CHARS_PER_TOKEN:
+            return self._summarize_map_reduce(transcript, max_tokens, on_partial, model)
+        return self._complete(self._build_prompt(transcript), max_tokens, on_partial, SUMMARY_SCHEMA, model)
+
+    def _summarize_map_reduce(
+        self,
+        transcript: str,
+        max_tokens: int,
+        on_partial: Optional[Callable[[Dict[str, Any]], None]] = None,
+        model: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Summarize a long transcript window by window, then merge the results.
+        
+        The windows are summarized concurrently. If the partial summaries do
+        not fit into one merge prompt, they are merged in groups first, so no
+        part of the transcript is dropped.
+        
+        Args:
+            transcript: Video transcript text
+            max_tokens: Maximum tokens per response
+            on_partial: Optional callback for streaming the final merge
+            model: Model to use (default: ``self.model``)
+            
+        Returns:
+            Dictionary with summary data
+        """
+        window_chars = self.window_tokens * CHARS_PER_TOKEN
+        windows = split_transcript(transcript, window_chars)
+        partials = self._complete_all(
+            [self._build_window_prompt(window, i, len(windows)) for i, window in enumerate(windows, 1)],
+            max_tokens,
+            WINDOW_SCHEMA,
+            model,
+        )
+        while True:
+            groups = self._group_partials(partials, window_chars)
+            if len(groups) == 1:
+                return self._complete(
+                    self._build_reduce_prompt(groups[0]), max_tokens, on_partial, SUMMARY_SCHEMA, model
+                )
+            partials = self._complete_all(
+                [self._build_reduce_prompt(group) for group in groups], max_tokens, SUMMARY_SCHEMA, model
             )
+
+    def _complete_all(
+        self,
+        prompts: List[str],
+        max_tokens: int,
+        schema: Optional[Dict[str, Any]] = None,
+        model: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Run several prompts concurrently, keeping their order."""
+        def complete(prompt: str) -> Dict[str, Any]:
+            return self._complete(prompt, max_tokens, schema=schema, model=model)
+        
+        if len(prompts) == 1 or self.map_workers <= 1:
+            return [complete(prompt) for prompt in prompts]
+        with ThreadPoolExecutor(max_workers=min(self.map_workers, len(prompts))) as pool:
+            return list(pool.map(complete, prompts))
+
+    def _group_partials(self, partials: List[Dict[str, Any]], max_chars: int) -> List[List[str]]:
+        """
+        Pack serialized partial summaries into groups that fit one merge prompt.
+        
+        Every group holds at least two partials (unless only one is left), so
+        each merge round shrinks the number of partials.
+        """
+        groups: List[List[str]] = []
+        size = 0
+        for partial in partials:
+            text = json.dumps(partial, ensure_ascii=False)
+            if groups and (len(groups[-1]) < 2 or size + len(text) <= max_chars):
+                groups[-1].append(text)
+                size += len(text)
+            else:
+                groups.append([text])
+                size = len(text)
+        return groups
+
+    def _complete(
+        self,
+        prompt: str,
+        max_tokens: int,
+        on_partial: Optional[Callable[[Dict[str, Any]], None]] = None,
+        schema: Optional[Dict[str, Any]] = None,
+        model: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Send one prompt (or answer it from the cache) and parse the response.
+        
+        Args:
+            prompt: User prompt
+            max_tokens: Maximum tokens for response
+            on_partial: Optional callback; if given, the response is streamed
+            schema: Schema the response must follow in structured mode
+            model: Model to use (default: ``self.model``)
             
-            summary_text = response.choices[0].message.content
+        Returns:
+            Parsed JSON response, or a text summary if it is not JSON
             
-            # Try to parse as JSON if structured, otherwise return as text
-            try:
-                return json.loads(summary_text)
-            except json.JSONDecodeError:
-                # If not JSON, return as text summary
-                return {
-                    "summary": summary_text,
-                    "format": "text"
+        Raises:
+            ValueError: If API call fails
+        """
+        key = None
+        if self.cache is not None:
+            key = self._cache_key(prompt, max_tokens, model)
+            if not self.refresh:
+                cached = self.cache.get(SUMMARY_NAMESPACE, key)
+                if cached is not None:
+                    return cached
+        
+        try:
+            messages = [
+                {
+                    "role": "system",
+                    "content": SYSTEM_PROMPT
+                },
+                {
+                    "role": "user",
+                    "content": prompt
                 }
+            ]
+            if on_partial is not None:
+                summary_text = self._stream(messages, max_tokens, on_partial, schema, model)
+            else:
+                response = self._create_completion(messages, max_tokens, schema, model)
+                summary_text = response.choices[0].message.content
+            
+            result = self._parse_response(summary_text)
                 
         except Exception as e:
             raise ValueError(f"LLM API call failed: {str(e)}")
+        
+        if key is not None:
+            self.cache.set(SUMMARY_NAMESPACE, key, result)
+        return result
+
+    def _create_completion(
+        self,
+        messages: List[Dict[str, str]],
+        max_tokens: int,
+        schema: Optional[Dict[str, Any]] = None,
+        model: Optional[str] = None,
+        **options
+    ):
+        """
+        Create a chat completion, enforcing the schema in structured mode.
+        
+        If the provider rejects ``response_format``, the request is sent
+        again without it, and later requests of this client skip it.
+        
+        Args:
+            messages: Chat messages to send
+            max_tokens: Maximum tokens for response
+            schema: Schema of the response, or None
+            model: Model to use (default: ``self.model``)
+            **options: Further parameters of the request (e.g. stream)
+            
+        Returns:
+            The completion (or stream) returned by the client
+        """
+        request = {
+            "model": model or self.model,
+            "messages": messages,
+            "temperature": 0.3,  # Lower temperature for more factual output
+            "max_tokens": max_tokens,
+            **options,
+        }
+        if schema is not None and self.structured and self._schema_supported:
+            try:
+                return self._call(
+                    self.client.chat.completions.create,
+                    response_format=_response_format(schema),
+                    **request,
+                )
+            except Exception as e:
+                if not _rejects_schema(e):
+                    raise
+                # Rely on the prompt and the repairing parser instead
+                self._schema_supported = False
+        return self._call(self.client.chat.completions.create, **request)
+
+    def _stream(
+        self,
+        messages: List[Dict[str, str]],
+        max_tokens: int,
+        on_partial: Callable[[Dict[str, Any]], None],
+        schema: Optional[Dict[str, Any]] = None,
+        model: Optional[str] = None
+    ) -> str:
+        """
+        Stream a completion, reporting the summary parsed so far.
+        
+        Until a JSON object starts, output that does not look like JSON
+        (anything but a ``{`` or a code fence) is reported as a text summary,
+        and so is a complete object without summary fields.
+        Opening the stream is retried like any call; once output has been
+        reported, an interrupted stream fails the call.
+        
+        Args:
+            messages: Chat messages to send
+            max_tokens: Maximum tokens for response
+            on_partial: Callback receiving each new partial summary
+            schema: Schema of the response in structured mode
+            model: Model to use (default: ``self.model``)
+            
+        Returns:
+            The complete response text
+        """
+        stream = self._create_completion(messages, max_tokens, schema, model, stream=True)
+        parser = IncrementalJSONParser()
+        last = None
+        for chunk in stream:
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta.content
+            if not delta:
+                continue
+            parser.feed(delta)
+            partial = parser.value()
+            if parser.done and not _looks_like_summary(partial):
+                partial = {"summary": parser.text, "format": "text"}
+            elif parser.started:
+                if not isinstance(partial, dict):
+                    continue
+            else:
+                text = parser.text.lstrip()
+                if not text or text.startswith("`"):
+                    continue
+                partial = {"summary": parser.text, "format": "text"}
+            if partial != last:
+                on_partial(partial)
+                last = partial
+        return parser.text
+
+    def retry_delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """
+        Get the delay before a retry.
+        
+        Args:
+            attempt: 0 for the first retry
+            retry_after: Wait requested by the server, if any
+            
+        Returns:
+            The requested wait (capped at MAX_RETRY_AFTER), otherwise a
+            random delay between 0 and the capped exponential backoff
+        """
+        if retry_after is not None:
+            return min(max(retry_after, 0.0), MAX_RETRY_AFTER)
+        return self._random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+
+    def _call(self, method: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Call an API method with retries behind the circuit breaker.
+        
+        Transient errors are retried with jittered exponential backoff,
+        waiting as long as the server asks for via Retry-After. Each attempt
+        is counted in ``stats``.
+        
+        Args:
+            method: Bound method of the OpenAI client
+            *args: Positional arguments of the method
+            **kwargs: Keyword arguments of the method
+            
+        Returns:
+            The method's result
+            
+        Raises:
+            CircuitOpenError: If the circuit is open
+            Exception: The last error, if it is not transient or retries are exhausted
+        """
+        import openai
+        
+        attempt = 0
+        while True:
+            try:
+                self.breaker.before_call()
+            except CircuitOpenError:
+                self.stats.record_rejected()
+                raise
+            start = time.monotonic()
+            try:
+                result = method(*args, **kwargs)
+            except Exception as e:
+                retryable = _is_retryable(e)
+                self.stats.record_call(
+                    time.monotonic() - start,
+                    failed=True,
+                    timed_out=isinstance(e, openai.APITimeoutError),
+                )
+                if not retryable:
+                    # The endpoint answered; the request itself is at fault
+                    self.breaker.record_success()
+                    raise
+                self.breaker.record_failure()
+                if attempt >= self.retries:
+                    raise
+                self.stats.record_retry()
+                time.sleep(self.retry_delay(attempt, _retry_after(e)))
+                attempt += 1
+                continue
+            self.stats.record_call(time.monotonic() - start)
+            self.breaker.record_success()
+            return result
+
+    def _parse_response(self, summary_text: str) -> Dict[str, Any]:
+        """
+        Parse a model response into summary data.
+        
+        Malformed JSON (code fences, trailing commas, output cut off at
+        max_tokens) is repaired rather than discarded, but only if the
+        repaired object has summary fields; prose that merely mentions
+        braces stays a text summary.
+        
+        Args:
+            summary_text: Response text
+            
+        Returns:
+            Parsed JSON object, or a text summary if it contains no object
+        """
+        try:
+            result = json.loads(summary_text)
+        except json.JSONDecodeError:
+            result = repair_json(summary_text)
+            if not _looks_like_summary(result):
+                result = None
+        if isinstance(result, dict):
+            return result
+        # If not JSON, return as text summary
+        return {
+            "summary": summary_text,
+            "format": "text"
+        }
+
+    def batch_request(self, custom_id: str, transcript: str, max_tokens: int = 1000) -> Dict[str, Any]:
+        """
+        Build one request line of a Batch API input file.
+        
+        Batch requests always use the single-prompt mode (long transcripts
+        are truncated), since a map-reduce merge would need another round
+        of requests. With a router, the model and max_tokens come from the
+        transcript's tier (there is no escalation).
+        
+        Args:
+            custom_id: ID the result is reported under
+            transcript: Video transcript text
+            max_tokens: Maximum tokens for response
+            
+        Returns:
+            Request object for the JSONL input file
+        """
+        model, max_tokens = self.route(transcript, max_tokens)
+        body = {
+            "model": model,
+            "messages": [
+                {"role": "system", "content": SYSTEM_PROMPT},
+                {"role": "user", "content": self._build_prompt(transcript)},
+            ],
+            "temperature": 0.3,
+            "max_tokens": max_tokens,
+        }
+        if self.structured and self._schema_supported:
+            body["response_format"] = _response_format(SUMMARY_SCHEMA)
+        return {"custom_id": custom_id, "method": "POST", "url": BATCH_ENDPOINT, "body": body}
+
+    def batch_cache_key(self, request: Dict[str, Any]) -> Optional[str]:
+        """
+        Get the summary cache key of a batch request.
+        
+        Args:
+            request: Request built by ``batch_request``
+            
+        Returns:
+            Cache key, or None if the client has no cache
+        """
+        if self.cache is None:
+            return None
+        body = request["body"]
+        return self._cache_key(body["messages"][-1]["content"], body["max_tokens"], body["model"])
+
+    def cached_summary(self, key: Optional[str]) -> Optional[Dict[str, Any]]:
+        """
+        Look up a finished summary by its cache key.
+        
+        Args:
+            key: Key from ``batch_cache_key``
+            
+        Returns:
+            Cached summary, or None if missing, uncached or refreshing
+        """
+        if key is None or self.refresh:
+            return None
+        return self.cache.get(SUMMARY_NAMESPACE, key)
+
+    def upload_batch_file(self, requests: List[Dict[str, Any]]) -> str:
+        """
+        Upload requests as the JSONL input file of a batch job.
+        
+        Args:
+            requests: Requests built by ``batch_request``
+            
+        Returns:
+            File ID
+            
+        Raises:
+            ValueError: If the upload fails
+        """
+        data = "".join(json.dumps(request, ensure_ascii=False) + "\n" for request in requests)
+        try:
+            input_file = self._call(
+                self.client.files.create,
+                file=("batch.jsonl", data.encode("utf-8")),
+                purpose="batch",
+            )
+        except Exception as e:
+            raise ValueError(f"Batch upload failed: {str(e)}")
+        return input_file.id
+    
+    def create_batch(self, input_file_id: str) -> str:
+        """
+        Start a batch job on an uploaded input file.
+        
+        Args:
+            input_file_id: File ID from ``upload_batch_file``
+            
+        Returns:
+            Batch ID
+            
+        Raises:
+            ValueError: If the job creation fails
+        """
+        try:
+            batch = self._call(
+                self.client.batches.create,
+                input_file_id=input_file_id,
+                endpoint=BATCH_ENDPOINT,
+                completion_window=BATCH_COMPLETION_WINDOW,
+            )
+        except Exception as e:
+            raise ValueError(f"Batch submission failed: {str(e)}")
+        return batch.id
+    
+    def find_batch(self, input_file_id: str) -> Optional[str]:
+        """
+        Find a recent batch job started on an input file.
+        
+        Used to recover a job whose ID was lost because the process died
+        right after creating it.
+        
+        Args:
+            input_file_id: File ID from ``upload_batch_file``
+            
+        Returns:
+            Batch ID, or None if no job among the most recent ones uses the file
+            
+        Raises:
+            ValueError: If the jobs cannot be listed
+        """
+        try:
+            page = self._call(self.client.batches.list, limit=BATCH_LIST_LIMIT)
+        except Exception as e:
+            raise ValueError(f"Failed to list batches: {str(e)}")
+        for batch in page.data:
+            if batch.input_file_id == input_file_id:
+                return batch.id
+        return None
+
+    def retrieve_batch(self, batch_id: str):
+        """
+        Get the current state of a batch job.
+        
+        Args:
+            batch_id: Batch ID from ``create_batch``
+            
+        Returns:
+            openai Batch object (``status``, ``output_file_id``, ...)
+            
+        Raises:
+            ValueError: If the job cannot be retrieved
+        """
+        try:
+            return self._call(self.client.batches.retrieve, batch_id)
+        except Exception as e:
+            raise ValueError(f"Batch status request failed: {str(e)}")
+
+    def batch_results(
+        self,
+        batch,
+        cache_keys: Optional[Dict[str, Optional[str]]] = None
+    ) -> Dict[str, Union[Dict[str, Any], ValueError]]:
+        """
+        Download and parse the results of a finished batch job.
+        
+        Args:
+            batch: Batch object from ``retrieve_batch``
+            cache_keys: Optional cache key per custom ID; successful
+                summaries are stored in the cache under them
+            
+        Returns:
+            Summary data, or the ValueError describing why the request
+            failed, per custom ID; requests the job did not finish are missing
+            
+        Raises:
+            ValueError: If a result file cannot be downloaded
+        """
+        cache_keys = cache_keys or {}
+        results: Dict[str, Union[Dict[str, Any], ValueError]] = {}
+        for file_id in (batch.output_file_id, batch.error_file_id):
+            if not file_id:
+                continue
+            try:
+                content = self._call(self.client.files.content, file_id).text
+            except Exception as e:
+                raise ValueError(f"Batch result download failed: {str(e)}")
+            for line in content.splitlines():
+                if not line.strip():
+                    continue
+                entry = json.loads(line)
+                custom_id = entry["custom_id"]
+                response = entry.get("response") or {}
+                body = response.get("body") or {}
+                if entry.get("error") or response.get("status_code") != 200:
+                    error = entry.get("error") or body.get("error") or {}
+                    message = error.get("message") or f"HTTP {response.get('status_code')}"
+                    results[custom_id] = ValueError(f"LLM API call failed: {message}")
+                    continue
+                result = self._parse_response(body["choices"][0]["message"]["content"])
+                key = cache_keys.get(custom_id)
+                if key is not None and self.cache is not None:
+                    self.cache.set(SUMMARY_NAMESPACE, key, result)
+                results[custom_id] = result
+        return results
+
+    def _cache_key(self, prompt: str, max_tokens: int, model: Optional[str] = None) -> str:
+        """
+        Build the cache key of a summary request.
+        
+        Args:
+            prompt: Prompt as sent (after truncation)
+            max_tokens: Maximum tokens for the response
+            model: Model the prompt is sent to (default: ``self.model``)
+            
+        Returns:
+            Hex digest over prompt version, model, max_tokens, prompt and
+            whether structured output is requested
+        """
+        digest = hashlib.sha256()
+        parts = [str(PROMPT_VERSION), model or self.model, str(max_tokens), SYSTEM_PROMPT, prompt]
+        if self.structured:
+            # Schema-enforced answers are kept apart from free-form ones
+            parts.append("json_schema")
+        for part in parts:
+            data = part.encode("utf-8")
+            digest.update(len(data).to_bytes(8, "big"))
+            digest.update(data)
+        return digest.hexdigest()
 
     def _build_prompt(self, transcript: str) -> str:
         """
@@ -102,7 +959,7 @@ class LLMClient:
             Formatted prompt string
         """
         # Truncate transcript if too long (keep within token limits)
-        max_transcript_length = 15000  # Characters, approximate
+        max_transcript_length = MAX_TRANSCRIPT_LENGTH  # Characters, approximate
         
         if len(transcript) > max_transcript_length:
             transcript = transcript[:max_transcript_length] + "\n\n[Transcript truncated...]"
@@ -138,3 +995,65 @@ Provide your analysis:"""
         
         return prompt
 
+    def _build_window_prompt(self, window: str, index: int, count: int) -> str:
+        """
+        Build prompt for summarizing one window of a long transcript.
+        
+        Args:
+            window: Part of the transcript
+            index: 1-based position of the window
+            count: Number of windows
+            
+        Returns:
+            Formatted prompt string
+        """
+        return f"""The following text is part {index} of {count} of a video transcript. Analyze this part only and extract its key insights.
+
+Requirements:
+{_RESPONSE_REQUIREMENTS}
+6. Format the response as a JSON object with the following structure:
+{{
+  "key_insights": [
+    {_INSIGHT_FORMAT}
+  ],
+  "summary": "Summary of this part (1-2 sentences)",
+  "uncertainties": ["List any unclear or speculative points mentioned"]
+}}
+
+Transcript part {index} of {count}:
+{window}
+
+Provide your analysis:"""
+
+    def _build_reduce_prompt(self, partials: List[str]) -> str:
+        """
+        Build prompt for merging partial summaries into one summary.
+        
+        Args:
+            partials: Partial summaries as JSON strings, in transcript order
+            
+        Returns:
+            Formatted prompt string
+        """
+        joined = "\n".join(partials)
+        return f"""The following JSON objects are summaries of consecutive parts of one video transcript, in order. Merge them into one structured summary of the whole video.
+
+Requirements:
+1. Only use information contained in the partial summaries
+2. Merge duplicate or overlapping insights, but keep every distinct insight
+3. When merged insights disagree on certainty, use the lower certainty
+4. Use a neutral and objective tone
+5. Format the response as a JSON object with the following structure:
+{{
+  "title": "Brief title or topic of the video",
+  "key_insights": [
+    {_INSIGHT_FORMAT}
+  ],
+  "summary": "Overall summary paragraph (2-3 sentences)",
+  "uncertainties": ["List any unclear or speculative points mentioned"]
+}}
+
+Partial summaries:
+{joined}
+
+Provide the merged analysis:"""
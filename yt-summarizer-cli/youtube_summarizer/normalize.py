@@ -0,0 +1,106 @@
+"""Module for cleaning up captions before summarization."""
+
+import re
+from typing import List, NamedTuple
+
+from youtube_summarizer.llm_client import estimate_tokens
+
+
+# Longest repeated phrase (in words) that is collapsed; rolling auto-captions
+# repeat a few words at most. Single repeated words ("had had", "very very")
+# are usually intended and are kept.
+MAX_REPEAT_WORDS = 8
+MIN_REPEAT_WORDS = 2
+
+# Non-speech annotations: [Music], [Applause], (laughter), ♪ lyrics ♪, >> speaker marks
+_NON_SPEECH = re.compile(
+    r"\[[^\]\n]{0,40}\]"
+    r"|\((?:music|applause|laughter|laughs|cheering|inaudible|silence|crosstalk|no audio)\)"
+    r"|♪[^♪\n]{0,200}♪"
+    r"|[♪♫]"
+    r"|>>",
+    re.IGNORECASE,
+)
+
+# Filler words of English captions. Several are real words elsewhere (German
+# "er", "um"; Dutch "er"), so other languages only drop UNIVERSAL_FILLERS.
+FILLER_WORDS = frozenset({"um", "umm", "uh", "uhh", "uh-huh", "erm", "er", "hmm", "mm", "mhm", "ah"})
+UNIVERSAL_FILLERS = frozenset({"umm", "uhh", "hmm", "mhm"})
+
+# Punctuation ignored when comparing words
+_PUNCTUATION = ".,!?;:\"'()-…"
+
+
+class NormalizedTranscript(NamedTuple):
+    """Result of normalizing a transcript."""
+
+    text: str
+    tokens_before: int
+    tokens_after: int
+
+    @property
+    def tokens_saved(self) -> int:
+        """Estimated prompt tokens saved by the normalization."""
+        return self.tokens_before - self.tokens_after
+
+
+def filler_words(language: str) -> frozenset:
+    """
+    Get the filler words dropped from captions in a language.
+
+    Args:
+        language: Transcript language code, e.g. 'en-US' or 'de'
+
+    Returns:
+        FILLER_WORDS for English, otherwise UNIVERSAL_FILLERS
+    """
+    if language.lower().split("-")[0] == "en":
+        return FILLER_WORDS
+    return UNIVERSAL_FILLERS
+
+
+def normalize_transcript(text: str, language: str = "en") -> NormalizedTranscript:
+    """
+    Remove noise from caption text in one linear pass.
+
+    Non-speech tags and filler words are dropped, phrases repeated right
+    after themselves (rolling auto-captions, stutters) are kept once, and
+    whitespace is collapsed to single spaces.
+
+    Args:
+        text: Transcript text
+        language: Transcript language code; selects the filler words
+
+    Returns:
+        NormalizedTranscript with the cleaned text and token estimates
+    """
+    fillers = filler_words(language)
+    words = _NON_SPEECH.sub(" ", text).split()
+    # Comparison keys: lower case without surrounding punctuation ("Going," -> "going")
+    word_keys = [word.lower().strip(_PUNCTUATION) for word in words]
+    kept: List[str] = []
+    keys: List[str] = []
+    i = 0
+    count = len(words)
+    while i < count:
+        key = word_keys[i]
+        if not key or key in fillers:
+            # Filler word, or punctuation left over from a removed tag
+            i += 1
+            continue
+        # Does the input continue with a repeat of the last n kept words?
+        skip = 0
+        for n in range(min(MAX_REPEAT_WORDS, len(keys), count - i), MIN_REPEAT_WORDS - 1, -1):
+            if key == keys[-n] and word_keys[i:i + n] == keys[-n:]:
+                skip = n
+                break
+        if skip:
+            i += skip
+            continue
+        kept.append(words[i])
+        keys.append(key)
+        i += 1
+
+    normalized = " ".join(kept)
+    return NormalizedTranscript(normalized, estimate_tokens(text), estimate_tokens(normalized))
+
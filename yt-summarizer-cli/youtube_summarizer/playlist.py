@@ -0,0 +1,86 @@
+"""Module for expanding YouTube playlist URLs into video IDs."""
+
+import re
+from typing import TYPE_CHECKING, List, Optional
+from urllib.parse import urlparse, parse_qs
+
+if TYPE_CHECKING:
+    import requests
+
+
+PLAYLIST_PAGE_URL = "https://www.youtube.com/playlist"
+
+# Entries of the playlist in the page's embedded initial data. Other
+# "videoId" fields on the page belong to recommended and related videos.
+_PLAYLIST_ENTRY = re.compile(r'"playlistVideoRenderer":\{"videoId":"([\w-]{11})"')
+
+
+def extract_playlist_id(url: str) -> Optional[str]:
+    """
+    Extract the playlist ID from a playlist URL.
+
+    A watch URL that merely carries a ``list`` parameter refers to a single
+    video and is not treated as a playlist.
+
+    Args:
+        url: YouTube URL
+
+    Returns:
+        Playlist ID, or None if the URL is not a playlist URL
+    """
+    parsed = urlparse(url)
+    if 'youtube' not in parsed.netloc.lower():
+        return None
+    params = parse_qs(parsed.query)
+    if 'list' not in params or 'v' in params:
+        return None
+    return params['list'][0]
+
+
+def fetch_playlist_video_ids(
+    playlist_id: str,
+    session: Optional["requests.Session"] = None,
+    timeout: float = 30.0
+) -> List[str]:
+    """
+    Fetch the video IDs of a public playlist.
+
+    Only the entries embedded in the playlist page are returned (the first
+    100 videos for long playlists).
+
+    Args:
+        playlist_id: YouTube playlist ID
+        session: Optional HTTP session to reuse
+        timeout: Request timeout in seconds
+
+    Returns:
+        Video IDs in playlist order, without duplicates
+
+    Raises:
+        ValueError: If the playlist cannot be fetched or no playlist entries
+            are found on the page (private, empty, or a changed page layout)
+    """
+    # Imported here so that checking a URL with extract_playlist_id stays cheap
+    import requests
+
+    http = session or requests.Session()
+    try:
+        response = http.get(
+            PLAYLIST_PAGE_URL,
+            params={'list': playlist_id},
+            headers={'Accept-Language': 'en-US'},
+            cookies={'CONSENT': 'YES+cb'},
+            timeout=timeout,
+        )
+        response.raise_for_status()
+    except requests.RequestException as e:
+        raise ValueError(f"Failed to fetch playlist {playlist_id}: {str(e)}")
+
+    video_ids = _PLAYLIST_ENTRY.findall(response.text)
+    if not video_ids:
+        # Guessing from other "videoId" fields would summarize videos outside the playlist
+        raise ValueError(
+            f"No videos found in playlist {playlist_id}. "
+            "It may be private or empty, or the page layout is not supported."
+        )
+    return list(dict.fromkeys(video_ids))
@@ -0,0 +1,150 @@
+"""Module for retry statistics and the circuit breaker of API calls."""
+
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+
+DEFAULT_FAILURE_THRESHOLD = 5
+DEFAULT_RESET_TIMEOUT = 30.0  # seconds
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling an endpoint that is considered degraded."""
+
+
+class CircuitBreaker:
+    """Stops calls to an endpoint after repeated transient failures.
+
+    After ``failure_threshold`` consecutive failures the circuit opens and
+    calls are rejected right away, so callers fail fast instead of adding
+    retries to a degraded endpoint. Once ``reset_timeout`` seconds have
+    passed, a single probe call is let through: if it succeeds the circuit
+    closes, if it fails the circuit opens again.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+        reset_timeout: float = DEFAULT_RESET_TIMEOUT,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Initialize a closed circuit breaker.
+
+        Args:
+            failure_threshold: Consecutive failures that open the circuit
+            reset_timeout: Seconds the circuit stays open before a probe
+            clock: Monotonic time source
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._probing = False
+
+    @property
+    def state(self) -> str:
+        """'closed', 'open' or 'half_open' (a probe may be or is being sent)."""
+        with self._lock:
+            if self._opened_at is None:
+                return "closed"
+            if self._probing or self._clock() - self._opened_at >= self.reset_timeout:
+                return "half_open"
+            return "open"
+
+    def before_call(self):
+        """
+        Check that a call may be made now.
+
+        Raises:
+            CircuitOpenError: If the circuit is open, or a probe is in flight
+        """
+        with self._lock:
+            if self._opened_at is None:
+                return
+            remaining = self.reset_timeout - (self._clock() - self._opened_at)
+            if self._probing or remaining > 0:
+                raise CircuitOpenError(
+                    f"circuit open after {self._failures} consecutive failures; "
+                    f"next attempt in {max(remaining, 0):.0f}s"
+                )
+            self._probing = True
+
+    def record_success(self):
+        """Record a call that reached a healthy endpoint; closes the circuit."""
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._probing = False
+
+    def record_failure(self):
+        """Record a transient failure; may open the circuit."""
+        with self._lock:
+            self._failures += 1
+            if self._probing or self._failures >= self.failure_threshold:
+                self._opened_at = self._clock()
+            self._probing = False
+
+
+class CallStats:
+    """Thread-safe counters of API calls, retries and latency."""
+
+    def __init__(self):
+        """Initialize all counters with zero."""
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.failures = 0
+        self.timeouts = 0
+        self.retries = 0
+        self.rejected = 0
+        self.latency_total = 0.0
+        self.latency_max = 0.0
+
+    def record_call(self, latency: float, failed: bool = False, timed_out: bool = False):
+        """
+        Record one attempt that reached the network.
+
+        Args:
+            latency: Duration of the attempt in seconds
+            failed: Whether the attempt raised an error
+            timed_out: Whether the error was a timeout
+        """
+        with self._lock:
+            self.calls += 1
+            self.failures += failed
+            self.timeouts += timed_out
+            self.latency_total += latency
+            self.latency_max = max(self.latency_max, latency)
+
+    def record_retry(self):
+        """Record that a failed attempt is retried."""
+        with self._lock:
+            self.retries += 1
+
+    def record_rejected(self):
+        """Record a call rejected by the open circuit."""
+        with self._lock:
+            self.rejected += 1
+
+    def snapshot(self) -> Dict[str, float]:
+        """
+        Get a consistent copy of the counters.
+
+        Returns:
+            Dictionary with calls, failures, timeouts, retries, rejected,
+            latency_total, latency_max and latency_avg (seconds)
+        """
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "failures": self.failures,
+                "timeouts": self.timeouts,
+                "retries": self.retries,
+                "rejected": self.rejected,
+                "latency_total": self.latency_total,
+                "latency_max": self.latency_max,
+                "latency_avg": self.latency_total / self.calls if self.calls else 0.0,
+            }
@@ -0,0 +1,121 @@
+"""Module for choosing the model of a summary by transcript size."""
+
+import threading
+from collections import Counter
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence
+
+
+class ModelTier(NamedTuple):
+    """One row of the routing table."""
+
+    max_input_tokens: Optional[int]  # None: no upper limit
+    model: str
+    max_tokens: Optional[int] = None  # None: the caller's max_tokens
+
+
+def parse_tiers(spec: str) -> List[ModelTier]:
+    """
+    Parse a routing table such as ``4000=gpt-4o-mini:600,*=gpt-4o:1500``.
+
+    Each comma-separated tier is ``LIMIT=MODEL[:MAX_TOKENS]``: transcripts of
+    up to LIMIT estimated tokens go to MODEL, which may answer with up to
+    MAX_TOKENS tokens. ``*`` as the limit matches any size.
+
+    Args:
+        spec: Routing table
+
+    Returns:
+        Tiers in ascending order of their limits
+
+    Raises:
+        ValueError: If the table is malformed or limits are not ascending
+    """
+    tiers = []
+    for entry in spec.split(","):
+        limit, separator, target = entry.strip().partition("=")
+        if not separator or not target:
+            raise ValueError(f"Invalid model tier {entry.strip()!r}, expected LIMIT=MODEL[:MAX_TOKENS]")
+        model, max_tokens = target, None
+        # Model names may contain colons (fine-tuned models), so only a numeric tail counts
+        head, _, tail = target.rpartition(":")
+        if head and tail.isdigit():
+            model, max_tokens = head, int(tail)
+        if limit.strip() == "*":
+            max_input_tokens = None
+        elif limit.strip().isdigit():
+            max_input_tokens = int(limit)
+        else:
+            raise ValueError(f"Invalid token limit {limit.strip()!r} in model tier {entry.strip()!r}")
+        tiers.append(ModelTier(max_input_tokens, model, max_tokens))
+
+    for lower, upper in zip(tiers, tiers[1:]):
+        if lower.max_input_tokens is None or (
+            upper.max_input_tokens is not None and upper.max_input_tokens <= lower.max_input_tokens
+        ):
+            raise ValueError("Model tiers must have ascending limits, with '*' last")
+    return tiers
+
+
+class ModelRouter:
+    """Picks the tier of a transcript and counts where summaries ended up.
+
+    A transcript goes to the first tier whose limit it does not exceed, or
+    to the last tier if it exceeds all of them. With ``escalate``, a summary
+    that fails validation is retried on the following tiers.
+    """
+
+    def __init__(self, tiers: Sequence[ModelTier], escalate: bool = False):
+        """
+        Initialize the router.
+
+        Args:
+            tiers: Routing table, e.g. from ``parse_tiers``
+            escalate: Retry invalid summaries on the next larger tier
+
+        Raises:
+            ValueError: If no tier is given
+        """
+        if not tiers:
+            raise ValueError("At least one model tier is required")
+        self.tiers = list(tiers)
+        self.escalate = escalate
+        self._lock = threading.Lock()
+        self._models: Counter = Counter()
+        self._escalations = 0
+
+    def select(self, input_tokens: int) -> int:
+        """
+        Find the tier for a transcript.
+
+        Args:
+            input_tokens: Estimated tokens of the transcript
+
+        Returns:
+            Index into ``tiers``
+        """
+        for index, tier in enumerate(self.tiers):
+            if tier.max_input_tokens is None or input_tokens <= tier.max_input_tokens:
+                return index
+        return len(self.tiers) - 1
+
+    def record(self, model: str, escalations: int = 0):
+        """
+        Count a finished summary.
+
+        Args:
+            model: Model that produced it
+            escalations: Tiers tried before it
+        """
+        with self._lock:
+            self._models[model] += 1
+            self._escalations += escalations
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Get a copy of the counters.
+
+        Returns:
+            Dictionary with 'models' (summaries per model) and 'escalations'
+        """
+        with self._lock:
+            return {"models": dict(self._models), "escalations": self._escalations}
@@ -0,0 +1,208 @@
+"""Module for transcripts with segment timings."""
+
+from array import array
+from bisect import bisect_right
+from typing import Any, Iterable, Iterator, NamedTuple, Optional, Tuple
+
+
+class Segment(NamedTuple):
+    """One caption segment of a transcript."""
+
+    text: str
+    start: float
+    duration: float
+    offset: int
+
+
+class TranscriptSegments:
+    """Transcript text together with the timing of each caption segment.
+
+    The text is the segments joined by single spaces (the same string
+    ``TranscriptExtractor.fetch_transcript`` returns). Segment boundaries are
+    kept as parallel arrays of text offsets, start times and durations, so a
+    time maps to a text offset and an offset back to a time by binary search,
+    without copying the text. ``language_code`` is the language of the
+    transcript that was actually fetched, which may differ from the one asked
+    for when a fallback language was used.
+    """
+
+    __slots__ = ("text", "language_code", "_offsets", "_starts", "_durations")
+
+    def __init__(
+        self,
+        text: str,
+        offsets: array,
+        starts: array,
+        durations: array,
+        language_code: Optional[str] = None,
+    ):
+        """
+        Initialize from prepared arrays; use ``from_entries`` to build one.
+
+        Args:
+            text: Joined transcript text
+            offsets: Offset of each segment in ``text``, ascending
+            starts: Start time of each segment in seconds, ascending
+            durations: Duration of each segment in seconds
+            language_code: Language of the transcript, if known
+        """
+        self.text = text
+        self.language_code = language_code
+        self._offsets = offsets
+        self._starts = starts
+        self._durations = durations
+
+    @classmethod
+    def from_entries(
+        cls, entries: Iterable[Any], language_code: Optional[str] = None
+    ) -> "TranscriptSegments":
+        """
+        Build the store from transcript entries.
+
+        Args:
+            entries: Dicts or snippet objects with 'text', 'start' and
+                'duration'; entries with empty text are skipped
+            language_code: Language of the transcript, if known
+
+        Returns:
+            TranscriptSegments
+        """
+        rows = []
+        for entry in entries:
+            # Handle both dictionary and object formats
+            if isinstance(entry, dict):
+                text = entry.get('text', '').strip()
+                start = entry.get('start', 0.0)
+                duration = entry.get('duration', 0.0)
+            else:
+                # Handle object format (FetchedTranscriptSnippet)
+                text = getattr(entry, 'text', '').strip()
+                start = getattr(entry, 'start', 0.0)
+                duration = getattr(entry, 'duration', 0.0)
+            if text:
+                rows.append((float(start or 0.0), float(duration or 0.0), text))
+        # Captions come in time order; sort defensively since lookups rely on it
+        if any(rows[i][0] > rows[i + 1][0] for i in range(len(rows) - 1)):
+            rows.sort(key=lambda row: row[0])
+
+        offsets = array('q')
+        starts = array('d')
+        durations = array('d')
+        position = 0
+        for start, duration, text in rows:
+            offsets.append(position)
+            starts.append(start)
+            durations.append(duration)
+            position += len(text) + 1
+        return cls(' '.join(row[2] for row in rows), offsets, starts, durations, language_code)
+
+    def __len__(self) -> int:
+        """Number of segments."""
+        return len(self._offsets)
+
+    def __getitem__(self, index: int) -> Segment:
+        """
+        Get one segment.
+
+        Args:
+            index: Segment index (negative values count from the end)
+
+        Returns:
+            Segment with its text, timing and offset
+
+        Raises:
+            IndexError: If the index is out of range
+        """
+        offset = self._offsets[index]
+        if index < 0:
+            index += len(self._offsets)
+        end = self._offsets[index + 1] - 1 if index + 1 < len(self._offsets) else len(self.text)
+        return Segment(self.text[offset:end], self._starts[index], self._durations[index], offset)
+
+    def __iter__(self) -> Iterator[Segment]:
+        """Iterate over the segments in order."""
+        for index in range(len(self._offsets)):
+            yield self[index]
+
+    @property
+    def duration(self) -> float:
+        """End time of the last segment in seconds (0.0 if empty)."""
+        if not self._starts:
+            return 0.0
+        return self._starts[-1] + self._durations[-1]
+
+    def index_at_time(self, seconds: float) -> int:
+        """
+        Find the segment playing at a time.
+
+        Args:
+            seconds: Time in seconds
+
+        Returns:
+            Index of the last segment starting at or before the time
+            (0 for times before the first segment)
+
+        Raises:
+            IndexError: If there are no segments
+        """
+        if not self._starts:
+            raise IndexError("transcript has no segments")
+        return max(bisect_right(self._starts, seconds) - 1, 0)
+
+    def offset_at_time(self, seconds: float) -> int:
+        """
+        Map a time to the text offset of the segment playing then.
+
+        Args:
+            seconds: Time in seconds
+
+        Returns:
+            Offset into ``text``
+        """
+        return self._offsets[self.index_at_time(seconds)]
+
+    def index_at_offset(self, offset: int) -> int:
+        """
+        Find the segment containing a text offset.
+
+        Args:
+            offset: Offset into ``text`` (the space after a segment belongs to it)
+
+        Returns:
+            Segment index
+
+        Raises:
+            IndexError: If there are no segments
+        """
+        if not self._offsets:
+            raise IndexError("transcript has no segments")
+        return max(bisect_right(self._offsets, offset) - 1, 0)
+
+    def time_at_offset(self, offset: int) -> float:
+        """
+        Map a text offset to the start time of its segment.
+
+        Args:
+            offset: Offset into ``text``
+
+        Returns:
+            Start time in seconds
+        """
+        return self._starts[self.index_at_offset(offset)]
+
+    def time_span(self, start_offset: int, end_offset: int) -> Tuple[float, float]:
+        """
+        Get the time range covered by a slice of the text.
+
+        Useful for citing timestamps of a chunk cut from ``text``.
+
+        Args:
+            start_offset: Start of the slice
+            end_offset: End of the slice (exclusive)
+
+        Returns:
+            Start of the first and end of the last segment touched, in seconds
+        """
+        first = self.index_at_offset(start_offset)
+        last = self.index_at_offset(max(end_offset - 1, start_offset))
+        return self._starts[first], self._starts[last] + self._durations[last]
@@ -1,8 +1,8 @@
 """Module for extracting transcripts from YouTube videos."""
 
-import re
-from typing import Optional, List, Dict
-from urllib.parse import urlparse, parse_qs
+import threading
+from collections import OrderedDict
+from typing import Any, Iterable, Optional, List, Dict
 
 from youtube_transcript_api import YouTubeTranscriptApi
 from youtube_transcript_api._errors import (
@@ -12,14 +12,341 @@ from youtube_transcript_api._errors import (
     YouTubeRequestFailed,
 )
 
+from youtube_summarizer.segments import TranscriptSegments
+from youtube_summarizer.video_ids import parse_video_id
+
+
+# Cache namespaces: the transcript listing of a video, and the snippets of one transcript
+LISTING_NAMESPACE = "transcript_list"
+SNIPPETS_NAMESPACE = "transcript"
+
+# Videos whose transcript index an extractor keeps in memory
+INDEX_MEMO_SIZE = 64
+
+
+def _snippet_to_dict(entry) -> Dict[str, Any]:
+    """Convert a snippet (dict in old API versions, object in new ones) to a dict."""
+    if isinstance(entry, dict):
+        return {
+            'text': entry.get('text', ''),
+            'start': entry.get('start', 0.0),
+            'duration': entry.get('duration', 0.0),
+        }
+    return {
+        'text': getattr(entry, 'text', ''),
+        'start': getattr(entry, 'start', 0.0),
+        'duration': getattr(entry, 'duration', 0.0),
+    }
+
+
+def _translation_languages(transcript) -> List[Dict[str, str]]:
+    """Get the translation languages of a transcript (dicts or objects) as dicts."""
+    translation_languages = []
+    for language in getattr(transcript, 'translation_languages', None) or []:
+        if isinstance(language, dict):
+            translation_languages.append(
+                {'language_code': language['language_code'], 'language': language['language']}
+            )
+        else:
+            translation_languages.append(
+                {'language_code': language.language_code, 'language': language.language}
+            )
+    return translation_languages
+
+
+def _transcript_info(transcript) -> Dict[str, Any]:
+    """Describe a listed transcript with plain values that can be cached."""
+    return {
+        'language_code': transcript.language_code,
+        'language': transcript.language,
+        'is_generated': bool(transcript.is_generated),
+        'is_translatable': bool(getattr(transcript, 'is_translatable', False)),
+        'translation_languages': _translation_languages(transcript),
+    }
+
+
+def transcript_error(video_id: str, error: Exception) -> ValueError:
+    """
+    Turn an error raised while fetching a transcript into a readable ValueError.
+
+    Args:
+        video_id: YouTube video ID
+        error: Exception raised by youtube-transcript-api or the network
+
+    Returns:
+        ValueError to raise
+    """
+    if isinstance(error, TranscriptsDisabled):
+        return ValueError(
+            f"Transcripts are disabled for video {video_id}. "
+            "This video may not have subtitles available."
+        )
+    if isinstance(error, VideoUnavailable):
+        return ValueError(
+            f"Video {video_id} is unavailable. "
+            "It may have been deleted or made private."
+        )
+    if isinstance(error, YouTubeRequestFailed):
+        return ValueError(
+            f"Failed to fetch transcript from YouTube: {str(error)}"
+        )
+    return ValueError(f"Unexpected error fetching transcript: {str(error)}")
+
+
+class TranscriptIndex:
+    """Transcripts of one video, indexed by language code.
+
+    Built once per listing; picking a transcript for a list of preferred
+    languages is a dictionary lookup per language instead of a scan of the
+    listing.
+    """
+
+    def __init__(self, transcripts: Iterable[Any]):
+        """
+        Index a transcript listing.
+
+        Args:
+            transcripts: Listed transcript objects, in listing order
+        """
+        self.transcripts = list(transcripts)
+        self._by_code: Dict[str, List[Any]] = {}
+        # Base language (e.g. 'en' for 'en-US') -> codes listed for it
+        self._by_base: Dict[str, List[str]] = {}
+        for transcript in self.transcripts:
+            code = transcript.language_code
+            if code not in self._by_code:
+                self._by_code[code] = []
+                self._by_base.setdefault(code.split('-')[0], []).append(code)
+            self._by_code[code].append(transcript)
+        for candidates in self._by_code.values():
+            # Manually created transcripts first (stable, so listing order otherwise)
+            candidates.sort(key=lambda transcript: bool(transcript.is_generated))
+        self._languages: Optional[List[Dict[str, str]]] = None
+
+    def match(self, language: str) -> Optional[Any]:
+        """
+        Find the transcript for one language code.
+
+        An exact match wins; otherwise regional variants of the code
+        ('en' -> 'en-US') and the languages it is a variant of
+        ('en-US' -> 'en') are considered, manual transcripts first.
+
+        Args:
+            language: Language code
+
+        Returns:
+            Transcript object, or None if none matches
+        """
+        exact = self._by_code.get(language)
+        if exact:
+            return exact[0]
+        best = None
+        for code in self._by_base.get(language.split('-')[0], ()):
+            if code.startswith(language + '-') or language.startswith(code + '-'):
+                candidate = self._by_code[code][0]
+                if best is None or (best.is_generated and not candidate.is_generated):
+                    best = candidate
+        return best
+
+    def resolve(self, languages: Iterable[str]) -> Optional[Any]:
+        """
+        Choose the transcript to fetch.
+
+        Args:
+            languages: Language codes in order of preference
+
+        Returns:
+            The transcript for the first matching language, else the first
+            manual transcript, else the first generated one; None if the
+            listing is empty
+        """
+        for language in languages:
+            transcript = self.match(language)
+            if transcript is not None:
+                return transcript
+        for transcript in self.transcripts:
+            if not transcript.is_generated:
+                return transcript
+        return self.transcripts[0] if self.transcripts else None
+
+    def languages(self) -> List[Dict[str, str]]:
+        """
+        Describe the available languages.
+
+        Returns:
+            List of dictionaries with 'code', 'name' and 'type' keys
+            ('manual', 'generated' or 'translation')
+        """
+        if self._languages is None:
+            languages = []
+            for transcript in self.transcripts:
+                languages.append({
+                    'code': transcript.language_code,
+                    'name': transcript.language,
+                    'type': 'manual' if not transcript.is_generated else 'generated'
+                })
+            for transcript in self.transcripts:
+                if getattr(transcript, 'is_translatable', False):
+                    for translated in _translation_languages(transcript):
+                        languages.append({
+                            'code': translated['language_code'],
+                            'name': translated['language'],
+                            'type': 'translation'
+                        })
+            self._languages = languages
+        return [dict(language) for language in self._languages]
+
+
+class CachedTranscript:
+    """Listed transcript whose snippets are read from the cache when possible.
+
+    Mirrors the attributes of the transcript objects of youtube-transcript-api
+    that the extractor uses, so cached and live listings are interchangeable.
+    YouTube is only contacted on a cache miss.
+    """
+
+    def __init__(self, extractor: 'TranscriptExtractor', video_id: str, info: Dict[str, Any], live=None):
+        """
+        Initialize cached transcript.
+
+        Args:
+            extractor: Extractor owning the cache
+            video_id: YouTube video ID
+            info: Cached description of the transcript
+            live: Transcript object from a live listing, if already at hand
+        """
+        self._extractor = extractor
+        self._live = live
+        self.video_id = video_id
+        self.language_code = info['language_code']
+        self.language = info['language']
+        self.is_generated = info['is_generated']
+        self.is_translatable = info['is_translatable']
+        self.translation_languages = info['translation_languages']
+
+    @property
+    def cache_key(self) -> str:
+        """Cache key of this transcript's snippets."""
+        kind = 'generated' if self.is_generated else 'manual'
+        return f"{self.video_id}:{self.language_code}:{kind}"
+
+    def fetch(self) -> List[Dict[str, Any]]:
+        """
+        Fetch the snippets of this transcript.
+
+        Returns:
+            List of dicts with 'text', 'start' and 'duration' keys
+        """
+        cache = self._extractor.cache
+        snippets = cache.get(SNIPPETS_NAMESPACE, self.cache_key)
+        if snippets is not None:
+            return snippets
+
+        live = self._live
+        if live is None:
+            # The listing came from the cache; list again to get a fetchable object
+            for transcript in self._extractor._list_live(self.video_id):
+                if (transcript.language_code == self.language_code and
+                        bool(transcript.is_generated) == self.is_generated):
+                    live = transcript
+                    break
+            if live is None:
+                raise NoTranscriptFound(self.video_id, [self.language_code], None)
+
+        snippets = [_snippet_to_dict(entry) for entry in live.fetch()]
+        cache.set(SNIPPETS_NAMESPACE, self.cache_key, snippets)
+        return snippets
+
 
 class TranscriptExtractor:
     """Handles extraction of transcripts from YouTube videos."""
 
-    def __init__(self):
+    def __init__(self, cache=None, http_client=None):
+        """
+        Initialize transcript extractor.
+
+        Args:
+            cache: Optional DiskCache for transcript listings and snippets;
+                cached videos are served without contacting YouTube
+            http_client: Optional requests.Session to send all requests
+                through (e.g. one with a shared connection pool); ignored
+                with youtube-transcript-api before 1.0
+        """
         # Create instance of YouTubeTranscriptApi for newer versions (1.2.0+)
         # For older versions, this will work with the class methods
-        self.transcript_api = YouTubeTranscriptApi()
+        self.shares_session = False
+        if http_client is None:
+            self.transcript_api = YouTubeTranscriptApi()
+        else:
+            try:
+                self.transcript_api = YouTubeTranscriptApi(http_client=http_client)
+                self.shares_session = True
+            except TypeError:
+                # Versions before 1.0 cannot take a session; every request
+                # then opens its own connection
+                self.transcript_api = YouTubeTranscriptApi()
+        self.cache = cache
+        self._indexes: "OrderedDict[str, TranscriptIndex]" = OrderedDict()
+        self._indexes_lock = threading.Lock()
+
+    def _list_live(self, video_id: str):
+        """List the transcripts of a video on YouTube."""
+        try:
+            # Try new API first (1.2.0+): use .list() method
+            return self.transcript_api.list(video_id)
+        except AttributeError:
+            # Fallback to old API (0.6.2): use static method
+            return YouTubeTranscriptApi.list_transcripts(video_id)
+
+    def _list_transcripts(self, video_id: str):
+        """
+        List the transcripts of a video, from the cache if possible.
+
+        Args:
+            video_id: YouTube video ID
+
+        Returns:
+            Iterable of transcript objects (CachedTranscript when caching)
+        """
+        if self.cache is None:
+            return self._list_live(video_id)
+
+        infos = self.cache.get(LISTING_NAMESPACE, video_id)
+        if infos is not None:
+            return [CachedTranscript(self, video_id, info) for info in infos]
+
+        live_transcripts = list(self._list_live(video_id))
+        infos = [_transcript_info(transcript) for transcript in live_transcripts]
+        self.cache.set(LISTING_NAMESPACE, video_id, infos)
+        return [
+            CachedTranscript(self, video_id, info, live=transcript)
+            for info, transcript in zip(infos, live_transcripts)
+        ]
+
+    def _transcript_index(self, video_id: str) -> TranscriptIndex:
+        """
+        Get the indexed transcript listing of a video.
+
+        The index is kept for the most recent videos, so asking for the
+        available languages and then fetching lists the transcripts once.
+
+        Args:
+            video_id: YouTube video ID
+
+        Returns:
+            TranscriptIndex
+        """
+        with self._indexes_lock:
+            index = self._indexes.get(video_id)
+            if index is not None:
+                self._indexes.move_to_end(video_id)
+                return index
+        index = TranscriptIndex(self._list_transcripts(video_id))
+        with self._indexes_lock:
+            self._indexes[video_id] = index
+            while len(self._indexes) > INDEX_MEMO_SIZE:
+                self._indexes.popitem(last=False)
+        return index
 
     def extract_video_id(self, url: str) -> str:
         """
@@ -34,25 +361,10 @@ class TranscriptExtractor:
         Raises:
             ValueError: If URL is invalid or video ID cannot be extracted
         """
-        # Handle various YouTube URL formats
-        patterns = [
-            r'(?:youtube\.com\/watch\?v=|youtu\.be\/|youtube\.com\/embed\/)([^&\n?#]+)',
-            r'youtube\.com\/v\/([^&\n?#]+)',
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, url)
-            if match:
-                return match.group(1)
-        
-        # Try parsing as direct URL
-        parsed = urlparse(url)
-        if parsed.netloc and 'youtube' in parsed.netloc.lower():
-            params = parse_qs(parsed.query)
-            if 'v' in params:
-                return params['v'][0]
-        
-        raise ValueError(f"Invalid YouTube URL: {url}")
+        video_id = parse_video_id(url)
+        if video_id is None:
+            raise ValueError(f"Invalid YouTube URL: {url}")
+        return video_id
 
     def get_available_languages(self, video_id: str) -> List[Dict[str, str]]:
         """
@@ -65,37 +377,7 @@ class TranscriptExtractor:
             List of dictionaries with 'code' and 'name' keys
         """
         try:
-            # Try new API first (1.2.0+): use .list() method
-            try:
-                transcript_list = self.transcript_api.list(video_id)
-            except AttributeError:
-                # Fallback to old API (0.6.2): use static method
-                transcript_list = YouTubeTranscriptApi.list_transcripts(video_id)
-            
-            languages = []
-            
-            # Get manually created transcripts
-            for transcript in transcript_list:
-                languages.append({
-                    'code': transcript.language_code,
-                    'name': transcript.language,
-                    'type': 'manual' if not transcript.is_generated else 'generated'
-                })
-            
-            # Get generated transcripts
-            try:
-                for transcript in transcript_list:
-                    if transcript.is_translatable:
-                        for translated in transcript.translation_languages:
-                            languages.append({
-                                'code': translated['language_code'],
-                                'name': translated['language'],
-                                'type': 'translation'
-                            })
-            except Exception:
-                pass
-            
-            return languages
+            return self._transcript_index(video_id).languages()
         except Exception as e:
             raise ValueError(f"Failed to fetch available languages: {str(e)}")
 
@@ -116,6 +398,30 @@ class TranscriptExtractor:
         Returns:
             Transcript text as a single string
             
+        Raises:
+            ValueError: If transcript cannot be fetched
+        """
+        return self.fetch_segments(video_id, language=language, languages=languages).text
+
+    def fetch_segments(
+        self,
+        video_id: str,
+        language: str = 'en',
+        languages: Optional[List[str]] = None
+    ) -> TranscriptSegments:
+        """
+        Fetch transcript for a YouTube video, keeping segment timings.
+        
+        Language selection is the same as in ``fetch_transcript``.
+        
+        Args:
+            video_id: YouTube video ID
+            language: Preferred language code (default: 'en')
+            languages: Fallback languages to try
+            
+        Returns:
+            TranscriptSegments with the text and the timing of each segment
+            
         Raises:
             ValueError: If transcript cannot be fetched
         """
@@ -123,75 +429,34 @@ class TranscriptExtractor:
             languages = [language, 'en', 'en-US', 'en-GB']
         
         try:
-            # Try new API first (1.2.0+): use .list() method
-            try:
-                transcript_list = self.transcript_api.list(video_id)
-            except AttributeError:
-                # Fallback to old API (0.6.2): use static method
-                transcript_list = YouTubeTranscriptApi.list_transcripts(video_id)
-            
-            # Try to get transcript in preferred language
-            for lang in languages:
-                try:
-                    # Find transcript by iterating through available transcripts
-                    # This works for both old and new API versions
-                    transcript = None
-                    for transcript_info in transcript_list:
-                        # Check exact match or language code starts with requested language
-                        if (transcript_info.language_code == lang or 
-                            transcript_info.language_code.startswith(lang + '-') or
-                            lang.startswith(transcript_info.language_code)):
-                            transcript = transcript_info
-                            break
-                    
-                    if transcript is None:
-                        raise NoTranscriptFound(video_id, [lang], None, None)
-                    
-                    transcript_data = transcript.fetch()
-                    return self._format_transcript(transcript_data)
-                except NoTranscriptFound:
-                    continue
-            
-            # If no preferred language found, try any available transcript
-            # First try manually created transcripts
-            try:
-                for transcript_info in transcript_list:
-                    if not transcript_info.is_generated:
-                        transcript_data = transcript_info.fetch()
-                        return self._format_transcript(transcript_data)
-            except (NoTranscriptFound, Exception):
-                pass
-            
-            # If no manual transcript, try any generated transcript
-            try:
-                for transcript_info in transcript_list:
-                    if transcript_info.is_generated:
-                        transcript_data = transcript_info.fetch()
-                        return self._format_transcript(transcript_data)
-            except (NoTranscriptFound, Exception):
-                pass
-            
-            # If we reach here, no transcript was found
+            segments = self._fetch_segments(video_id, languages)
+        except Exception as e:
+            raise transcript_error(video_id, e)
+        
+        if segments is None:
             raise ValueError(
                 f"No transcript found for video {video_id} in any available language."
             )
-                
-        except TranscriptsDisabled:
-            raise ValueError(
-                f"Transcripts are disabled for video {video_id}. "
-                "This video may not have subtitles available."
-            )
-        except VideoUnavailable:
-            raise ValueError(
-                f"Video {video_id} is unavailable. "
-                "It may have been deleted or made private."
-            )
-        except YouTubeRequestFailed as e:
-            raise ValueError(
-                f"Failed to fetch transcript from YouTube: {str(e)}"
-            )
-        except Exception as e:
-            raise ValueError(f"Unexpected error fetching transcript: {str(e)}")
+        return segments
+
+    def _fetch_segments(self, video_id: str, languages: List[str]) -> Optional[TranscriptSegments]:
+        """
+        Fetch the best transcript for the given languages.
+        
+        Errors of youtube-transcript-api are passed through unchanged.
+        
+        Args:
+            video_id: YouTube video ID
+            languages: Language codes in order of preference
+            
+        Returns:
+            TranscriptSegments, or None if the video has no transcripts
+        """
+        # One listing, one lookup per language, one fetch
+        transcript = self._transcript_index(video_id).resolve(languages)
+        if transcript is None:
+            return None
+        return TranscriptSegments.from_entries(transcript.fetch(), transcript.language_code)
 
     def _format_transcript(self, transcript_data: List) -> str:
         """
@@ -203,18 +468,4 @@ class TranscriptExtractor:
         Returns:
             Formatted transcript text
         """
-        # Combine all text segments, preserving timing context where useful
-        segments = []
-        for entry in transcript_data:
-            # Handle both dictionary and object formats
-            if isinstance(entry, dict):
-                text = entry.get('text', '').strip()
-            else:
-                # Handle object format (FetchedTranscriptSnippet)
-                text = getattr(entry, 'text', '').strip()
-            
-            if text:
-                segments.append(text)
-        
-        return ' '.join(segments)
-
+        return TranscriptSegments.from_entries(transcript_data).text
@@ -0,0 +1,70 @@
+"""Module for extracting video IDs from YouTube URLs in bulk."""
+
+import re
+from typing import Iterable, Iterator, Optional
+
+
+# One pattern for every supported URL form. It starts with the literal
+# "youtu", which lets the regex engine skip ahead to candidate positions.
+#   youtu.be/ID
+#   [www.|m.|music.]youtube.com/watch?v=ID (v may follow other parameters)
+#   [www.|m.]youtube.com/{embed,v,e,shorts,live}/ID
+#   [www.]youtube-nocookie.com/embed/ID
+# Host names are case-insensitive; the ID class already covers both cases.
+_VIDEO_URL = re.compile(
+    r"youtu(?:"
+    r"\.be/"
+    r"|be(?:-nocookie)?\.com/(?:"
+    r"(?:embed|v|e|shorts|live)/"
+    r"|(?:watch)?/?\?(?:[^#\s]*?&)?v="
+    r"))"
+    r"([A-Za-z0-9_-]{11})(?![A-Za-z0-9_-])",
+    re.IGNORECASE,
+)
+
+
+def parse_video_id(url: str) -> Optional[str]:
+    """
+    Extract the video ID from one YouTube URL.
+
+    Args:
+        url: YouTube video URL (or any text containing one)
+
+    Returns:
+        11-character video ID, or None if the text holds no video URL
+    """
+    match = _VIDEO_URL.search(url)
+    return match.group(1) if match else None
+
+
+def extract_video_ids(urls: Iterable[str], unique: bool = True) -> Iterator[str]:
+    """
+    Extract video IDs from many URLs, e.g. lines of a log file.
+
+    The input is consumed lazily, so arbitrarily large inputs are processed
+    in constant memory apart from the IDs already seen.
+
+    Args:
+        urls: URLs or lines of text containing at most one video URL each
+        unique: Yield each video ID only the first time it occurs
+
+    Yields:
+        Video IDs in input order; inputs without a video URL are skipped
+    """
+    search = _VIDEO_URL.search
+    if not unique:
+        for url in urls:
+            match = search(url)
+            if match:
+                yield match.group(1)
+        return
+
+    seen = set()
+    add = seen.add
+    for url in urls:
+        match = search(url)
+        if match:
+            video_id = match.group(1)
+            if video_id not in seen:
+                add(video_id)
+                yield video_id